@@ -1,3 +1,4 @@
+import os
 import sys
 import unittest
 import gc
@@ -494,16 +495,19 @@ class TestSearchAlgorithm(unittest.TestCase):
         ])
         diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
         self.assertEqual(len(diff), 4)
+        self.assertEqual([op["name"] for *_, op in diff], ["ADD_NODE", "REMOVE_NODE", "ADD_NODE", "REMOVE_NODE"])
         prev_node_id, diffed_node, path, op = diff.pop()
-        # removed - added pair 1 :
-        self.assertEqual(diffed_node.children[0].text, "Hello, world!")
-        prev_node_id, diffed_node, path, op = diff.pop()
+        # added - removed pair 2, the new node is inserted before the one it replaces:
         self.assertEqual(diffed_node.children[0].text, "Goodbye, world!")
-        # remove added pair 2: 
         prev_node_id, diffed_node, path, op = diff.pop()
-        self.assertEqual(diffed_node.children[0].text, "Goodbye, world!")
+        self.assertEqual(diffed_node.children[0].text, "Hello, world!")
+        self.assertEqual(op["context"]["before_id"], "comp-id" + prev_tree.children[1].path)
+        # added - removed pair 1:
         prev_node_id, diffed_node, path, op = diff.pop()
         self.assertEqual(diffed_node.children[0].text, "Hello, world!")
+        prev_node_id, diffed_node, path, op = diff.pop()
+        self.assertEqual(diffed_node.children[0].text, "Goodbye, world!")
+        self.assertEqual(op["context"]["parent_id"], "comp-id")
 
 
 
@@ -689,5 +693,369 @@ class TestSearchAlgorithm(unittest.TestCase):
         self.assertLess(end_time - start_time, 1)
         self.assertEqual(len(diff), 0)
 
+    def test_keyed_insert_at_top_is_single_add(self):
+        prev_tree = Node("ul", children=[Node("li", children=[f"row {i}"], key_=i) for i in range(500)])
+        new_tree = Node("ul", children=[Node("li", children=["row -1"], key_=-1)] + [Node("li", children=[f"row {i}"], key_=i) for i in range(500)])
+        diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
+        self.assertEqual(len(diff), 1)
+        prev_node_id, diffed_node, path, op = diff.pop()
+        self.assertEqual(op["name"], "ADD_NODE")
+        self.assertEqual(diffed_node.key_, -1)
+        self.assertEqual(op["context"]["parent_id"], "comp-id")
+        self.assertEqual(op["context"]["before_id"], "comp-id" + new_tree.children[1].path)
+
+    def test_keyed_reorder_emits_moves(self):
+        prev_tree = Node("ul", children=[Node("li", children=[k], key_=k) for k in "abcde"])
+        new_tree = Node("ul", children=[Node("li", children=[k], key_=k) for k in "eabdc"])
+        diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
+        self.assertTrue(all(op["name"] == "MOVE_NODE" for _, _, _, op in diff))
+        self.assertEqual(len(diff), 2)
+        self.assertIn("e", [node.key_ for _, node, _, _ in diff])
+
+    def test_keyed_remove_and_update(self):
+        prev_tree = Node("ul", children=[Node("li", children=[k], key_=k) for k in "abc"])
+        new_tree = Node("ul", children=[
+            Node("li", children=["a"], key_="a"),
+            Node("li", children=["C"], key_="c"),
+        ])
+        diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
+        names = [op["name"] for _, _, _, op in diff]
+        self.assertEqual(names, ["REMOVE_NODE", "NODE_INNER_TEXT"])
+        self.assertEqual(diff[0][0], "comp-id" + prev_tree.children[1].path)
+
+    def test_keyed_paths_are_stable_across_reorders(self):
+        prev_tree = Node("ul", children=[Node("li", key_=k) for k in "ab"])
+        new_tree = Node("ul", children=[Node("li", key_=k) for k in "ba"])
+        self.assertEqual(prev_tree.children[0].path, new_tree.children[1].path)
+
+    def test_duplicate_keys_fall_back_to_positional(self):
+        prev_tree = Node("ul", children=[Node("li", children=["a"], key_=1), Node("li", children=["b"], key_=1)])
+        new_tree = Node("ul", children=[Node("li", children=["b"], key_=1), Node("li", children=["a"], key_=1)])
+        diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
+        self.assertEqual([op["name"] for _, _, _, op in diff], ["NODE_INNER_TEXT", "NODE_INNER_TEXT"])
+
+    def test_unchanged_subtrees_are_skipped(self):
+        from unittest.mock import patch
+        from itertools import zip_longest
+        def page(badge):
+            return Node("main", children=[
+                Node("section", children=[Node("p", children=[f"row {i}"]) for i in range(1000)]),
+                Node("span", children=[badge]),
+            ])
+        prev_tree, new_tree = page("1"), page("2")
+        with patch("zenaura.client.algorithm.searcher.zip_longest", wraps=zip_longest) as spy:
+            diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
+        self.assertEqual(len(diff), 1)
+        self.assertEqual(diff[0][3]["name"], "NODE_INNER_TEXT")
+        # attributes and children of main and span only, the section is skipped by hash
+        self.assertEqual(spy.call_count, 4)
+
+    def test_unkeyed_to_keyed_children_are_replaced_under_their_parent(self):
+        from zenaura.client.algorithm.batch import serialize_patches, BATCH_REMOVE, BATCH_INSERT_BEFORE
+        prev_tree = Node("section", children=[Node("ul", children=[Node("p", children=["loading"])])])
+        new_tree = Node("section", children=[Node("ul", children=[Node("li", children=[k], key_=k) for k in "ab"])])
+        diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
+        parent_id = "comp-id" + prev_tree.children[0].path
+        self.assertEqual([op["name"] for *_, op in diff], ["REMOVE_NODE", "ADD_NODE", "ADD_NODE"])
+        self.assertEqual(diff[0][0], "comp-id" + prev_tree.children[0].children[0].path)
+        self.assertEqual([node.key_ for _, node, _, op in diff[1:]], ["a", "b"])
+        self.assertTrue(all(op["context"] == {"children": node, "parent_id": parent_id, "before_id": None} for _, node, _, op in diff[1:]))
+        batch = serialize_patches(diff, "comp-id", lambda node, id, mode: f"<{node.name}>")
+        self.assertEqual([op[0] for op in batch], [BATCH_REMOVE, BATCH_INSERT_BEFORE, BATCH_INSERT_BEFORE])
+        self.assertEqual(batch[1][1], parent_id)
+
+    def test_keyed_to_unkeyed_children_are_replaced_under_their_parent(self):
+        prev_tree = Node("section", children=[Node("ul", children=[Node("li", children=[k], key_=k) for k in "ab"])])
+        new_tree = Node("section", children=[Node("ul", children=[Node("p", children=["empty"])])])
+        diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
+        self.assertEqual([op["name"] for *_, op in diff], ["REMOVE_NODE", "REMOVE_NODE", "ADD_NODE"])
+        self.assertEqual([prev_id for prev_id, *_ in diff[:2]], ["comp-id" + child.path for child in prev_tree.children[0].children])
+        self.assertEqual(diff[2][3]["context"]["parent_id"], "comp-id" + prev_tree.children[0].path)
+
+    def test_text_to_keyed_children_clear_the_parent(self):
+        prev_tree = Node("ul", children=["loading"])
+        new_tree = Node("ul", children=[Node("li", children=[k], key_=k) for k in "ab"])
+        diff = self.zenaura_dom.search(prev_tree, new_tree, "comp-id")
+        self.assertEqual([op["name"] for *_, op in diff], ["NODE_INNER_TEXT", "ADD_NODE", "ADD_NODE"])
+        self.assertEqual(diff[0][0], "comp-id")
+        self.assertEqual(diff[0][3]["context"], {"text": ""})
+
+    def test_longest_increasing_subsequence(self):
+        from zenaura.client.algorithm.searcher import longest_increasing_subsequence
+        seq = [4, 0, 1, 3, 2]
+        lis = longest_increasing_subsequence(seq)
+        self.assertEqual(len(lis), 3)
+        self.assertEqual([seq[i] for i in lis], sorted(seq[i] for i in lis))
+        self.assertEqual(longest_increasing_subsequence([]), [])
+
+
+class TestBatchedPatches(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        from zenaura.client.dom import zenaura_dom
+        self.zenaura_dom = zenaura_dom
+
+    def test_serialize_patches(self):
+        from zenaura.client.algorithm.batch import (
+            serialize_patches, BATCH_INSERT_BEFORE, BATCH_REMOVE, BATCH_TEXT, BATCH_SET_ATTRIBUTE
+        )
+        prev_tree = Node("ul", children=[
+            Node("li", key_=k, attributes=[Attribute("class", "row")], children=[k]) for k in "abc"
+        ])
+        new_tree = Node("ul", children=[
+            Node("li", key_=k, attributes=[Attribute("class", "active" if k == "c" else "row")], children=[k.upper() if k == "c" else k])
+            for k in "zac"
+        ])
+        patches = self.zenaura_dom.search(prev_tree, new_tree, "comp")
+        batch = serialize_patches(patches, "comp", lambda node, id, mode: f"<{node.name}>")
+        self.assertEqual(len(batch), len(patches))
+        opcodes = [op[0] for op in batch]
+        self.assertCountEqual(opcodes, [BATCH_REMOVE, BATCH_SET_ATTRIBUTE, BATCH_TEXT, BATCH_INSERT_BEFORE])
+        insert = batch[opcodes.index(BATCH_INSERT_BEFORE)]
+        self.assertEqual(insert[3], "<li>")
+        self.assertTrue(insert[2].startswith("comp") and insert[2].endswith("ka:"))
+
+    async def test_update_uses_single_batched_task_when_helper_loaded(self):
+        from unittest.mock import patch
+        applied = []
+        prev_tree = Node("div", children=[Node("p", children=[str(i)]) for i in range(20)])
+        new_tree = Node("div", children=[Node("p", children=[str(i + 1)]) for i in range(20)])
+        patches = self.zenaura_dom.search(prev_tree, new_tree, "batch-comp")
+        self.assertEqual(len(patches), 20)
+        queue = self.zenaura_dom.hyd_tsk_get_or_create_task_queue("batch-comp")
+        with patch.object(type(self.zenaura_dom), "hyd_rdom_can_apply_batch", return_value=True), \
+             patch.object(type(self.zenaura_dom), "hyd_rdom_apply_patches", side_effect=applied.append):
+            await self.zenaura_dom.update(patches, "batch-comp")
+            self.assertEqual(queue.qsize(), 1)
+            await self.zenaura_dom.hyd_tsk_dequeue_task("batch-comp")()
+        self.assertEqual(len(applied), 1)
+        self.assertEqual(len(applied[0]), 20)
+
+    async def test_update_falls_back_to_per_patch_tasks(self):
+        prev_tree = Node("div", children=[Node("p", children=[str(i)]) for i in range(3)])
+        new_tree = Node("div", children=[Node("p", children=[str(i + 1)]) for i in range(3)])
+        patches = self.zenaura_dom.search(prev_tree, new_tree, "fallback-comp")
+        queue = self.zenaura_dom.hyd_tsk_get_or_create_task_queue("fallback-comp")
+        await self.zenaura_dom.update(patches, "fallback-comp")
+        self.assertEqual(queue.qsize(), 3)
+        while not queue.empty():
+            await self.zenaura_dom.hyd_tsk_dequeue_task("fallback-comp")()
+
+class TestPatchExecutor(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        from unittest.mock import patch
+        from tests.mocks.browser_mocks import MockDocument
+        from zenaura.client.dom import zenaura_dom
+        self.zenaura_dom = zenaura_dom
+        self.document = MockDocument()
+        self.patcher = patch("zenaura.client.hydrator.real_dom_adapter.document", self.document)
+        self.patcher.start()
+        self.zenaura_dom.hyd_rdom_invalidate()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.zenaura_dom.hyd_rdom_invalidate()
+
+    def text_patches(self, comp_id, size):
+        prev_tree = Node("div", children=[Node("p", children=[str(i)]) for i in range(size)])
+        new_tree = Node("div", children=[Node("p", children=[str(i + 1)]) for i in range(size)])
+        return self.zenaura_dom.search(prev_tree, new_tree, comp_id)
+
+    def test_apply_writes_to_dom_without_tasks(self):
+        patches = self.text_patches("direct", 3)
+        elements = {}
+        for prev_node_id, *_ in patches:
+            elements[prev_node_id] = self.document.createElement("p")
+            self.document.setElementById(prev_node_id, elements[prev_node_id])
+        queue = self.zenaura_dom.hyd_tsk_get_or_create_task_queue("direct")
+        self.assertEqual(self.zenaura_dom.apply(patches, "direct"), 3)
+        self.assertEqual(patches, [])
+        self.assertTrue(queue.empty())
+        self.assertEqual(sorted(e.textContent for e in elements.values()), ["1", "2", "3"])
+
+    def test_apply_mixed_keyed_transitions(self):
+        from tests.mocks.browser_mocks import MockElement
+        parent = self.document.createElement("ul")
+        self.document.setElementById("mixed", parent)
+        placeholder = Node("ul", children=[Node("p", children=["loading"])])
+        rows = Node("ul", children=[Node("li", children=[k], key_=k) for k in "ab"])
+        empty = Node("ul", children=[Node("p", children=["empty"])])
+
+        for prev_tree, new_tree in [(placeholder, rows), (rows, empty)]:
+            for child in prev_tree.children:
+                element = MockElement(child.name)
+                parent.append(element)
+                self.document.setElementById("mixed" + child.path, element)
+            with unittest.mock.patch.object(type(self.zenaura_dom), "hyd_rdom_insert_child_before") as insert:
+                patches = self.zenaura_dom.search(prev_tree, new_tree, "mixed")
+                self.assertEqual(self.zenaura_dom.apply(patches, "mixed"), len(prev_tree.children) + len(new_tree.children))
+            self.assertEqual([call.args[:2] for call in insert.call_args_list], [("mixed", None)] * len(new_tree.children))
+
+    def test_replaced_root_is_inserted_before_the_previous_one(self):
+        from tests.mocks.browser_mocks import MockElement
+        container, old_root = MockElement("div"), MockElement("p")
+        container.append(old_root)
+        self.document.setElementById("root-comp", old_root)
+        patches = self.zenaura_dom.search(Node("p", children=["a"]), Node("span", children=["a"]), "root-comp")
+        self.assertEqual([op["name"] for *_, op in patches], ["ADD_NODE", "REMOVE_NODE"])
+        self.assertEqual(patches[0][3]["context"]["before_id"], "root-comp")
+        self.zenaura_dom.apply(patches, "root-comp")
+        self.assertEqual(len(container.childNodes), 2)
+        self.assertIs(container.childNodes[1], old_root)
+        self.assertEqual(old_root.outerHTML, "")
+
+    async def test_on_patch_components_use_task_queue(self):
+        from zenaura.client.component import Component, Reuseable
+
+        @Reuseable
+        class Hooked(Component):
+            def __init__(self):
+                super().__init__()
+                self.value = 0
+                self.applied = []
+
+            async def on_patch(self, patch):
+                self.applied.append(patch[3]["name"])
+
+            def render(self):
+                return Node("p", children=[str(self.value)])
+
+        component = Hooked()
+        self.zenaura_dom.hyd_vdom_update(component)
+        component.value = 1
+        with unittest.mock.patch.object(type(self.zenaura_dom), "apply") as apply:
+            await self.zenaura_dom.render(component)
+        apply.assert_not_called()
+        self.assertEqual(component.applied, ["NODE_INNER_TEXT"])
+
+    def test_apply_creates_no_task_or_coroutine_per_patch(self):
+        import asyncio
+        import inspect
+        from unittest.mock import patch
+        handlers = [self.zenaura_dom.apply_patch, *self.zenaura_dom.patch_dispatch]
+        self.assertFalse(any(inspect.iscoroutinefunction(handler) for handler in handlers))
+        patches = self.text_patches("structural", 50)
+        with patch.object(type(self.zenaura_dom), "hyd_rdom_replace_inner_text") as replace, \
+             patch.object(type(self.zenaura_dom), "hyd_tsk_enqueue_task") as enqueue, \
+             patch.object(type(self.zenaura_dom), "hyd_tsk_get_or_create_task_queue") as get_queue, \
+             patch.object(asyncio, "create_task") as create_task, \
+             patch.object(asyncio, "ensure_future") as ensure_future:
+            self.assertEqual(self.zenaura_dom.apply(patches, "structural"), 50)
+        self.assertEqual(replace.call_count, 50)
+        enqueue.assert_not_called()
+        get_queue.assert_not_called()
+        create_task.assert_not_called()
+        ensure_future.assert_not_called()
+        self.assertNotIn("structural", self.zenaura_dom.queue_lookup)
+
+
+class TestPatchRecords(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        from zenaura.client.dom import zenaura_dom
+        self.zenaura_dom = zenaura_dom
+
+    def test_search_returns_typed_patch_records(self):
+        from zenaura.client.algorithm.operations import Patch, OPCODES, NODE_INNER_TEXT
+        patches = self.zenaura_dom.search(Node("p", children=["a"]), Node("p", children=["b"]), "comp")
+        self.assertEqual(len(patches), 1)
+        patch = patches[0]
+        self.assertIsInstance(patch, Patch)
+        self.assertEqual(patch.op.code, OPCODES[NODE_INNER_TEXT])
+        prev_node_id, node, path, op = patch
+        self.assertEqual((op["name"], op["context"]), (NODE_INNER_TEXT, {"text": "b"}))
+
+    def test_dispatch_table_covers_every_opcode(self):
+        from zenaura.client.algorithm.operations import OPCODES
+        self.assertEqual(sorted(OPCODES.values()), list(range(len(self.zenaura_dom.patch_dispatch))))
+
+    async def test_queued_update_consumes_patches_in_one_pass(self):
+        from unittest.mock import patch
+
+        class NoShiftList(list):
+            def pop(self, *args):
+                raise AssertionError("patches must not be popped one by one")
+
+            def __delitem__(self, index):
+                raise AssertionError("patches must not be shifted")
+
+        prev_tree = Node("div", children=[Node("p", children=[str(i)]) for i in range(100)], attributes=[Attribute("class", "a")])
+        new_tree = Node("div", children=[Node("p", children=[str(i + 1)]) for i in range(100)], attributes=[Attribute("class", "b")])
+        patches = NoShiftList(self.zenaura_dom.search(prev_tree, new_tree, "one-pass"))
+        expected = list(patches)
+        self.assertGreater(len({patch.op.code for patch in expected}), 1)
+
+        dispatched = []
+        def recorder(code):
+            return lambda updater, patch, id: dispatched.append((code, patch))
+        dispatch = tuple(recorder(code) for code in range(len(self.zenaura_dom.patch_dispatch)))
+
+        tasks = []
+        with patch.object(type(self.zenaura_dom), "hyd_tsk_enqueue_task", side_effect=lambda id, task: tasks.append(task)), \
+             patch.object(type(self.zenaura_dom), "patch_dispatch", dispatch):
+            await self.zenaura_dom.update(patches, "one-pass")
+            self.assertEqual(patches, [])
+            self.assertEqual(len(tasks), len(expected))
+            for task in tasks:
+                await task()
+        self.assertEqual(dispatched, [(patch.op.code, patch) for patch in expected])
+
+
+@unittest.skipUnless(os.environ.get("ZENAURA_BENCHMARK"), "set ZENAURA_BENCHMARK=1 to run the benchmarks")
+class TestPatchBenchmarks(unittest.IsolatedAsyncioTestCase):
+    """
+    Timings, they depend on the machine so they are opt-in.
+    """
+
+    def setUp(self):
+        from zenaura.client.dom import zenaura_dom
+        self.zenaura_dom = zenaura_dom
+
+    def text_patches(self, comp_id, size):
+        prev_tree = Node("div", children=[Node("p", children=[str(i)]) for i in range(size)])
+        new_tree = Node("div", children=[Node("p", children=[str(i + 1)]) for i in range(size)])
+        return self.zenaura_dom.search(prev_tree, new_tree, comp_id)
+
+    async def test_direct_executor_outperforms_task_queue(self):
+        from unittest.mock import patch
+        size, rounds = 200, 20
+        with patch.object(type(self.zenaura_dom), "hyd_rdom_replace_inner_text"):
+            direct = float("inf")
+            for _ in range(rounds):
+                patches = self.text_patches("bench", size)
+                start = time.perf_counter()
+                self.zenaura_dom.apply(patches, "bench")
+                direct = min(direct, time.perf_counter() - start)
+
+            queued = float("inf")
+            queue = self.zenaura_dom.hyd_tsk_get_or_create_task_queue("bench")
+            for _ in range(rounds):
+                patches = self.text_patches("bench", size)
+                start = time.perf_counter()
+                await self.zenaura_dom.update(patches, "bench")
+                while not queue.empty():
+                    await self.zenaura_dom.hyd_tsk_dequeue_task("bench")()
+                queued = min(queued, time.perf_counter() - start)
+
+        self.assertGreater(queued / direct, 1)
+
+    async def test_queued_update_consumes_large_patch_lists_linearly(self):
+        from unittest.mock import patch
+
+        async def enqueue(size):
+            patches = self.text_patches("linear", size)
+            start = time.perf_counter()
+            await self.zenaura_dom.update(patches, "linear")
+            elapsed = time.perf_counter() - start
+            self.assertEqual(patches, [])
+            return elapsed
+
+        with patch.object(type(self.zenaura_dom), "hyd_tsk_enqueue_task"):
+            small = min([await enqueue(1000) for _ in range(3)])
+            large = min([await enqueue(5000) for _ in range(3)])
+        self.assertLess(large / small, 10)
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
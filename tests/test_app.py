@@ -1,6 +1,7 @@
 import sys
 import unittest
-from unittest.mock import MagicMock, patch
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 from zenaura.client.page import Page
 from zenaura.client.layout import Layout
 
@@ -228,4 +229,66 @@ class TestAsync(unittest.IsolatedAsyncioTestCase):
         )
         self.router.layout = app_layout
         await self.router.navigate("/test")
-        self.assertEqual(attached_comp.mock_method.call_count, 2)
\ No newline at end of file
+        self.assertEqual(attached_comp.mock_method.call_count, 2)
+
+
+class TestLazyRoutes(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        from zenaura.client.app import App, Route
+        from .mocks.counter_mocks import Counter
+        from .mocks.browser_mocks import MockDocument, MockWindow
+        self.page = Page([Counter([])])
+        self.app = App()
+        self.app.add_route(Route("lazy", "/lazy", self.page))
+        self.document = MockDocument()
+        manifest = MagicMock()
+        manifest.textContent = json.dumps({"/lazy": {"page": self.page.id, "file": "./public/fragments/lazy.html"}})
+        self.document.setElementById("zenaura-routes", manifest)
+        self.root = MagicMock()
+        self.document.setElementById("root", self.root)
+        response = MagicMock()
+        response.string = AsyncMock(return_value="<div hidden>lazy</div>")
+        self.pyfetch = AsyncMock(return_value=response)
+        self.patchers = [
+            patch("zenaura.client.app.document", self.document),
+            patch("zenaura.client.app.window", MockWindow()),
+            patch("zenaura.client.app.pyfetch", self.pyfetch),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    async def test_fragment_is_fetched_once(self):
+        self.assertTrue(await self.app.load_fragment(self.page))
+        self.pyfetch.assert_awaited_once_with("./public/fragments/lazy.html")
+        self.root.insertAdjacentHTML.assert_called_once_with("beforeend", "<div hidden>lazy</div>")
+
+        # injected pages are found in the document
+        self.document.setElementById(self.page.id, MagicMock())
+        self.assertFalse(await self.app.load_fragment(self.page))
+        self.pyfetch.assert_awaited_once()
+
+    async def test_failed_fetch_shows_not_found(self):
+        self.pyfetch.return_value.ok = False
+        self.assertIsNone(await self.app.load_fragment(self.page))
+        self.root.insertAdjacentHTML.assert_not_called()
+
+        with patch.object(self.app, "not_found", AsyncMock()) as not_found, \
+                patch("zenaura.client.app.zenaura_dom.mount", AsyncMock()) as mount:
+            await self.app.navigate("/lazy")
+        not_found.assert_awaited_once()
+        mount.assert_not_awaited()
+        self.assertIsNot(self.app.history.current.page, self.page)
+
+        # the route is not marked loaded, the next visit fetches it again
+        self.pyfetch.return_value.ok = True
+        self.assertTrue(await self.app.load_fragment(self.page))
+        self.assertEqual(self.pyfetch.await_count, 3)
+
+    async def test_inlined_pages_are_not_fetched(self):
+        self.assertFalse(await self.app.load_fragment(Page([])))
+        self.pyfetch.assert_not_awaited()
@@ -73,6 +73,29 @@ class CompilerTests(unittest.TestCase):
         self.assertEqual(result, "<div><span>Hello</span></div>")
 
 
+    def test_sanitize_fast_path_matches_bleach(self):
+        import bleach
+        from zenaura.client.config import allowed_tags, allowed_attributes
+        alphabet = 'ab <>&"\'=/\t\n\r\x00\x0b\x7féü中😀'
+        rng = random.Random(7)
+        samples = ["text-sm font-semibold", "42", "a > b", "&amp;", "<b>bold</b>", "<script>x</script>"]
+        samples += ["".join(rng.choices(alphabet, k=rng.randint(0, 12))) for _ in range(500)]
+        for sample in samples:
+            expected = bleach.clean(sample, tags=allowed_tags, attributes=allowed_attributes)
+            self.assertEqual(compiler.sanitize(sample), expected, repr(sample))
+
+    def test_sanitize_plain_text_skips_bleach(self):
+        from unittest.mock import patch
+        from zenaura.client.compiler.sanitize import sanitize_text
+        sanitize_text.cache_clear()
+        with patch("zenaura.client.compiler.sanitize.bleach.clean", wraps=lambda s, **kw: s) as clean:
+            compiler.sanitize("py-3 px-4 text-left")
+            compiler.sanitize(12)
+            compiler.sanitize("<em>x</em>")
+            compiler.sanitize("<em>x</em>")
+        self.assertEqual(clean.call_count, 1)
+        sanitize_text.cache_clear()
+
     def test_sanitize_empty_input(self):
         input_html = ''
         result = compiler.sanitize(input_html)
@@ -177,3 +200,79 @@ class CompilerTests(unittest.TestCase):
         self.assertGreater(0.1, compilation_time)
         self.assertLess(sys.getsizeof(result), 30000)  # Adjust the threshold as needed
 
+    def test_fragment_cache_hits_identical_subtrees(self):
+        cached = Compiler(fragment_cache_size=2)
+        navbar = lambda: Node("nav", children=[Node("a", attributes=[Attribute("href", "/")], children=["Home"])])
+        first = cached.compile(navbar(), "comp", zenaura_dom_mode=True)
+        second = cached.compile(navbar(), "comp", zenaura_dom_mode=True)
+        self.assertEqual(first, second)
+        self.assertEqual(cached.fragment_cache_info(), {"hits": 1, "misses": 1, "size": 1, "maxsize": 2})
+
+    def test_fragment_cache_keys_on_component_id_and_mode(self):
+        cached = Compiler()
+        node = Node("div", children=[Node("p", children=["text"])])
+        with_dom = cached.compile(node, "comp-a", zenaura_dom_mode=True)
+        other_comp = cached.compile(node, "comp-b", zenaura_dom_mode=True)
+        plain = cached.compile(node, "comp-a", zenaura_dom_mode=False)
+        self.assertIn('data-zenaura="comp-a"', with_dom)
+        self.assertIn('data-zenaura="comp-b"', other_comp)
+        self.assertEqual(plain, "<div><p>text</p></div>")
+        self.assertEqual(cached.fragment_cache_misses, 3)
+
+    def test_fragment_cache_evicts_least_recently_used(self):
+        cached = Compiler(fragment_cache_size=2)
+        a, b, c = Node("a"), Node("b"), Node("i")
+        cached.compile(a)
+        cached.compile(b)
+        cached.compile(a)
+        cached.compile(c)  # evicts b
+        cached.compile(b)
+        self.assertEqual(cached.fragment_cache_hits, 1)
+        self.assertEqual(cached.fragment_cache_misses, 4)
+        self.assertEqual(len(cached.fragment_cache), 2)
+
+    def test_fragment_cache_sees_in_place_descendant_changes(self):
+        cached = Compiler()
+        mutations = [
+            lambda p: setattr(p, "children", ["new"]),
+            lambda p: setattr(p.children[0], "text", "new"),
+            lambda p: p.attributes.append(Attribute("class", "new")),
+        ]
+        for mutate in mutations:
+            root = Node("div", children=[Node("section", children=[Node("p", children=["old"])])])
+            self.assertIn("<p>old</p>", cached.compile(root))
+            mutate(root.children[0].children[0])
+            self.assertEqual(cached.compile(root), cached.compile_node(root))
+            self.assertNotIn("<p>old</p>", cached.compile(root))
+
+    def test_fragment_cache_disabled(self):
+        cached = Compiler(fragment_cache_size=0)
+        cached.compile(Node("div"))
+        cached.compile(Node("div"))
+        self.assertEqual(cached.fragment_cache_info()["size"], 0)
+        self.assertEqual(cached.fragment_cache_hits, 0)
+
+    def test_iter_compile_matches_compile(self):
+        import io
+        root = Node("div", attributes=[Attribute("id", "root")], children=[
+            Node("ul", children=[Node("li", children=[f"item {i}"]) for i in range(5)]),
+            Node("img", attributes=[Attribute("src", "a.png")]),
+            "<b>tail</b>",
+        ])
+        expected = Compiler(fragment_cache_size=0).compile(root, "comp", zenaura_dom_mode=True)
+        chunks = list(compiler.iter_compile(root, "comp", zenaura_dom_mode=True))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), expected)
+        writer = io.StringIO()
+        compiler.compile_into(root, writer, "comp", zenaura_dom_mode=True)
+        self.assertEqual(writer.getvalue(), expected)
+
+    def test_iter_compile_deep_tree_has_no_recursion_limit(self):
+        root = parent = Node("div")
+        for _ in range(sys.getrecursionlimit() + 100):
+            child = Node("div")
+            parent.children = [child]
+            parent = child
+        html = "".join(compiler.iter_compile(root))
+        self.assertTrue(html.startswith("<div><div>"))
+
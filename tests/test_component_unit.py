@@ -2,6 +2,8 @@ import unittest
 from .mocks.component_mocks import Counter, Counter2, componentWIthInitState
 from zenaura.client.persistance import registry
 import hashlib
+from dataclasses import dataclass
+from zenaura.client.component import Component, Reuseable
 c = Counter()
 c2 = Counter2()
 initState = componentWIthInitState()
@@ -39,11 +41,53 @@ class TestComponent(unittest.TestCase):
         count = self.c.count
         uuid = self.c.id 
         hash = hashlib.md5(f"{self.c.__class__.__name__}{count}".encode()).hexdigest()[:8]
-        self.assertEqual(uuid, hash)        
+        self.assertEqual(uuid, hash)
 
 
+@Reuseable
+class Row(Component):
+    def render(self):
+        pass
 
 
+@dataclass(frozen=True)
+class RowState:
+    label: str
+    selected: bool = False
 
 
+class TestComponentState(unittest.TestCase):
+
+    def test_reuseable_instances_own_their_state(self):
+        first, second = Row(), Row()
+        first.get_state()["label"] = "first"
+        self.assertIsNot(first.get_state(), second.get_state())
+        self.assertEqual(second.get_state()["label"], "")
+
+    def test_update_state_is_copy_on_write(self):
+        row = Row()
+        row.set_state({"label": "a", "selected": False})
+        prev = row.get_state()
+        row.update_state(selected=True)
+        self.assertEqual(prev, {"label": "a", "selected": False})
+        self.assertEqual(row.get_state(), {"label": "a", "selected": True})
+
+    def test_update_state_without_changes_keeps_state(self):
+        row = Row()
+        row.set_state({"label": "a"})
+        prev = row.get_state()
+        self.assertIs(row.update_state(label="a"), prev)
+
+    def test_update_state_replaces_dataclass(self):
+        row = Row()
+        row.set_state(RowState("a"))
+        prev = row.get_state()
+        row.update_state(selected=True)
+        self.assertEqual(row.get_state(), RowState("a", True))
+        self.assertFalse(prev.selected)
+
+    def test_reuseable_instances_are_not_tracked(self):
+        rows = [Row() for _ in range(100)]
+        self.assertLessEqual(Component._track_instances["Row"], 1)
+        self.assertEqual(len({row.id for row in rows}), 100)
 
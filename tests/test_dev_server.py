@@ -0,0 +1,415 @@
+import os
+import re
+import sys
+import time
+import tempfile
+import json
+import subprocess
+import threading
+import unittest
+from concurrent.futures import wait
+from unittest.mock import patch
+from flask import Flask
+from zenaura.client.component import Component
+from watchdog.events import FileModifiedEvent, DirModifiedEvent
+from zenaura.server.server import DevServer, ZenauraServer
+from zenaura.server.watcher import ChangeCoalescer
+from zenaura.server.broadcaster import RefreshBroadcaster
+
+ZENAURA_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MAIN = """from zenaura.client.app import Route, App
+from zenaura.client.page import Page
+from zenaura.client.component import Component
+from public.components import Greeting
+
+class Starter(Component):
+    def render(self):
+        return Greeting("{text}")
+
+app = App()
+app.add_route(Route(title="Home", path="/", page=Page([Starter()])))
+"""
+
+COMPONENTS = """from zenaura.ui import h1
+
+def Greeting(text):
+    return h1(text)
+"""
+
+PAGES = """from zenaura.client.page import Page
+from zenaura.client.component import Component, Reuseable
+
+@Reuseable
+class Card(Component):
+    def render(self):
+        from public.components import Greeting
+        return Greeting("card")
+
+about = Page([Card(), Card()])
+"""
+
+ABOUT_ROUTE = """from public.pages import about
+app.add_route(Route(title="About", path="/about", page=about))
+"""
+
+REBUILD = """import os
+import time
+from zenaura.server.reloader import ModuleReloader
+
+with open("public/components.py") as file:
+    components = file.read()
+reloader = ModuleReloader()
+reloader.run("build.py")
+for text in ["second", "third"]:
+    with open("public/components.py", "w") as file:
+        file.write(components.replace("h1(text)", f"h1(text + '{text}')"))
+    os.utime("public/components.py", ns=(time.time_ns(), time.time_ns() + 10**9))
+    reloader.run("build.py")
+assert reloader.reloaded == {"public.components", "public.main", "public"}, reloader.reloaded
+"""
+
+NEW_COMPONENT = """import os
+import time
+from zenaura.server.reloader import ModuleReloader
+
+with open("public/main.py") as file:
+    main = file.read()
+reloader = ModuleReloader()
+reloader.run("build.py")
+with open("public/main.py", "w") as file:
+    file.write(main.replace("class Starter", "class Extra(Component):\\n    def render(self):\\n        return None\\n\\nclass Starter"))
+os.utime("public/main.py", ns=(time.time_ns(), time.time_ns() + 10**9))
+reloader.run("build.py")
+# Extra shifts the ids of every later component, the whole project is numbered again
+assert reloader.reloaded == {"public.components", "public.pages", "public.main", "public"}, reloader.reloaded
+"""
+
+BUILD = """from zenaura.server.server import ZenauraServer
+from public.main import app
+
+ZenauraServer.hydrate_app(app)
+"""
+
+
+class ProjectTestCase(unittest.TestCase):
+    """
+    Runs in a temporary project with a build script, a page and a components module.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.mkdir(os.path.join(self.root, "public"))
+        self.write("public/__init__.py", "")
+        self.write("public/components.py", COMPONENTS)
+        self.write("public/main.py", MAIN.format(text="first"))
+        self.write("build.py", BUILD)
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+        self.server = DevServer(Flask(__name__))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        for name in [name for name in sys.modules if name == "public" or name.startswith("public.")]:
+            sys.modules.pop(name)
+        Component._track_instances.pop("Starter", None)
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        path = os.path.join(self.root, path)
+        with open(path, "w") as file:
+            file.write(content)
+        # the build reads the file back within the same mtime tick otherwise
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    def index(self):
+        with open(os.path.join(self.root, "public/index.html")) as file:
+            return file.read()
+
+
+class TestInProcessRebuild(ProjectTestCase):
+
+    def test_rebuild_reloads_changed_modules_and_dependents(self):
+        self.server.rebuild()
+        self.assertIn("first", self.index())
+
+        self.write("public/main.py", MAIN.format(text="second"))
+        self.server.rebuild()
+        self.assertIn("second", self.index())
+        self.assertEqual(self.server.reloader.reloaded, {"public.main", "public"})
+
+        self.write("public/components.py", COMPONENTS.replace("h1(text)", "h1(text.upper())"))
+        self.server.rebuild()
+        self.assertIn("SECOND", self.index())
+        self.assertEqual(self.server.reloader.reloaded, {"public.components", "public.main", "public"})
+
+    def test_rebuilt_ids_match_a_clean_build(self):
+        self.write("public/pages.py", PAGES)
+        self.write("public/main.py", MAIN.format(text="first") + ABOUT_ROUTE)
+        self.write("rebuild.py", REBUILD)
+        # this process already numbered the test components, rebuild from a fresh one like `zenaura run`
+        env = dict(os.environ, PYTHONPATH=ZENAURA_ROOT)
+        subprocess.run([sys.executable, "rebuild.py"], check=True, env=env, cwd=self.root)
+        rebuilt = self.index()
+
+        subprocess.run([sys.executable, "build.py"], check=True, env=env, cwd=self.root)
+        self.assertIn("third", rebuilt)
+        self.assertEqual(rebuilt, self.index())
+
+    def test_new_component_renumbers_like_a_clean_build(self):
+        self.write("public/pages.py", PAGES)
+        self.write("public/main.py", MAIN.format(text="first") + ABOUT_ROUTE)
+        self.write("rebuild.py", NEW_COMPONENT)
+        env = dict(os.environ, PYTHONPATH=ZENAURA_ROOT)
+        subprocess.run([sys.executable, "rebuild.py"], check=True, env=env, cwd=self.root)
+        rebuilt = self.index()
+
+        subprocess.run([sys.executable, "build.py"], check=True, env=env, cwd=self.root)
+        self.assertEqual(rebuilt, self.index())
+
+    def test_unrelated_component_module_is_not_reloaded(self):
+        self.write("public/pages.py", PAGES)
+        self.write("public/main.py", MAIN.format(text="first") + ABOUT_ROUTE)
+        self.server.rebuild()
+        pages = sys.modules["public.pages"]
+        before = self.index()
+
+        self.write("public/main.py", MAIN.format(text="second") + ABOUT_ROUTE)
+        self.server.rebuild()
+        self.assertEqual(self.server.reloader.reloaded, {"public.main", "public"})
+        self.assertIs(sys.modules["public.pages"], pages)
+        self.assertIn("second", self.index())
+        ids = re.compile(r'data-zenaura="(\w+)"')
+        self.assertEqual(ids.findall(self.index()), ids.findall(before))
+
+    def test_falls_back_to_subprocess(self):
+        self.write("build.py", "raise RuntimeError('broken build')")
+        with patch("zenaura.server.server.subprocess.Popen") as popen:
+            self.server.rebuild()
+        popen.assert_called_once_with("python build.py", shell=True)
+
+    def test_warm_rebuild_keeps_libraries_and_unchanged_modules(self):
+        self.server.rebuild()  # first build imports the project
+        kept = {name: sys.modules[name] for name in ["public.components", "zenaura.server.server", "flask", "bleach"]}
+        self.write("public/main.py", MAIN.format(text="warm"))
+
+        with patch("zenaura.server.server.subprocess.Popen") as popen:
+            self.server.rebuild()
+        popen.assert_not_called()
+        self.assertIn("warm", self.index())
+        self.assertEqual(self.server.reloader.reloaded, {"public.main", "public"})
+        for name, module in kept.items():
+            self.assertIs(sys.modules[name], module)
+
+
+@unittest.skipUnless(os.environ.get("ZENAURA_BENCHMARK"), "set ZENAURA_BENCHMARK=1 to run the benchmarks")
+class TestDevServerBenchmarks(ProjectTestCase):
+    """
+    Timings, they depend on the machine so they are opt-in.
+    """
+
+    def test_in_process_rebuild_latency(self):
+        self.server.rebuild()  # first build imports the project
+        self.write("public/main.py", MAIN.format(text="warm"))
+
+        start = time.perf_counter()
+        self.server.rebuild()
+        in_process = time.perf_counter() - start
+
+        env = dict(os.environ, PYTHONPATH=ZENAURA_ROOT)
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "build.py"], check=True, env=env, cwd=self.root)
+        spawned = time.perf_counter() - start
+
+        # interpreter start and the zenaura, bleach and flask imports dominate a spawned build
+        self.assertIn("warm", self.index())
+        self.assertLess(in_process * 5, spawned)
+
+
+class TestChangeCoalescer(unittest.TestCase):
+
+    def setUp(self):
+        self.bursts = []
+        self.changes = ChangeCoalescer(self.bursts.append, quiet_window=0.05)
+
+    def test_burst_triggers_one_flush(self):
+        for path in ["public/main.py", "public/main.py", "public/main.css", "public/main.py"]:
+            self.changes.add(path)
+        time.sleep(0.3)
+        self.assertEqual(self.bursts, [{"public/main.py", "public/main.css"}])
+        self.assertEqual(self.changes.stats(), {"events": 4, "ignored": 0, "coalesced": 3, "flushes": 1})
+
+    def test_build_outputs_are_ignored(self):
+        for path in ["public/index.html", "public/__pycache__/main.cpython-311.pyc", "public/fragments/a.html", "public/.main.py.swp"]:
+            self.assertFalse(self.changes.add(path))
+        self.assertEqual(self.changes.flush(), set())
+        self.assertEqual(self.bursts, [])
+        self.assertEqual(self.changes.ignored, 4)
+
+    def test_separate_bursts_flush_separately(self):
+        self.changes.add("public/main.py")
+        self.assertEqual(self.changes.flush(), {"public/main.py"})
+        self.changes.add("public/main.css")
+        time.sleep(0.3)
+        self.assertEqual(len(self.bursts), 2)
+
+    def test_change_handler_coalesces_events(self):
+        server = DevServer(Flask(__name__), quiet_window=60)
+        handler = server.get_change_handler()(server)
+        with patch.object(server, "on_changes") as on_changes:
+            server.changes.callback = on_changes
+            for path in ["public/main.py", "public/index.html", "public/main.py"]:
+                handler.on_any_event(FileModifiedEvent(path))
+            handler.on_any_event(DirModifiedEvent("public"))
+            server.changes.flush()
+        on_changes.assert_called_once_with({"public/main.py"})
+        self.assertEqual(server.changes.stats(), {"events": 2, "ignored": 1, "coalesced": 1, "flushes": 1})
+
+
+class FakeSocket:
+
+    def __init__(self, delay=0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.connected = True
+        self.messages = []
+        self.sending = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def send(self, message):
+        self.sending.set()
+        self.gate.wait()
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("closed")
+        self.messages.append(message)
+
+
+class TestRefreshBroadcaster(unittest.TestCase):
+
+    def setUp(self):
+        self.broadcaster = RefreshBroadcaster(max_workers=8)
+
+    def tearDown(self):
+        self.broadcaster.shutdown()
+
+    def test_fan_out_is_concurrent(self):
+        clients = [FakeSocket() for _ in range(8)]
+        for client in clients:
+            client.gate.clear()
+            self.broadcaster.register(client)
+
+        futures = self.broadcaster.refresh()
+        # every send is in flight while none can finish, serial sends would block on the first
+        self.assertTrue(all(client.sending.wait(5) for client in clients))
+        for client in clients:
+            client.gate.set()
+        wait(futures)
+
+        self.assertTrue(all(client.messages == ["refresh"] for client in clients))
+        self.assertEqual(self.broadcaster.sent, 8)
+
+    def test_slow_client_does_not_delay_the_others(self):
+        slow, fast = FakeSocket(), [FakeSocket() for _ in range(3)]
+        slow.gate.clear()
+        for client in [slow] + fast:
+            self.broadcaster.register(client)
+
+        futures = self.broadcaster.refresh()
+        wait(futures[1:])
+        self.assertTrue(all(client.messages == ["refresh"] for client in fast))
+        self.assertEqual(slow.messages, [])
+        slow.gate.set()
+        wait(futures)
+        self.assertEqual(slow.messages, ["refresh"])
+
+    def test_slow_client_gets_latest_pending_message(self):
+        slow = FakeSocket()
+        slow.gate.clear()
+        self.broadcaster.register(slow)
+
+        futures = self.broadcaster.fragment({"a": "1"})
+        slow.sending.wait()
+        futures += self.broadcaster.fragment({"b": "2"})
+        futures += self.broadcaster.fragment({"a": "3"})
+        slow.gate.set()
+        wait(futures)
+
+        self.assertEqual(len(slow.messages), 2)
+        self.assertEqual(json.loads(slow.messages[1]), {"type": "fragment", "pages": {"b": "2", "a": "3"}})
+        self.assertEqual(self.broadcaster.coalesced, 1)
+
+    def test_refresh_supersedes_pending_fragments(self):
+        slow = FakeSocket()
+        slow.gate.clear()
+        self.broadcaster.register(slow)
+
+        futures = self.broadcaster.fragment({"a": "1"})
+        slow.sending.wait()
+        self.broadcaster.refresh()
+        self.broadcaster.fragment({"b": "2"})
+        slow.gate.set()
+        wait(futures)
+
+        self.assertEqual(slow.messages[1:], ["refresh"])
+
+    def test_dead_clients_are_dropped(self):
+        alive, failing, stale = FakeSocket(), FakeSocket(fail=True), FakeSocket()
+        stale.connected = False  # e.g. closed after missed heartbeats
+        for client in [alive, failing, stale]:
+            self.broadcaster.register(client)
+
+        wait(self.broadcaster.refresh())
+
+        self.assertEqual(self.broadcaster.clients(), [alive])
+        self.assertEqual(self.broadcaster.dropped, 2)
+        self.assertEqual(stale.messages, [])
+
+    def test_dev_client_connects_to_the_serving_host(self):
+        from zenaura.server.broadcaster import DEV_CLIENT_SCRIPT
+        self.assertNotIn("localhost", DEV_CLIENT_SCRIPT)
+        self.assertIn("://${location.host}/refresh", DEV_CLIENT_SCRIPT)
+
+    def test_dev_server_sends_fragments_for_python_changes(self):
+        server = DevServer(Flask(__name__), fragment_updates=True)
+        client = FakeSocket()
+        server.broadcaster.register(client)
+        self.assertEqual(server.app.config["SOCK_SERVER_OPTIONS"], {"ping_interval": 25})
+        self.assertEqual(server.ws_client_list, [client])
+
+        with patch.object(ZenauraServer, "build_updates", {"page": "<h1>new</h1>"}):
+            wait(server.notify({"public/main.py"}))
+            wait(server.notify({"public/main.py", "public/main.css"}))
+        with patch.object(ZenauraServer, "build_updates", None):
+            wait(server.notify({"public/main.py"}))
+        server.broadcaster.shutdown()
+
+        self.assertEqual(json.loads(client.messages[0]), {"type": "fragment", "pages": {"page": "<h1>new</h1>"}})
+        self.assertEqual(client.messages[1:], ["refresh", "refresh"])
+
+
+@unittest.skipUnless(os.environ.get("ZENAURA_BENCHMARK"), "set ZENAURA_BENCHMARK=1 to run the benchmarks")
+class TestRefreshBroadcasterBenchmarks(unittest.TestCase):
+    """
+    Timings, they depend on the machine so they are opt-in.
+    """
+
+    def test_fan_out_latency(self):
+        broadcaster = RefreshBroadcaster(max_workers=8)
+        clients = [FakeSocket(delay=0.1) for _ in range(8)]
+        for client in clients:
+            broadcaster.register(client)
+
+        start = time.perf_counter()
+        wait(broadcaster.refresh())
+        elapsed = time.perf_counter() - start
+        broadcaster.shutdown()
+
+        # serial sends would take 0.8s
+        self.assertLess(elapsed, 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
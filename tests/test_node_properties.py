@@ -1,6 +1,12 @@
-from zenaura.client.tags.node import Node, update_root_properties
+from zenaura.client.tags.node import Node, update_root_properties, flush_root_properties
 from zenaura.client.tags.builder import Builder
+from zenaura.client.tags.attribute import Attribute
+import os
 import unittest
+from unittest.mock import patch
+import tracemalloc
+import gc
+import time
 
 class TestNodeCalculatedProperties(unittest.TestCase):
     
@@ -138,6 +144,157 @@ class TestNodeCalculatedProperties(unittest.TestCase):
         self.assertEqual(child21.path, "0100")
         self.assertEqual(great_grandchild111.path, "000001")
 
+    def test_subtree_hash_structural_equality(self):
+        a = Node("div", children=[Node("p", children=["text"])])
+        b = Node("div", children=[Node("p", children=["text"])])
+        c = Node("div", children=[Node("p", children=["other"])])
+        self.assertEqual(a.subtree_hash, b.subtree_hash)
+        self.assertNotEqual(a.subtree_hash, c.subtree_hash)
+
+    def test_subtree_hash_invalidated_on_mutation(self):
+        node = Node("ul", children=[Node("li")])
+        before = node.subtree_hash
+        node.append_child(Node("li"))
+        appended = node.subtree_hash
+        self.assertNotEqual(before, appended)
+        node.children = [Node("li")]
+        self.assertEqual(node.subtree_hash, before)
+
+    def test_subtree_hash_invalidated_on_grandchild_mutation(self):
+        def tree_like(node):
+            # an equal tree built fresh, its hash is never stale
+            return Node(node.name, [tree_like(child) for child in node.children], list(node.attributes), node.text, node.key_)
+        def tree():
+            return Node("main", children=[Node("section", children=[Node("p", children=["old"])])])
+        mutations = [
+            lambda p: setattr(p, "children", ["new"]),
+            lambda p: setattr(p.children[0], "text", "new"),
+            lambda p: p.attributes.append(Attribute("class", "row")),
+            lambda p: setattr(p, "key_", "row"),
+            lambda p: p.children.append(Node("span")),
+            lambda p: p.children.pop(),
+        ]
+        for mutate in mutations:
+            root = tree()
+            before = root.subtree_hash
+            paragraph = root.children[0].children[0]
+            mutate(paragraph)
+            self.assertNotEqual(root.subtree_hash, before)
+            self.assertEqual(root.subtree_hash, tree_like(root).subtree_hash)
+
+    def test_node_and_attribute_are_slotted(self):
+        node = Node("div", attributes=[Attribute("class", "row")])
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertFalse(hasattr(node.attributes[0], "__dict__"))
+        self.assertIsInstance(node.nodeId, int)
+        self.assertLess(node.nodeId, Node().nodeId)
+
+    def test_pickle_and_deepcopy_round_trip(self):
+        import copy
+        import pickle
+        from zenaura.client.compiler import compiler
+        tree = Node("div", attributes=[Attribute("class", "list")], children=[
+            Node("ul", children=[Node("li", key_=k, children=[k]) for k in "ab"]),
+            "text",
+        ])
+        for clone in (pickle.loads(pickle.dumps(tree)), copy.deepcopy(tree)):
+            self.assertEqual(compiler.compile(clone), compiler.compile(tree))
+            self.assertEqual(clone.subtree_hash, tree.subtree_hash)
+            item = clone.children[0].children[1]
+            self.assertEqual(item.path, tree.children[0].children[1].path)
+            self.assertIs(clone.children.owner, clone)
+            self.assertIs(item._owner, clone.children[0])
+            # mutations of the copy invalidate its hashes only
+            item.children.append("c")
+            self.assertNotEqual(clone.subtree_hash, tree.subtree_hash)
+            self.assertIsNotNone(tree._subtree_hash)
+
+    def test_10k_tree_nodes_are_slotted(self):
+        tree = Node("div", children=[
+            Node("p", attributes=[Attribute("class", "row")], children=[f"row {i}"]) for i in range(5000)
+        ])
+        nodes = [tree] + tree.children + [p.children[0] for p in tree.children]
+        attributes = [attr for p in tree.children for attr in p.attributes]
+        self.assertEqual(len(nodes), 10001)
+        self.assertFalse(any(hasattr(node, "__dict__") for node in nodes + attributes))
+        self.assertTrue(all(type(node.nodeId) is int for node in nodes))
+        self.assertEqual(len({node.nodeId for node in nodes}), len(nodes))
+
+    def test_table_build_walks_the_tree_once(self):
+        from zenaura.ui.table import Table
+        columns = [{"title": "A", "index": "a"}, {"title": "B", "index": "b"}, {"title": "C", "index": "c"}]
+        data = [{"a": i, "b": i * 2, "c": "x"} for i in range(1000)]
+        flush_root_properties()
+        with patch("zenaura.client.tags.node.update_root_properties", wraps=update_root_properties) as walk:
+            table = Table(data, columns)
+            # re-walking the subtree on every append took ~12s for 1000 rows
+            walk.assert_not_called()
+            self.assertEqual(table.children[1].children[-1].children[-1].path, "01199922")
+        walk.assert_called_once_with(table, with_keys=False)
+
+    def test_table_from_columns_matches_table(self):
+        from array import array
+        from zenaura.ui.table import Table
+        from zenaura.client.compiler import compiler
+        columns = {"A": [1, 2], "B": array("d", [0.5, 1.5]), "C": ("x", "y")}
+        data = [{"A": 1, "B": 0.5, "C": "x"}, {"A": 2, "B": 1.5, "C": "y"}]
+        spec = [{"title": title, "index": title} for title in columns]
+        self.assertEqual(
+            compiler.compile(Table.from_columns(columns, attrs={"id": "t"})),
+            compiler.compile(Table(data, spec, attrs={"id": "t"})),
+        )
+        with self.assertRaises(ValueError):
+            Table.from_columns({"A": [1, 2], "B": [1]})
+
+    def test_table_from_columns_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        from zenaura.ui.table import Table
+        from zenaura.client.compiler import compiler
+        html = compiler.compile(Table.from_columns({"A": numpy.arange(3), "B": numpy.array([0.5, 1.0, 2.0])}))
+        self.assertIn(">2<", html)
+        self.assertIn(">0.5<", html)
+
+    def test_table_from_columns_formats_columns_in_bulk(self):
+        from array import array
+        from zenaura.ui import table
+        rows = 10000  # 50k cells
+        columns = {
+            "A": list(range(rows)), "B": array("d", [i * 0.5 for i in range(rows)]),
+            "C": ["x"] * rows, "D": array("i", range(rows)), "E": [str(i) for i in range(rows)],
+        }
+        with patch("zenaura.ui.table.Builder") as builder, \
+                patch("zenaura.ui.table._column_text", wraps=table._column_text) as column_text:
+            built = table.Table.from_columns(columns)
+        builder.assert_not_called()
+        self.assertEqual(column_text.call_count, 5)
+        self.assertEqual(len(built.children[1].children), rows)
+        self.assertEqual(built.children[1].children[-1].children[1].children[0].text, "4999.5")
+
+    def test_discarded_pending_trees_are_freed(self):
+        import weakref
+        from zenaura.client.tags import node as node_module
+        flush_root_properties()
+        tree = Node("div", children=[Node("p", children=["discarded"])])
+        self.assertIn(tree, node_module._pending_roots)
+        ref = weakref.ref(tree)
+        del tree
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(node_module._pending_roots), 0)
+
+    def test_deferred_paths_follow_mutation_order(self):
+        leaf = Node("span")
+        child = Node("p", children=[leaf])
+        root = Node("div", children=[Node("h1"), child])
+        self.assertEqual(leaf.path, "0110")
+        self.assertEqual(leaf.level, 2)
+        child.append_child(Node("b"))
+        self.assertEqual(child.level, 0)
+        self.assertEqual(child.children[1].path, "0101")
+
     def test_builder_hierarchy(self):
         root = Builder().with_child(
             Builder().with_child(
@@ -147,4 +304,73 @@ class TestNodeCalculatedProperties(unittest.TestCase):
 
         self.assertEqual(root.path, "")
         self.assertEqual(root.children[0].path, "00")
-        self.assertEqual(root.children[0].children[0].path, "0010")
\ No newline at end of file
+        self.assertEqual(root.children[0].children[0].path, "0010")
+
+
+@unittest.skipUnless(os.environ.get("ZENAURA_BENCHMARK"), "set ZENAURA_BENCHMARK=1 to run the benchmarks")
+class TestNodeBenchmarks(unittest.TestCase):
+    """
+    Timings and allocations, they depend on the machine and the interpreter so they are opt-in.
+    """
+
+    def test_memory_per_node_10k_tree(self):
+        # dict backed nodes with uuid4 ids measured ~545 bytes per node on this tree
+        gc.collect()
+        tracemalloc.start()
+        tree = Node("div", children=[
+            Node("p", attributes=[Attribute("class", "row")], children=[f"row {i}"]) for i in range(5000)
+        ])
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        bytes_per_node = allocated / 10001
+        self.assertEqual(len(tree.children), 5000)
+        self.assertLess(bytes_per_node, 480)
+
+    def test_table_build_time_is_linear(self):
+        from zenaura.ui.table import Table
+        columns = [{"title": "A", "index": "a"}, {"title": "B", "index": "b"}, {"title": "C", "index": "c"}]
+
+        def build(rows):
+            data = [{"a": i, "b": i * 2, "c": "x"} for i in range(rows)]
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                table = Table(data, columns)
+                # paths are assigned on first read, include them in the measure
+                self.assertTrue(table.children[1].children[-1].children[-1].path)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        small, large = build(1000), build(4000)
+        self.assertLess(small, 1)
+        self.assertLess(large / small, 8)
+
+    def test_table_from_columns_benchmark(self):
+        from array import array
+        from zenaura.ui.table import Table
+        rows = 10000  # 50k cells
+        columns = {
+            "A": list(range(rows)), "B": array("d", [i * 0.5 for i in range(rows)]),
+            "C": ["x"] * rows, "D": array("i", range(rows)), "E": [str(i) for i in range(rows)],
+        }
+        data = [{title: columns[title][i] for title in columns} for i in range(rows)]
+        spec = [{"title": title, "index": title} for title in columns]
+
+        def best(build):
+            # measure construction, not collections of the heap other tests left behind
+            timings = []
+            gc.collect()
+            gc.disable()
+            try:
+                for _ in range(3):
+                    start = time.perf_counter()
+                    build()
+                    timings.append(time.perf_counter() - start)
+            finally:
+                gc.enable()
+            return min(timings)
+
+        from_rows = best(lambda: Table(data, spec))
+        from_columns = best(lambda: Table.from_columns(columns))
+        # ~0.15s vs ~0.10s, Builder.with_class scans attributes and with_text appends per cell
+        self.assertLess(from_columns, from_rows)
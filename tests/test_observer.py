@@ -1,6 +1,7 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock 
-from zenaura.client.observer import Observer, Subject
+from unittest.mock import MagicMock, AsyncMock
+from zenaura.client.observer import Observer, Subject, Store
 
 observer1 = MagicMock(spec=Observer)
 
@@ -47,5 +48,146 @@ class TestSubject(unittest.TestCase):
         self.assertNotIn(observer, subject._observers)
 
 
+class Recorder(Observer):
+    def __init__(self):
+        self.calls = []
+
+    def update(self, value):
+        self.calls.append(value)
+
+    def update_batch(self, value, changes):
+        self.calls.append((value, changes))
+
+
+class TestSubjectBatch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.subject = Subject()
+        self.subject.state = {"count": 0, "name": "a"}
+        self.observer = Recorder()
+        self.subject.attach(self.observer)
+
+    def test_batch_notifies_once_with_diff(self):
+        with self.subject.batch():
+            self.subject.update({"count": 1})
+            self.subject.update({"count": 2})
+            self.subject.update({"name": "a"})
+            self.assertEqual(self.observer.calls, [])
+        self.assertEqual(self.observer.calls, [({"count": 2, "name": "a"}, {"count": (0, 2)})])
+
+    def test_nested_batches_notify_at_outermost_exit(self):
+        with self.subject.batch():
+            with self.subject.batch():
+                self.subject.update({"count": 1})
+            self.assertEqual(self.observer.calls, [])
+        self.assertEqual(len(self.observer.calls), 1)
+
+    def test_batch_without_changes_does_not_notify(self):
+        with self.subject.batch():
+            self.subject.update({"count": 0})
+        self.assertEqual(self.observer.calls, [])
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.subject.transaction():
+                self.subject.update({"count": 5})
+                raise ValueError
+        self.assertEqual(self.subject.state, {"count": 0, "name": "a"})
+        self.assertEqual(self.observer.calls, [])
+
+    def test_update_rejects_a_non_dict_state(self):
+        self.subject.state = ["a"]
+        with self.assertRaises(TypeError):
+            self.subject.update({"count": 1})
+        self.assertEqual(self.subject.state, ["a"])
+
+    def test_plain_observers_receive_state(self):
+        observer = MagicMock()
+        del observer.update_batch
+        self.subject.attach(observer)
+        with self.subject.batch():
+            self.subject.state = {"count": 3}
+        observer.update.assert_called_once_with({"count": 3})
+
+    async def test_async_notify_does_not_block_writer(self):
+        subject = Subject(async_notify=True)
+        observer = MagicMock()
+        observer.update = AsyncMock()
+        subject.attach(observer)
+        subject.state = {"count": 1}
+        observer.update.assert_not_called()
+        for _ in range(2):
+            await asyncio.sleep(0)
+        observer.update.assert_awaited_once_with({"count": 1})
+
+
+class TestStore(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        from zenaura.client.component import Component, Reuseable
+        from zenaura.client.dom import zenaura_dom
+        from zenaura.client.scheduler import RenderScheduler
+        from zenaura.client.tags import Node
+
+        self.scheduler = RenderScheduler(render=AsyncMock())
+        self.store = Store({"user": "ada", "cart": [], "theme": "dark"}, scheduler=self.scheduler)
+        self.zenaura_dom = zenaura_dom
+        store = self.store
+
+        @Reuseable
+        class Reader(Component):
+            def __init__(self, keys):
+                super().__init__()
+                self.keys = keys
+
+            def render(self):
+                return Node("p", children=[str([store[key] for key in self.keys])])
+
+        self.Reader = Reader
+
+    def test_only_dependent_components_are_scheduled(self):
+        readers = [self.Reader(["cart"]) for _ in range(3)] + [self.Reader(["user"])]
+        for reader in readers:
+            self.zenaura_dom.hyd_vdom_update(reader)
+        self.assertEqual(self.store.dependents("cart"), {reader.id for reader in readers[:3]})
+
+        self.store["user"] = "grace"
+        self.assertEqual(list(self.scheduler.dirty), [readers[3].id])
+
+        self.store["theme"] = "light"
+        self.store["user"] = "grace"  # unchanged value
+        self.assertEqual(len(self.scheduler.dirty), 1)
+
+    def test_update_schedules_each_component_once(self):
+        both = self.Reader(["user", "cart"])
+        self.zenaura_dom.hyd_vdom_update(both)
+        self.assertEqual(self.store.update({"user": "grace", "cart": ["book"]}), {"user", "cart"})
+        self.assertEqual(list(self.scheduler.dirty), [both.id])
+
+    def test_mutable_value_written_back_notifies(self):
+        reader = self.Reader(["cart"])
+        self.zenaura_dom.hyd_vdom_update(reader)
+        cart = self.store["cart"]
+        self.assertEqual(self.store.update({"cart": []}), set())  # equal new list
+        self.assertEqual(list(self.scheduler.dirty), [])
+
+        cart.append("book")
+        self.assertEqual(self.store.update({"cart": cart}), {"cart"})
+        self.assertEqual(list(self.scheduler.dirty), [reader.id])
+
+    def test_dependencies_follow_the_last_render(self):
+        reader = self.Reader(["user"])
+        self.zenaura_dom.hyd_vdom_update(reader)
+        reader.keys = ["theme"]
+        self.zenaura_dom.hyd_vdom_update(reader)
+        self.assertEqual(self.store.dependents("user"), set())
+        self.assertEqual(self.store.dependents("theme"), {reader.id})
+        self.zenaura_dom.hyd_vdom_delete(reader)
+        self.assertEqual(self.store.dependents("theme"), set())
+
+    def test_reads_outside_render_are_not_tracked(self):
+        self.assertEqual(self.store["user"], "ada")
+        self.assertEqual(self.store.dependents("user"), set())
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -20,6 +20,8 @@ class TestHydratorRealDomAdapter(unittest.TestCase):
         self.patcher.start()
 
         self.hydrator = HydratorRealDomAdapter()
+        # fresh document, drop handles cached from the previous one
+        self.hydrator.hyd_rdom_invalidate()
 
 
     def tearDown(self):
@@ -100,7 +102,86 @@ class TestHydratorRealDomAdapter(unittest.TestCase):
         self.hydrator.hyd_rdom_remove_child("child-comp")
         self.assertEqual(child_div.outerHTML, "")  # Child should be removed
     
+    def test_hyd_rdom_move_child_before(self):
+        parent_div = self.mock_document.createElement("div")
+        first = self.mock_document.createElement("li")
+        second = self.mock_document.createElement("li")
+        parent_div.appendChild(first)
+        parent_div.appendChild(second)
+        self.mock_document.setElementById("parent-comp", parent_div)
+        self.mock_document.setElementById("first", first)
+        self.mock_document.setElementById("second", second)
+
+        self.hydrator.hyd_rdom_move_child_before("parent-comp", "second", "first")
+        self.assertEqual(parent_div.childNodes, [second, first])
+
+        self.hydrator.hyd_rdom_move_child_before("parent-comp", "second", None)
+        self.assertEqual(parent_div.childNodes, [first, second])
+
+    def test_hyd_rdom_insert_child_before(self):
+        parent_div = self.mock_document.createElement("div")
+        first = self.mock_document.createElement("li")
+        parent_div.appendChild(first)
+        self.mock_document.setElementById("parent-comp", parent_div)
+        self.mock_document.setElementById("first", first)
+
+        self.hydrator.hyd_rdom_insert_child_before("parent-comp", "first", "<li>new</li>")
+        self.assertEqual(len(parent_div.childNodes), 2)
+        self.assertIs(parent_div.childNodes[1], first)
+
     #  New test for hyd_rdom_add_text_node
+    def test_hyd_rdom_query_caches_element_handles(self):
+        element = self.mock_document.createElement("div")
+        self.mock_document.setElementById("cached", element)
+        with patch.object(self.mock_document, "querySelector", wraps=self.mock_document.querySelector) as query:
+            for _ in range(5):
+                self.hydrator.hyd_rdom_set_attribute("cached", Attribute("class", "x"))
+            self.assertEqual(query.call_count, 1)
+            # detached handles are looked up again
+            element.isConnected = False
+            replacement = self.mock_document.createElement("div")
+            self.mock_document.setElementById("cached", replacement)
+            self.assertIs(self.hydrator.hyd_rdom_query("cached"), replacement)
+            self.assertEqual(query.call_count, 2)
+
+    def test_hyd_rdom_cache_invalidation(self):
+        element = self.mock_document.createElement("div")
+        self.mock_document.setElementById("gone", element)
+        self.hydrator.hyd_rdom_query("gone")
+        self.hydrator.hyd_rdom_remove_child("gone")
+        self.assertNotIn("gone", self.hydrator.element_cache)
+        self.hydrator.hyd_rdom_query("root")
+        self.hydrator.hyd_rdom_attach_to_root("<p></p>")
+        self.assertEqual(self.hydrator.element_cache, {})
+
+    def test_hyd_rdom_cache_is_per_instance(self):
+        element = self.mock_document.createElement("div")
+        self.mock_document.setElementById("mine", element)
+        self.hydrator.hyd_rdom_query("mine")
+        other = HydratorRealDomAdapter()
+        self.assertEqual(other.element_cache, {})
+        self.assertIn("mine", self.hydrator.element_cache)
+
+    def test_hyd_rdom_removal_evicts_descendants(self):
+        for uid in ("comp0", "comp00", "comp0010", "comp01", "other0"):
+            self.mock_document.setElementById(uid, self.mock_document.createElement("div"))
+            self.hydrator.hyd_rdom_query(uid)
+        self.hydrator.hyd_rdom_remove_child("comp00")
+        self.assertEqual(sorted(self.hydrator.element_cache), ["comp0", "comp01", "other0"])
+        # text replaces the children, the element itself stays cached
+        self.hydrator.hyd_rdom_replace_inner_text("comp0", "done")
+        self.assertEqual(sorted(self.hydrator.element_cache), ["comp0", "other0"])
+
+    def test_hyd_rdom_index_elements(self):
+        for uid in ("page", "comp0", "comp00"):
+            element = self.mock_document.createElement("div")
+            element.setAttribute(ZENAURA_DOM_ATTRIBUTE, uid)
+            self.mock_document.setElementById(uid, element)
+        self.assertEqual(self.hydrator.hyd_rdom_index_elements(), 3)
+        with patch.object(self.mock_document, "querySelector") as query:
+            self.assertTrue(self.hydrator.hyd_rdom_query("comp00"))
+            query.assert_not_called()
+
     def test_hyd_rdom_add_text_render(self):
         parent_div = self.mock_document.createElement("div")
         parent_div.setAttribute(ZENAURA_DOM_ATTRIBUTE, "parent-comp")
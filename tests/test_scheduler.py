@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+from zenaura.client.component import Component, Reuseable
+from zenaura.client.mutator import mutates
+from zenaura.client.scheduler import RenderScheduler, render_scheduler
+from zenaura.client.tags import Node
+
+
+@Reuseable
+class Typing(Component):
+    def __init__(self):
+        super().__init__()
+        self.value = ""
+
+    @mutates
+    def on_input(self, char):
+        self.value += char
+
+    def render(self):
+        return Node("p", children=[self.value])
+
+
+class TestRenderScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def test_mutations_in_one_tick_render_once(self):
+        component = Typing()
+        render = AsyncMock()
+        with patch.object(render_scheduler, "render", render):
+            component.on_input("a")
+            component.on_input("b")
+            component.on_input("c")
+            self.assertEqual(await render_scheduler.flush(), 1)
+        render.assert_awaited_once_with(component)
+        self.assertEqual(component.value, "abc")
+
+    async def test_one_render_per_dirty_component(self):
+        first, second = Typing(), Typing()
+        scheduler = RenderScheduler(render=AsyncMock())
+        for component in (first, second, first, second, first):
+            scheduler.schedule(component)
+        self.assertEqual(await scheduler.flush(), 2)
+        self.assertEqual([c.args[0] for c in scheduler.render.await_args_list], [first, second])
+        self.assertEqual(await scheduler.flush(), 0)
+
+    async def test_flush_is_scheduled_on_running_loop(self):
+        component = Typing()
+        scheduler = RenderScheduler(render=AsyncMock())
+        scheduler.schedule(component)
+        scheduler.schedule(component)
+        self.assertTrue(scheduler.scheduled)
+        for _ in range(3):
+            await asyncio.sleep(0)
+        scheduler.render.assert_awaited_once_with(component)
+        self.assertEqual(scheduler.renders, 1)
+        self.assertFalse(scheduler.scheduled)
+
+    async def test_components_marked_while_flushing_render_in_same_flush(self):
+        first, second = Typing(), Typing()
+        scheduler = RenderScheduler()
+
+        async def render(component):
+            if component is first:
+                scheduler.schedule(second)
+
+        scheduler.render = render
+        scheduler.schedule(first)
+        self.assertEqual(await scheduler.flush(), 2)
+
+
+    async def test_schedules_again_after_a_flush_raises(self):
+        first, second = Typing(), Typing()
+        scheduler = RenderScheduler(render=AsyncMock(side_effect=[RuntimeError("render failed"), None, None]))
+        scheduler.schedule(first)
+        scheduler.schedule(second)
+        with self.assertRaises(RuntimeError):
+            await scheduler.flush()
+        self.assertFalse(scheduler.scheduled)
+        scheduler.schedule(first)
+        self.assertTrue(scheduler.scheduled)
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.assertEqual([c.args[0] for c in scheduler.render.await_args_list], [first, second, first])
+        self.assertFalse(scheduler.scheduled)
+
+    async def test_failed_registration_does_not_block_later_schedules(self):
+        component = Typing()
+        scheduler = RenderScheduler(render=AsyncMock())
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "call_soon", side_effect=RuntimeError("Event loop is closed")):
+            scheduler.schedule(component)
+        self.assertFalse(scheduler.scheduled)
+        scheduler.schedule(component)
+        for _ in range(3):
+            await asyncio.sleep(0)
+        scheduler.render.assert_awaited_once_with(component)
+
+    async def test_flush_left_on_a_stopped_loop_is_scheduled_again(self):
+        component = Typing()
+        scheduler = RenderScheduler(render=AsyncMock())
+        stopped = asyncio.new_event_loop()
+        stopped.close()
+        scheduler.scheduled, scheduler.loop = True, stopped  # its flush never ran
+        scheduler.schedule(component)
+        self.assertIs(scheduler.loop, asyncio.get_running_loop())
+        for _ in range(3):
+            await asyncio.sleep(0)
+        scheduler.render.assert_awaited_once_with(component)
+
+
+class TestRenderSchedulerWithoutLoop(unittest.TestCase):
+
+    def test_without_loop_components_wait_for_flush(self):
+        component = Typing()
+        scheduler = RenderScheduler(render=AsyncMock())
+        scheduler.schedule(component)
+        self.assertFalse(scheduler.scheduled)
+        self.assertIn(component.id, scheduler.dirty)
+        self.assertEqual(asyncio.run(scheduler.flush()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
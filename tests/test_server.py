@@ -1,12 +1,23 @@
 import unittest
 import io
+import re
+import os
+import json
+import hashlib
+import tempfile
 from zenaura.client.page import Page 
 from .mocks.counter_mocks import Counter
 from zenaura.client.hydrator import HydratorCompilerAdapter
-from zenaura.server.server import ZenauraServer, template
+from zenaura.server.server import ZenauraServer, template, compile_timed
 from zenaura.client.app import App 
 from unittest.mock import MagicMock, patch
 from zenaura.client.layout import Layout
+from zenaura.client.tags import Node
+
+
+def compile_in_worker(page, trees=None):
+    html, seconds = compile_timed(page, trees)
+    return f"{html}<!-- {os.getpid()} -->", seconds
 
 
 class TestZenauraServer(unittest.TestCase):
@@ -63,6 +74,15 @@ class TestZenauraServer(unittest.TestCase):
         result = ZenauraServer.hydrate_page(self.page)
         self.assertEqual(result, self.template_content(self.compiler_adapter.hyd_comp_compile_page(self.page), title="zenaura", meta_description="this app created with zenaura", icon="./public/favicon.ico", pydide="https://pyscript.net/releases/2024.1.1/core.js"))
 
+    def test_stream_page_matches_hydrate_page(self):
+        chunks = list(ZenauraServer.stream_page(self.page))
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual("".join(chunks), ZenauraServer.hydrate_page(self.page))
+
+    def test_template_ships_batched_patch_helper(self):
+        html = self.template_content("<p></p>")
+        self.assertIn("window.zenauraApplyPatches", html)
+
     @patch("builtins.open", new_callable=unittest.mock.mock_open)
     def test_hydrate_app_home_defined(self, mock_open):
         result = ZenauraServer.hydrate_app(self.router)
@@ -86,6 +106,86 @@ class TestZenauraServer(unittest.TestCase):
             result, 
         )
     
+    def test_hydrate_app_lazy_routes(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                os.mkdir("public")
+                eager = ZenauraServer.hydrate_app(self.router)
+                lazy = ZenauraServer.hydrate_app(self.router, lazy_routes=True)
+                with open("./public/fragments/manifest.json") as file:
+                    manifest = json.load(file)
+                fragments = {}
+                for path, entry in manifest.items():
+                    with open(entry["file"]) as file:
+                        fragments[path] = file.read()
+            finally:
+                os.chdir(cwd)
+
+        home = self.router.routes["/"][0]
+        self.assertEqual(list(manifest), ["/test", "/2"])
+        self.assertEqual(manifest["/test"]["page"], self.router.routes["/test"][0].id)
+        self.assertIn(f'<div data-zenaura="{home.id}">', lazy)
+        self.assertNotIn("<div hidden", lazy)
+        self.assertIn('id="zenaura-routes"', lazy)
+        self.assertLess(len(lazy), len(eager))
+        for html in fragments.values():
+            self.assertTrue(html.startswith("<div hidden"))
+            self.assertIn(html, eager)
+
+    @patch("builtins.open", new_callable=unittest.mock.mock_open)
+    def test_hydrate_app_parallel_matches_serial(self, mock_open):
+        serial = ZenauraServer.hydrate_app(self.router)
+        parallel = ZenauraServer.hydrate_app(self.router, parallel=True, workers=2)
+        # the mock renders bound method reprs, their addresses differ in the workers
+        address = re.compile(r"0x[0-9a-f]+")
+        self.assertEqual(address.sub("", parallel), address.sub("", serial))
+        self.assertEqual(list(ZenauraServer.build_timings), ["/", "/2", "/test"])
+        self.assertTrue(all(seconds >= 0 for seconds in ZenauraServer.build_timings.values()))
+
+    def test_compile_pages_falls_back_to_serial(self):
+        from zenaura.client.component import Component
+
+        class Local(Component):  # can't be pickled to a worker
+            def render(self):
+                return Node("p", children=["local"])
+
+        pages = {"/": Page([Local()]), "/test": self.page}
+        with self.assertLogs("zenaura", "WARNING") as logs:
+            compiled = ZenauraServer.compile_pages(pages, parallel=True, workers=2)
+        self.assertIn("Parallel build failed", logs.output[0])
+        self.assertEqual(list(compiled), ["/", "/test"])
+        self.assertIn("local", compiled["/"])
+
+    def test_compile_pages_compiles_in_the_pool(self):
+        pages = {"/": self.router.routes["/"][0], "/test": self.page}
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch("zenaura.server.server.compile_timed", compile_in_worker), \
+                self.assertNoLogs("zenaura", "WARNING"):
+            compiled = ZenauraServer.compile_pages(pages, parallel=True, workers=2, cache=PageCache(tmp))
+        pids = {int(re.search(r"<!-- (\d+) -->", html).group(1)) for html in compiled.values()}
+        self.assertNotIn(os.getpid(), pids)
+
+    @patch("builtins.open", new_callable=unittest.mock.mock_open)
+    def test_compile_pages_forks_workers(self, mock_open):
+        pages = {"/": self.router.routes["/"][0], "/test": self.page}
+        with patch("zenaura.server.server.ProcessPoolExecutor") as executor:
+            executor.return_value.__enter__.return_value.map.side_effect = map
+            ZenauraServer.compile_pages(pages, parallel=True, workers=2)
+        self.assertEqual(executor.call_args.kwargs["mp_context"].get_start_method(), "fork")
+
+    @patch("builtins.open", new_callable=unittest.mock.mock_open)
+    def test_compile_pages_parallel_matches_serial_under_spawn(self, mock_open):
+        pages = {"/": self.router.routes["/"][0], "/test": self.page}
+        serial = ZenauraServer.compile_pages(pages)
+        with patch("zenaura.server.server.multiprocessing.get_all_start_methods", return_value=["spawn"]), \
+                patch("zenaura.server.server.ProcessPoolExecutor") as executor:
+            parallel = ZenauraServer.compile_pages(pages, parallel=True, workers=2)
+        # spawned workers could number component ids differently, the pages are compiled here
+        executor.assert_not_called()
+        self.assertEqual(parallel, serial)
+
     @patch("builtins.open", new_callable=unittest.mock.mock_open)
     def test_hydrate_app_home_not_defined_first_in_stack_shown(self, mock_open):        
         result = ZenauraServer.hydrate_app(self.router_without_home)
@@ -138,6 +238,111 @@ class TestZenauraServer(unittest.TestCase):
         self.assertIn(f'<div k="test" data-zenaura="{pages[0]}">', result)
         self.assertEqual(result.count(f'data-zenaura="{Counter([]).id}"') , 3)
 
-    
+
+
+from zenaura.client.component import Component, Reuseable
+from zenaura.server.cache import PageCache, write_tree
+from zenaura.client.tags.attribute import Attribute
+from zenaura.client.app import Route
+
+
+@Reuseable
+class Greeting(Component):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def render(self):
+        return Node("p", children=[f"hello {self.name}"])
+
+
+@Reuseable
+class RenderCount(Component):
+    def __init__(self):
+        super().__init__()
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        return Node("p", children=[f"render {self.renders}"])
+
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = PageCache(self.tmp.name)
+        self.first, self.second = Greeting("ada"), Greeting("grace")
+        self.pages = {"/": Page([self.first]), "/about": Page([self.second])}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_digest_is_stable_and_follows_render_output(self):
+        digest, trees = self.cache.digest(self.pages["/"])
+        self.assertEqual(self.cache.digest(self.pages["/"])[0], digest)
+        self.assertEqual(len(trees), 1)
+        self.first.name = "lovelace"
+        self.assertNotEqual(self.cache.digest(self.pages["/"])[0], digest)
+
+    def test_tree_serialization_is_unambiguous(self):
+        def tree_digest(tree):
+            digest = hashlib.sha256()
+            write_tree(tree, digest)
+            return digest.hexdigest()
+
+        self.assertNotEqual(
+            tree_digest(Node("p", attributes=[Attribute("a=b", "c")])),
+            tree_digest(Node("p", attributes=[Attribute("a", "b=c")])),
+        )
+        self.assertNotEqual(
+            tree_digest(Node("p", attributes=[Attribute("a", "b\0c=d")])),
+            tree_digest(Node("p", attributes=[Attribute("a", "b"), Attribute("c", "d")])),
+        )
+        self.assertNotEqual(tree_digest(Node("p", text="a|b")), tree_digest(Node("p", key_="a", text="b")))
+
+    def test_only_changed_pages_are_compiled(self):
+        cold = ZenauraServer.compile_pages(self.pages, cache=self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+        self.second.name = "hopper"
+        with patch("zenaura.server.server.compile_timed", wraps=compile_timed) as compile:
+            warm = ZenauraServer.compile_pages(self.pages, cache=self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+        self.assertEqual(compile.call_count, 1)
+        self.assertEqual(list(ZenauraServer.build_timings), ["/about"])
+        self.assertEqual(warm["/"], cold["/"])
+        self.assertIn("hello hopper", warm["/about"])
+        self.assertEqual(warm, ZenauraServer.compile_pages(self.pages))
+
+    def test_parallel_misses_compile_the_digest_trees(self):
+        pages = {"/": Page([RenderCount()]), "/about": Page([RenderCount()])}
+        # the serial fallback compiles the same trees, the pool must have compiled them
+        with patch("zenaura.server.server.compile_timed", compile_in_worker), \
+                self.assertNoLogs("zenaura", "WARNING"):
+            compiled = ZenauraServer.compile_pages(pages, parallel=True, workers=2, cache=self.cache)
+        self.assertNotIn(f"<!-- {os.getpid()} -->", "".join(compiled.values()))
+        # a worker rendering the page again would compile "render 2"
+        for html in compiled.values():
+            self.assertIn("render 1", html)
+            self.assertNotIn("render 2", html)
+
+    @patch("zenaura.server.server.open", new_callable=unittest.mock.mock_open, create=True)
+    def test_hydrate_app_records_updated_pages(self, mock_open):
+        app = App()
+        for path, page in self.pages.items():
+            app.add_route(Route(path, path, page))
+        ZenauraServer.compile_pages(self.pages, cache=self.cache)
+        self.second.name = "hopper"
+
+        ZenauraServer.hydrate_app(app, cache=self.cache)
+        updates = ZenauraServer.build_updates
+        self.assertEqual(list(updates), [self.pages["/about"].id])
+        self.assertIn("hello hopper", updates[self.pages["/about"].id])
+
+        ZenauraServer.hydrate_app(app)
+        self.assertIsNone(ZenauraServer.build_updates)
+
+
 if __name__ == '__main__':
     unittest.main()
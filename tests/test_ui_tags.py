@@ -463,5 +463,114 @@ class TagTests(unittest.TestCase):
       result = compiler.compile(elm)
       self.assertEqual(result, '<col span="2" />')
 
+class TestMemo(unittest.TestCase):
+  def test_memo_returns_cached_subtree(self):
+    from zenaura.ui import memo
+    calls = []
+
+    @memo
+    def Sidebar(links):
+      calls.append(links)
+      return nav(*[a(label, href=href) for label, href in links])
+
+    links = (("Home", "/"), ("Docs", "/docs"))
+    first = Sidebar(links)
+    second = Sidebar(links)
+    self.assertIsNot(second, first)
+    self.assertEqual(second.subtree_hash, first.subtree_hash)
+    self.assertNotEqual(Sidebar((("Home", "/"),)).subtree_hash, first.subtree_hash)
+    self.assertEqual(len(calls), 2)
+    self.assertEqual(Sidebar.cache_info().hits, 1)
+
+  def test_memo_skips_unhashable_arguments(self):
+    from zenaura.ui import memo
+
+    @memo(maxsize=4)
+    def Items(labels):
+      return ul(*[li(label) for label in labels])
+
+    self.assertIsNot(Items(["a"]), Items(["a"]))
+    self.assertEqual(Items.cache_info().currsize, 0)
+
+  def test_memoized_subtree_is_skipped_by_diff(self):
+    from zenaura.ui import memo
+    from zenaura.client.dom import zenaura_dom
+
+    @memo
+    def Footer(text):
+      return footer(p(text))
+
+    prev_tree = div(Footer("static"), p("1"))
+    new_tree = div(Footer("static"), p("2"))
+    patches = zenaura_dom.search(prev_tree, new_tree, "memo")
+    self.assertEqual([patch.op.name for patch in patches], ["NODE_INNER_TEXT"])
+
+  def test_memoized_subtree_under_two_parents(self):
+    from zenaura.ui import memo
+
+    @memo
+    def Badge(text):
+      return span(b(text))
+
+    first, second = Badge("new"), Badge("new")
+    tree = div(section(first), p("x"), aside(second))
+    html = compiler.compile(tree, "page", zenaura_dom_mode=True)
+    self.assertEqual(first.children[0].path, tree.children[0].children[0].children[0].path)
+    self.assertNotEqual(first.children[0].path, second.children[0].path)
+    self.assertIn(f'data-zenaura="page{first.children[0].path}"', html)
+    self.assertIn(f'data-zenaura="page{second.children[0].path}"', html)
+
+class TestVirtualList(unittest.TestCase):
+  def test_visible_range(self):
+    from zenaura.ui.virtual import visible_range
+    self.assertEqual(visible_range(20000, 32, 480, 0, 5), (0, 21))
+    self.assertEqual(visible_range(20000, 32, 480, 3200, 5), (95, 121))
+    self.assertEqual(visible_range(10, 32, 480, 0, 5), (0, 10))
+    self.assertEqual(visible_range(10, 32, 480, 3200, 5), (0, 10))
+
+  def test_only_visible_rows_are_materialized(self):
+    from zenaura.ui.virtual import VirtualTable
+    data = [{"id": i, "msg": f"line {i}"} for i in range(20000)]
+    viewer = VirtualTable(data, [{"title": "Message", "index": "msg"}], row_height=32, height=480, key=lambda row, i: row["id"])
+    html = compiler.compile(viewer.render())
+    self.assertEqual(html.count("<tr"), 22)  # header + 21 rows
+    self.assertIn("height:640032px", html)  # header + every row
+
+  def test_table_header_stays_out_of_the_window_offset(self):
+    from zenaura.ui.virtual import VirtualTable
+    data = [{"id": i, "msg": f"line {i}"} for i in range(1000)]
+    viewer = VirtualTable(data, [{"title": "Message", "index": "msg"}], row_height=32, height=480)
+    viewer.scroll_to(3200)
+    grid = viewer.render().children[0].children[0]
+    head, body = grid.children
+    self.assertEqual((head.name, body.name), ("thead", "tbody"))
+    self.assertNotIn("translateY", compiler.compile(head))
+    self.assertIn("position:sticky", compiler.compile(head))
+    self.assertIn(f"translateY({viewer.get_state()['start'] * 32}px)", compiler.compile(body))
+    self.assertNotIn("translateY", "".join(a.value for a in grid.attributes if a.key == "style"))
+
+  def test_scroll_produces_small_patch_set(self):
+    from zenaura.ui.virtual import VirtualList
+    from zenaura.client.dom import zenaura_dom
+    from zenaura.client.algorithm.operations import ADD_NODE, REMOVE_NODE
+    logs = VirtualList([f"line {i}" for i in range(20000)], lambda line, i: line, row_height=32, height=480)
+    logs.scroll_to(3200)
+    prev_tree = logs.render()
+    logs.scroll_to(3264)
+    patches = zenaura_dom.search(prev_tree, logs.render(), logs.id)
+    # two rows leave, two rows enter, the window offset attribute changes
+    self.assertEqual(sum(p.op.name == ADD_NODE for p in patches), 2)
+    self.assertEqual(sum(p.op.name == REMOVE_NODE for p in patches), 2)
+    self.assertLessEqual(len(patches), 6)
+
+  def test_scroll_within_window_keeps_state(self):
+    from zenaura.ui.virtual import VirtualList
+    logs = VirtualList(list(range(100)), lambda item, i: str(item), row_height=32, height=480)
+    state = logs.get_state()
+    self.assertIs(logs.scroll_to(10), state)
+    self.assertIsNot(logs.scroll_to(320), state)
+    logs.set_items(list(range(5)))
+    self.assertEqual((logs.get_state()["start"], logs.get_state()["stop"]), (0, 5))
+
 if __name__ == "__main__":
     unittest.main()
@@ -49,6 +49,11 @@ class TestDom(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(re_rendered.children[0].children[0].children[0].children[0].text, f'Counter: {self.counterState(count=1)}')
 
         
+    async def test_mount_drops_handles_of_the_previous_page(self):
+        self.zenaura_dom.element_cache["previous-page-element"] = MagicMock()
+        await self.zenaura_dom.mount(Page([self.counter]))
+        self.assertNotIn("previous-page-element", self.zenaura_dom.element_cache)
+
     async def test_mount_existing_component(self):
         
         await self.zenaura_dom.mount(Page([self.counter]))
@@ -153,3 +158,102 @@ class TestDom(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(component.x, 0)
         await self.zenaura_dom.render(component)
         self.assertEqual(component.x, 10)
+
+    async def test_one_render_per_update(self):
+        @Reuseable
+        class Counted(Component):
+            def __init__(self):
+                super().__init__()
+                self.calls = 0
+
+            def render(self):
+                self.calls += 1
+                return Node("p", children=[str(self.calls)])
+
+        component = Counted()
+        await self.zenaura_dom.mount(Page([component]))
+        self.assertEqual(component.calls, 1)
+        await self.zenaura_dom.render(component)
+        await self.zenaura_dom.render(component)
+        self.assertEqual(component.calls, 3)
+        self.assertEqual(self.zenaura_dom.render_counts[component.id], 3)
+        # the stored tree is the diffed one
+        self.assertEqual(self.zenaura_dom.zen_dom_table[component.id].children[0].text, "3")
+
+    def test_on_error_renders_error_component_once(self):
+        @Reuseable
+        class CountedError(Component):
+            calls = 0
+
+            def render(self):
+                CountedError.calls += 1
+                return Node("p", children=["error"])
+
+        @Reuseable
+        class Failing(Component):
+            def on_error(self, error):
+                return CountedError()
+
+        component = Failing()
+        self.zenaura_dom.on_error(component, "boom")
+        self.assertEqual(CountedError.calls, 1)
+        self.assertEqual(self.zenaura_dom.zen_dom_table[component.id].children[0].text, "error")
+
+    async def test_should_update_false_skips_render(self):
+        @Reuseable
+        class Sidebar(Component):
+            def __init__(self):
+                super().__init__()
+                self.set_state({"links": 3, "hover": False})
+                self.mutations = 0
+
+            def should_update(self, prev_state, next_state):
+                return prev_state["links"] != next_state["links"]
+
+            async def on_mutation(self):
+                self.mutations += 1
+
+            def render(self):
+                return Node("nav", children=[str(self.get_state()["links"])])
+
+        component = Sidebar()
+        await self.zenaura_dom.mount(Page([component]))
+        renders = self.zenaura_dom.render_counts[component.id]
+
+        component.set_state({"links": 3, "hover": True})
+        await self.zenaura_dom.render(component)
+        self.assertEqual(self.zenaura_dom.render_counts[component.id], renders)
+        self.assertEqual(component.mutations, 0)
+
+        component.set_state({"links": 4, "hover": True})
+        await self.zenaura_dom.render(component)
+        self.assertEqual(self.zenaura_dom.render_counts[component.id], renders + 1)
+        self.assertEqual(self.zenaura_dom.zen_rendered_state[component.id], {"links": 4, "hover": True})
+        self.assertEqual(self.zenaura_dom.zen_dom_table[component.id].children[0].text, "4")
+
+    async def test_unchanged_state_skips_should_update(self):
+        @Reuseable
+        class Badge(Component):
+            def __init__(self):
+                super().__init__()
+                self.set_state({"count": 1})
+                self.checks = 0
+
+            def should_update(self, prev_state, next_state):
+                self.checks += 1
+                return True
+
+            def render(self):
+                return Node("span", children=[str(self.get_state()["count"])])
+
+        component = Badge()
+        await self.zenaura_dom.mount(Page([component]))
+        renders = self.zenaura_dom.render_counts[component.id]
+
+        component.update_state(count=1)
+        await self.zenaura_dom.render(component)
+        self.assertEqual((component.checks, self.zenaura_dom.render_counts[component.id]), (0, renders))
+
+        component.update_state(count=2)
+        await self.zenaura_dom.render(component)
+        self.assertEqual((component.checks, self.zenaura_dom.render_counts[component.id]), (1, renders + 1))
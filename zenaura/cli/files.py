@@ -108,19 +108,10 @@ main_css = """.zenaura{
 
 build_file = '''
 from zenaura.server import ZenauraServer
+from zenaura.server.broadcaster import DEV_CLIENT_SCRIPT
 from public.main import app
 
-ZenauraServer.hydrate_app(app, scripts=[
-        """
-        <script>
-            const ws = new WebSocket("ws://localhost:5000/refresh");
-            ws.onmessage = () => {
-            console.log("Reloading...");
-            location.reload();
-            };
-        </script>
-        """
-])
+ZenauraServer.hydrate_app(app, scripts=[DEV_CLIENT_SCRIPT])
 
 '''
 
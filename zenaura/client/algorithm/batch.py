@@ -0,0 +1,121 @@
+from .operations import *
+from typing import Callable, List
+from zenaura.client.config import ZENAURA_DOM_ATTRIBUTE
+
+# BATCHED PATCH PROTOCOL
+# every patch is serialized into a compact array, first item is the opcode,
+# the whole list is applied by a single call to window.zenauraApplyPatches
+
+BATCH_INSERT_AFTER = 0
+"""[BATCH_INSERT_AFTER, parent_id, prev_sibling_id, html]"""
+BATCH_INSERT_BEFORE = 1
+"""[BATCH_INSERT_BEFORE, parent_id | None, before_id | None, html], without parent the node goes before before_id"""
+BATCH_REMOVE = 2
+"""[BATCH_REMOVE, node_id]"""
+BATCH_MOVE_BEFORE = 3
+"""[BATCH_MOVE_BEFORE, parent_id, node_id, before_id | None]"""
+BATCH_TEXT = 4
+"""[BATCH_TEXT, node_id, text]"""
+BATCH_SET_ATTRIBUTE = 5
+"""[BATCH_SET_ATTRIBUTE, node_id, attr_name, attr_value]"""
+BATCH_REMOVE_ATTRIBUTE = 6
+"""[BATCH_REMOVE_ATTRIBUTE, node_id, attr_name]"""
+
+# helper shipped with the server template, applies a serialized batch in one FFI crossing
+PATCH_SCRIPT = f"""
+window.zenauraApplyPatches = function (ops) {{
+  const found = new Map();
+  const q = (id) => {{
+    if (id === undefined || id === null) return null;
+    let el = found.get(id);
+    if (!el) {{
+      el = document.querySelector('[{ZENAURA_DOM_ATTRIBUTE}="' + id + '"]');
+      if (el) found.set(id, el);
+    }}
+    return el;
+  }};
+  const html = (s) => {{
+    const t = document.createElement("template");
+    t.innerHTML = s;
+    return t.content.firstChild;
+  }};
+  for (const op of ops) {{
+    const el = q(op[1]);
+    switch (op[0]) {{
+      case {BATCH_INSERT_AFTER}: {{
+        if (!el) break;
+        const prev = q(op[2]);
+        if (prev) el.insertBefore(html(op[3]), prev.nextSibling); else el.append(html(op[3]));
+        break;
+      }}
+      case {BATCH_INSERT_BEFORE}: {{
+        const before = q(op[2]);
+        const parent = el || (before && before.parentNode);
+        if (!parent) break;
+        if (before) parent.insertBefore(html(op[3]), before); else parent.append(html(op[3]));
+        break;
+      }}
+      case {BATCH_REMOVE}:
+        if (el) {{ el.remove(); found.delete(op[1]); }}
+        break;
+      case {BATCH_MOVE_BEFORE}: {{
+        const child = q(op[2]);
+        if (!el || !child) break;
+        const before = q(op[3]);
+        if (before) el.insertBefore(child, before); else el.append(child);
+        break;
+      }}
+      case {BATCH_TEXT}:
+        if (el) el.textContent = op[2];
+        break;
+      case {BATCH_SET_ATTRIBUTE}:
+        if (el) el.setAttribute(op[2], op[3]);
+        break;
+      case {BATCH_REMOVE_ATTRIBUTE}:
+        if (el) el.removeAttribute(op[2]);
+        break;
+    }}
+  }}
+}};
+"""
+
+def serialize_patches(patches: List, id: str, compile_children: Callable) -> List[list]:
+    """
+    Serializes the patches produced by the Searcher into the batched patch protocol.
+
+    Args:
+        patches: A list of patches containing the previous node id, the diffed node, the path and the updater context.
+        id: The ID of the component being updated.
+        compile_children: Compiles a node into html, called as compile_children(node, id, True).
+
+    Returns:
+        list: One compact array per DOM operation, in patch order.
+    """
+    batch = []
+    for prev_node_id, diffed_node, path, op in patches:
+        name, context = op["name"], op["context"]
+
+        if name == ADD_NODE:
+            batch.append([
+                BATCH_INSERT_BEFORE,
+                context["parent_id"],
+                context["before_id"],
+                compile_children(diffed_node, id, True),
+            ])
+
+        elif name == REMOVE_NODE:
+            batch.append([BATCH_REMOVE, prev_node_id])
+
+        elif name == MOVE_NODE:
+            batch.append([BATCH_MOVE_BEFORE, context["parent_id"], prev_node_id, context["before_id"]])
+
+        elif name == NODE_INNER_TEXT:
+            batch.append([BATCH_TEXT, prev_node_id, context["text"]])
+
+        elif name == ADD_ATTRIBUTE:
+            batch.append([BATCH_SET_ATTRIBUTE, prev_node_id, context["attr_name"], context["attr_value"]])
+
+        elif name in (REMOVE_ATTRIBUTE, REPLACE_ATTRIBUTE):
+            batch.append([BATCH_REMOVE_ATTRIBUTE, prev_node_id, context["attr_name"]])
+
+    return batch
@@ -1,3 +1,5 @@
+from typing import Any, NamedTuple
+
 # UPDATER ALGORITHM OPERATION AND CONTEXT
 
 ADD_NODE = "ADD_NODE"
@@ -6,6 +8,9 @@ ADD_NODE = "ADD_NODE"
     name : "ADD_NODE",
     context: {
         "children" : child-node,
+        # keyed children only:
+        "parent_id" : "keyed-uid-of-parent",
+        "before_id" : "keyed-uid-of-next-sibling" | None,
     }
 }
 """
@@ -18,6 +23,16 @@ REMOVE_NODE = "REMOVE_NODE"
     }
 }
 """
+MOVE_NODE = "MOVE_NODE"
+"""
+{
+    name : "MOVE_NODE",
+    context: {
+        "parent_id" : "keyed-uid-of-parent",
+        "before_id" : "keyed-uid-of-next-sibling" | None,
+    }
+}
+"""
 NODE_INNER_TEXT = "NODE_INNER_TEXT"
 """
 {
@@ -58,3 +73,45 @@ REPLACE_ATTRIBUTE = "REPLACE_ATTRIBUTE"
     }
 }
 """
+
+# PATCH RECORDS
+
+# integer opcodes, the updater dispatches on them with a table lookup
+OPCODES = {
+    ADD_NODE: 0,
+    REMOVE_NODE: 1,
+    MOVE_NODE: 2,
+    NODE_INNER_TEXT: 3,
+    ADD_ATTRIBUTE: 4,
+    REMOVE_ATTRIBUTE: 5,
+    REPLACE_ATTRIBUTE: 6,
+}
+
+class Operation:
+    """
+    Updater operation of a patch: integer opcode, operation name and context.
+    Supports op["name"] and op["context"] like the previous dict based operations.
+    """
+    __slots__ = ("code", "name", "context")
+
+    def __init__(self, name: str, context: dict):
+        self.code = OPCODES[name]
+        self.name = name
+        self.context = context
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def __repr__(self) -> str:
+        return f"Operation({self.name}, {self.context})"
+
+
+class Patch(NamedTuple):
+    """
+    A single difference found by the Searcher, unpacks as
+    prev_node_id, node, path, op.
+    """
+    prev_node_id: str
+    node: Any
+    path: str
+    op: Operation
@@ -1,9 +1,61 @@
-from zenaura.client.tags import Node
+from zenaura.client.tags import Node, has_keyed_children
 from typing import List
 from zenaura.client.hydrator.compiler_adapter import HydratorCompilerAdapter
 from itertools import zip_longest
+from bisect import bisect_left
 from .operations import *
 
+
+def longest_increasing_subsequence(seq: List[int]) -> List[int]:
+    """
+    Finds one longest strictly increasing subsequence of seq in O(n log n).
+
+    Used by keyed reconciliation: matched children whose previous indices form
+    the subsequence keep their place in the real DOM, all others are moved.
+
+    Args:
+        seq: A list of integers, e.g. previous indices of matched children.
+
+    Returns:
+        The positions in seq of the subsequence, in increasing order.
+    """
+    tails = []  # tails[k]: position of the smallest tail of a run of length k + 1
+    tail_values = []
+    prev = [-1] * len(seq)
+
+    for i, value in enumerate(seq):
+        k = bisect_left(tail_values, value)
+        if k > 0:
+            prev[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[k] = i
+            tail_values[k] = value
+
+    result = []
+    i = tails[-1] if tails else -1
+    while i != -1:
+        result.append(i)
+        i = prev[i]
+    result.reverse()
+    return result
+
+
+def positional_children(prev_children: list, new_children: list) -> bool:
+    """
+    Whether children can be patched by position: text nodes have no id in the real DOM,
+    so a text node can only be diffed against another text node, and never removed alone.
+    """
+    for idx, prev_child in enumerate(prev_children):
+        new_child = new_children[idx] if idx < len(new_children) else None
+        if (prev_child.is_text_node or (new_child is not None and new_child.is_text_node)) and \
+                (new_child is None or prev_child.is_text_node != new_child.is_text_node):
+            return False
+    return True
+
+
 class Searcher(
     HydratorCompilerAdapter
 ):
@@ -17,24 +69,21 @@ class Searcher(
         None
     """
 
-    def updater_context_builder(self, name: str, context: dict) -> dict:
+    def updater_context_builder(self, name: str, context: dict) -> Operation:
         """
         Builds the context for the updater.
 
-        This method takes the name of the operation and its context and returns a dictionary that will be used by the updater.
+        This method takes the name of the operation and its context and returns the operation record that will be used by the updater.
 
         Args:
             name: The name of the operation.
             context: The context of the operation.
 
         Returns:
-            A dictionary containing the name and context of the operation.
+            An Operation with the integer opcode, the name and context of the operation, op["name"] and op["context"] still work.
         """
 
-        return {
-            "name": name,
-            "context": context
-        }
+        return Operation(name, context)
 
     def patches_builder(self, prev_child_node, new_child_node, id, child_id):
         """
@@ -52,7 +101,7 @@ class Searcher(
             A list of patches containing the operation name, the new child node, the child ID, and the context for the updater.
         """
 
-        return [
+        return Patch(
             self.hyd_comp_get_keyed_uuid(
                 id=id,
                 child_id=child_id
@@ -63,13 +112,13 @@ class Searcher(
                 name=REMOVE_NODE,
                 context={"children": prev_child_node}
             )
-        ]
+        )
 
-    def search(self, prevNode: Node, newNode: Node, id: str) -> List[List[any]]:
+    def search(self, prevNode: Node, newNode: Node, id: str) -> List[Patch]:
         """
         Searches for the differences between the previous and new virtual DOM trees.
 
-        This method takes the previous and new virtual DOM trees and the component ID, and returns a list of lists of differences. Each difference is represented as a list containing the operation name, the new child node, the path of the child, and the context for the updater.
+        This method takes the previous and new virtual DOM trees and the component ID, and returns a list of differences. Each difference is a Patch record containing the keyed uid of the previous node, the new child node, the path of the child, and the operation for the updater with its integer opcode.
 
         Args:
             prevNode: The previous virtual DOM tree.
@@ -77,7 +126,7 @@ class Searcher(
             id: The ID of the component.
 
         Returns:
-            A list of lists of differences.
+            A list of Patch records.
         """
 
         # Error handling:
@@ -88,7 +137,105 @@ class Searcher(
 
         differences = []
 
-        def helper(prev_child_node: Node, new_child_node: Node, id, prev_child_path: str, new_child_path) -> None:
+        def keyed_helper(prev_parent: Node, new_parent: Node, id) -> None:
+            """
+            Helper method reconciling keyed children by key instead of position.
+
+            Previous children whose key is gone are removed, matched children are diffed in place,
+            and only matched children outside the longest increasing subsequence of their previous
+            indices are moved, so inserts and reorders cost O(moves) patches.
+
+            Args:
+                prev_parent: The previous node, all its children are keyed.
+                new_parent: The new node, all its children are keyed.
+                id: The ID of the component.
+            """
+
+            nonlocal differences
+
+            parent_id = self.hyd_comp_get_keyed_uuid(id=id, key=prev_parent.path)
+            prev_children = {child.key_: child for child in prev_parent.children}
+            prev_indexes = {child.key_: idx for idx, child in enumerate(prev_parent.children)}
+            new_keys = {child.key_ for child in new_parent.children}
+
+            # Removed keyed nodes
+            for prev_child in prev_parent.children:
+                if prev_child.key_ not in new_keys:
+                    helper(prev_child, None, id, prev_child.path, "")
+
+            # Matched keyed nodes are diffed in place, their keyed uid does not depend on position
+            sources = []
+            for new_child in new_parent.children:
+                prev_child = prev_children.get(new_child.key_)
+                sources.append(prev_indexes[new_child.key_] if prev_child else -1)
+                if prev_child:
+                    helper(prev_child, new_child, id, prev_child.path, new_child.path)
+
+            matched = [idx for idx, source in enumerate(sources) if source != -1]
+            stable = {matched[i] for i in longest_increasing_subsequence([sources[idx] for idx in matched])}
+
+            # Walk backwards so every insert or move is anchored on an already placed sibling
+            before_id = None
+            for idx in range(len(new_parent.children) - 1, -1, -1):
+                new_child = new_parent.children[idx]
+                child_id = self.hyd_comp_get_keyed_uuid(id=id, key=new_child.path)
+
+                if sources[idx] == -1:
+                    differences.append(Patch(
+                        child_id,
+                        new_child,
+                        new_child.path,
+                        self.updater_context_builder(
+                            name=ADD_NODE,
+                            context={"children": new_child, "parent_id": parent_id, "before_id": before_id}
+                        )
+                    ))
+                elif idx not in stable:
+                    differences.append(Patch(
+                        child_id,
+                        new_child,
+                        new_child.path,
+                        self.updater_context_builder(
+                            name=MOVE_NODE,
+                            context={"parent_id": parent_id, "before_id": before_id}
+                        )
+                    ))
+                before_id = child_id
+
+        def replace_children(prev_parent: Node, new_parent: Node, id) -> None:
+            """
+            Helper method replacing every child of a node, used when children can't be matched
+            by key nor by position, e.g. a placeholder replaced by keyed rows and back.
+
+            Previous children are removed by id, or cleared with the parent text when one of them
+            is a text node without an id, then the new children are appended in order.
+
+            Args:
+                prev_parent: The previous node.
+                new_parent: The new node.
+                id: The ID of the component.
+            """
+
+            nonlocal differences
+
+            parent_id = self.hyd_comp_get_keyed_uuid(id=id, key=prev_parent.path)
+            if any(child.is_text_node for child in prev_parent.children):
+                differences.append(Patch(
+                    parent_id,
+                    new_parent,
+                    prev_parent.path,
+                    self.updater_context_builder(
+                        name=NODE_INNER_TEXT,
+                        context={"text": ""}
+                    )
+                ))
+            else:
+                for prev_child in prev_parent.children:
+                    helper(prev_child, None, id, prev_child.path, "")
+            for new_child in new_parent.children:
+                helper(None, new_child, id, "", new_child.path, parent_id=parent_id)
+
+        def helper(prev_child_node: Node, new_child_node: Node, id, prev_child_path: str, new_child_path, parent_id=None, before_id=None) -> None:
             """
             Helper method for the search method.
 
@@ -100,13 +247,15 @@ class Searcher(
                 id: The ID of the component.
                 prev_child_path: The path of the previous child node.
                 new_child_path: The path of the new child node.
+                parent_id: The keyed uid of the parent, added nodes are inserted into it. Defaults to None.
+                before_id: The keyed uid of the sibling added nodes are inserted before, None appends. Defaults to None.
             """
 
             nonlocal differences
 
             # Added node
             if not prev_child_node and new_child_node:
-                differences.append([
+                differences.append(Patch(
                     self.hyd_comp_get_keyed_uuid(
                         id=id,
                         key=prev_child_path
@@ -115,14 +264,14 @@ class Searcher(
                     prev_child_path,
                     self.updater_context_builder(
                         name=ADD_NODE,
-                        context={"children": new_child_node}
+                        context={"children": new_child_node, "parent_id": parent_id, "before_id": before_id}
                     )
-                ])
+                ))
                 return
 
             # Removed node
             if prev_child_node and not new_child_node:
-                differences.append([
+                differences.append(Patch(
                     self.hyd_comp_get_keyed_uuid(
                         id=id,
                         key=prev_child_path
@@ -133,35 +282,21 @@ class Searcher(
                         name=REMOVE_NODE,
                         context={"children": prev_child_node}
                     )
-                ])
+                ))
+                return
+
+            # Unchanged subtree
+            if prev_child_node is new_child_node or prev_child_node.subtree_hash == new_child_node.subtree_hash:
                 return
 
-            # Changed child by name
+            # Changed child by name, the new node is inserted before the previous one, then the previous one is removed
             if prev_child_node.name != new_child_node.name:
-                differences.append([
-                    self.hyd_comp_get_keyed_uuid(
-                        id=id,
-                        key=prev_child_path
-                    ),
-                    prev_child_node,
-                    prev_child_path,
-                    self.updater_context_builder(
-                        name=REMOVE_NODE,
-                        context={"children": prev_child_node}
-                    )
-                ])
-                differences.append([
-                    self.hyd_comp_get_keyed_uuid(
-                        id=id,
-                        key=new_child_path
-                    ),
-                    new_child_node,
-                    new_child_path,
-                    self.updater_context_builder(
-                        name=ADD_NODE,
-                        context={"children": new_child_node}
-                    )
-                ])
+                prev_id = self.hyd_comp_get_keyed_uuid(
+                    id=id,
+                    key=prev_child_path
+                )
+                helper(None, new_child_node, id, new_child_path, new_child_path, parent_id=parent_id, before_id=prev_id)
+                helper(prev_child_node, None, id, prev_child_path, "")
                 return
 
             # Compare attributes
@@ -169,7 +304,7 @@ class Searcher(
 
                 # Removed attribute
                 if prev_attr and not new_attr:
-                    differences.append([
+                    differences.append(Patch(
                         self.hyd_comp_get_keyed_uuid(
                             id=id,
                             key=prev_child_path
@@ -180,12 +315,12 @@ class Searcher(
                             name=REMOVE_ATTRIBUTE,
                             context={"attr_name": prev_attr.key}
                         )
-                    ])
+                    ))
                     continue
 
                 # Added attribute
                 if not prev_attr and new_attr:
-                    differences.append([
+                    differences.append(Patch(
                         self.hyd_comp_get_keyed_uuid(
                             id=id,
                             key=new_child_path
@@ -196,13 +331,13 @@ class Searcher(
                             name=ADD_ATTRIBUTE,
                             context={"attr_name": new_attr.key, "attr_value": new_attr.value}
                         )
-                    ])
+                    ))
                     continue
 
                 # Replaced value attribute
                 if prev_attr and new_attr:
                     if prev_attr.value != new_attr.value:
-                        differences.append([
+                        differences.append(Patch(
                             self.hyd_comp_get_keyed_uuid(
                                 id=id,
                                 key=prev_child_path
@@ -213,14 +348,29 @@ class Searcher(
                                 name=ADD_ATTRIBUTE,
                                 context={"attr_name": new_attr.key, "attr_value": new_attr.value}
                             )
-                        ])
+                        ))
+
+            # Compare keyed children
+            prev_keyed = has_keyed_children(prev_child_node.children)
+            new_keyed = has_keyed_children(new_child_node.children)
+            if (prev_keyed or not prev_child_node.children) and (new_keyed or not new_child_node.children):
+                if prev_keyed or new_keyed:
+                    keyed_helper(prev_child_node, new_child_node, id)
+                return
+
+            # Keyed children replaced by unkeyed ones or back, or text swapped with elements, have no position to patch
+            if prev_keyed or new_keyed or not positional_children(prev_child_node.children, new_child_node.children):
+                replace_children(prev_child_node, new_child_node, id)
+                return
+
+            child_parent_id = self.hyd_comp_get_keyed_uuid(id=id, key=prev_child_node.path)
 
             # Compare children
             for idx, (prev_child, new_child) in enumerate(zip_longest(prev_child_node.children, new_child_node.children)):
                 # Leaf text nodes
                 if prev_child and new_child:
                     if prev_child.is_text_node and new_child.is_text_node and (prev_child.text != new_child.text):
-                        differences.append([
+                        differences.append(Patch(
                             self.hyd_comp_get_keyed_uuid(
                                 id=id,
                                 key=prev_child_path
@@ -231,12 +381,12 @@ class Searcher(
                                 name=NODE_INNER_TEXT,
                                 context={"text": new_child.text}
                             )
-                        ])
+                        ))
                         continue
 
                 new_child_path = new_child.path if isinstance(new_child, Node) else ""
                 prev_child_path = prev_child.path if isinstance(prev_child, Node) else ""
-                helper(prev_child, new_child, id, prev_child_path=prev_child_path, new_child_path=new_child_path)
+                helper(prev_child, new_child, id, prev_child_path=prev_child_path, new_child_path=new_child_path, parent_id=child_parent_id)
 
-        helper(prevNode, newNode, id, 0, 0)
+        helper(prevNode, newNode, id, prevNode.path, newNode.path)
         return differences
\ No newline at end of file
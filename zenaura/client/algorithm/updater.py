@@ -1,5 +1,6 @@
 from zenaura.client.hydrator import Hydrator
 from .operations import *
+from .batch import serialize_patches, BATCH_REMOVE, BATCH_TEXT
 from typing import List
 from zenaura.client.tags.attribute import Attribute
 
@@ -9,99 +10,155 @@ class Updater(
     """
     This class is responsible for updating the real DOM based on the differences identified by the Searcher.
 
-    It receives a list of patches from the Searcher and creates corresponding tasks for each patch. These tasks are then enqueued for execution by the Hydrator's tasker.
+    Patches are applied directly by `apply`, one synchronous DOM operation per patch, without
+    allocating a task or a coroutine per operation. When the batched patch helper is loaded in
+    the browser, the whole patch list is serialized and applied by a single browser call instead.
+
+    Components that opt into async patch hooks by defining `on_patch` go through `update`, which
+    creates corresponding tasks for each patch. These tasks are then enqueued for execution by
+    the Hydrator's tasker, and the hook is awaited after every applied patch.
 
     Attributes:
         None
     """
 
-    async def update(self, patches: List, id: str) -> None:
+    def apply(self, patches: List[Patch], id: str) -> int:
+        """
+        Applies the provided patches to the real DOM directly.
+
+        Args:
+            patches: A list of patches containing the operation name, the new child node, the path of the child, and the context for the updater.
+            id: The ID of the component to be updated.
+
+        Returns:
+            int: The number of applied patches, the patch list is emptied.
+        """
+        count = len(patches)
+        if patches and self.hyd_rdom_can_apply_batch():
+            self.apply_batch(patches, id)
+        else:
+            for patch in patches:
+                self.apply_patch(patch, id)
+        patches.clear()
+        return count
+
+    def apply_batch(self, patches: List[Patch], id: str) -> None:
+        """
+        Applies every patch to the real DOM with a single browser call.
+
+        Args:
+            patches: The patches to be applied.
+            id: The ID of the component to be updated.
+        """
+        batch = serialize_patches(patches, id, self.hyd_comp_compile_children)
+        self.hyd_rdom_apply_patches(batch)
+        removed = [op[1] for op in batch if op[0] == BATCH_REMOVE]
+        if removed:
+            self.hyd_rdom_invalidate(removed)
+        replaced = [op[1] for op in batch if op[0] == BATCH_TEXT]
+        if replaced:
+            self.hyd_rdom_invalidate(replaced, keep_root=True)
+
+    def apply_patch(self, patch: Patch, id: str) -> None:
+        """
+        Applies a single patch to the real DOM, dispatched on its integer opcode.
+
+        Args:
+            patch: The previous node id, the diffed node, the path and the updater operation.
+            id: The ID of the component to be updated.
+        """
+        self.patch_dispatch[patch.op.code](self, patch, id)
+
+    def patch_add_node(self, patch: Patch, id: str) -> None:
+        """
+        Adds a new node to the real DOM, inserted into its parent before its next sibling, or appended.
+        """
+        context = patch.op.context
+        compiled_html = self.hyd_comp_compile_children(patch.node, id, True)
+        self.hyd_rdom_insert_child_before(context["parent_id"], context["before_id"], compiled_html)
+
+    def patch_remove_node(self, patch: Patch, id: str) -> None:
+        """
+        Removes a node from the real DOM.
+        """
+        self.hyd_rdom_remove_child(patch.prev_node_id)
+
+    def patch_move_node(self, patch: Patch, id: str) -> None:
+        """
+        Moves a keyed node before its next sibling in the real DOM.
+        """
+        context = patch.op.context
+        self.hyd_rdom_move_child_before(context["parent_id"], patch.prev_node_id, context["before_id"])
+
+    def patch_inner_text(self, patch: Patch, id: str) -> None:
+        """
+        Updates the inner text of a node in the real DOM.
+        """
+        self.hyd_rdom_replace_inner_text(patch.prev_node_id, patch.op.context["text"])
+
+    def patch_add_attribute(self, patch: Patch, id: str) -> None:
+        """
+        Adds an attribute to a node in the real DOM.
+        """
+        context = patch.op.context
+        self.hyd_rdom_set_attribute(patch.prev_node_id, Attribute(context["attr_name"], context["attr_value"]))
+
+    def patch_remove_attribute(self, patch: Patch, id: str) -> None:
+        """
+        Removes an attribute from a node in the real DOM, replaced attributes are removed as well.
+        """
+        self.hyd_rdom_remove_attribute(patch.prev_node_id, patch.op.context["attr_name"])
+
+    # opcode -> handler, indexed by OPCODES
+    patch_dispatch = (
+        patch_add_node,
+        patch_remove_node,
+        patch_move_node,
+        patch_inner_text,
+        patch_add_attribute,
+        patch_remove_attribute,
+        patch_remove_attribute,
+    )
+
+    async def update(self, patches: List[Patch], id: str, comp=None) -> None:
         """
-        Updates the real DOM based on the provided patches.
+        Updates the real DOM based on the provided patches through the tasker, one task per patch.
+        Used by components with async patch hooks.
 
         Args:
             patches: A list of patches containing the operation name, the new child node, the path of the child, and the context for the updater.
             id: The ID of the component to be updated.
+            comp: The component whose `on_patch` hook is awaited after each applied patch. Defaults to None.
         """
 
-        while patches:
-            prev_node_id, diffed_node, path, op = patches.pop(0)
-            # print("operation", op, prev_node_id)
-
-            if op["name"] == ADD_NODE:
-                async def task(dn=diffed_node, ci=id):
-                    """
-                    Adds a new node to the real DOM.
-
-                    Args:
-                        dn: The new child node to be added.
-                        ci: The ID of the component to which the node should be added.
-                    """
-                    compiled_html = self.hyd_comp_compile_children(dn, ci, True)
-                    parent_id = id + dn.path[0:-2]  # last two digit in keyed uid is always level, index, so parent lives at the before
-                    child_id = id + dn.path
-                    self.hyd_rdom_append_child_after(parent_id, child_id, compiled_html)
-                self.hyd_tsk_enqueue_task(id, task)
-
-            if op["name"] == REMOVE_NODE:
-                async def task(d=diffed_node, c=prev_node_id):
-                    """
-                    Removes a node from the real DOM.
-
-                    Args:
-                        d: The node to be removed.
-                        c: The ID of the component containing the node.
-                    """
-                    compiled_html = self.hyd_comp_compile_children(d, c, True)
-                    # print("ADD_NODE compiled html", compiled_html)
-                    self.hyd_rdom_remove_child(prev_node_id)
-                self.hyd_tsk_enqueue_task(id, task)
-
-            if op["name"] == NODE_INNER_TEXT:
-                # avoid late binding
-                async def task(id=prev_node_id, c=op["context"]["text"]):
-                    """
-                    Updates the inner text of a node in the real DOM.
-
-                    Args:
-                        id: The ID of the node to be updated.
-                        c: The new inner text.
-                    """
-                    self.hyd_rdom_replace_inner_text(id, c)
-                self.hyd_tsk_enqueue_task(id, task)
-
-            if op["name"] == ADD_ATTRIBUTE:
-                async def task(id=prev_node_id, op1=Attribute(op["context"]["attr_name"], op["context"]["attr_value"])):
-                    """
-                    Adds an attribute to a node in the real DOM.
-
-                    Args:
-                        id: The ID of the node to be updated.
-                        op1: The attribute to be added.
-                    """
-                    self.hyd_rdom_set_attribute(id, op1)
-                self.hyd_tsk_enqueue_task(id, task)
-
-            if op["name"] == REMOVE_ATTRIBUTE:
-                async def task(id=prev_node_id, op1=op["context"]["attr_name"]):
-                    """
-                    Removes an attribute from a node in the real DOM.
-
-                    Args:
-                        id: The ID of the node to be updated.
-                        op1: The name of the attribute to be removed.
-                    """
-                    self.hyd_rdom_remove_attribute(id, op1)
-                self.hyd_tsk_enqueue_task(id, task)
-
-            if op["name"] == REPLACE_ATTRIBUTE:
-                async def task(id=prev_node_id, op1=op["context"]["attr_name"]):
-                    """
-                    Replaces an attribute on a node in the real DOM.
-
-                    Args:
-                        id: The ID of the node to be updated.
-                        op1: The name of the attribute to be replaced.
-                    """
-                    self.hyd_rdom_remove_attribute(id, op1)
-                self.hyd_tsk_enqueue_task(id, task)
+        if patches and self.hyd_rdom_can_apply_batch():
+            async def task(p=list(patches), ci=id):
+                """
+                Applies every patch to the real DOM with a single browser call.
+
+                Args:
+                    p: The patches to be applied.
+                    ci: The ID of the component to be updated.
+                """
+                self.apply_batch(p, ci)
+                if comp is not None:
+                    for patch in p:
+                        await comp.on_patch(patch)
+            patches.clear()
+            self.hyd_tsk_enqueue_task(id, task)
+            return
+
+        for patch in patches:
+            async def task(p=patch, ci=id):
+                """
+                Applies a patch to the real DOM.
+
+                Args:
+                    p: The patch to be applied.
+                    ci: The ID of the component to be updated.
+                """
+                self.apply_patch(p, ci)
+                if comp is not None:
+                    await comp.on_patch(p)
+            self.hyd_tsk_enqueue_task(id, task)
+        patches.clear()
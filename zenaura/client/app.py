@@ -1,3 +1,4 @@
+import json
 from dataclasses import dataclass
 from typing import List
 from zenaura.client.dom import zenaura_dom
@@ -6,7 +7,7 @@ from zenaura.client.component import Component, Reuseable
 from zenaura.client.page import Page
 from zenaura.client.hydrator import HydratorRealDomAdapter
 from zenaura.client.layout import Layout
-from zenaura.web.utils import document, window
+from zenaura.web.utils import document, window, pyfetch
 from zenaura.client.dispatcher import dispatcher
 rdom_hyd = HydratorRealDomAdapter() 
 
@@ -127,6 +128,7 @@ class App:
         self.paths = []
         self.history = PageHistory()
         self._layout = layout
+        self._fragments = None
 
     @property
     def layout(self):
@@ -136,6 +138,49 @@ class App:
     def layout(self, new_layout):
         self._layout = new_layout 
 
+    @property
+    def fragments(self):
+        """
+            page id -> fragment url of the lazy routes, read once from the
+            manifest ZenauraServer.hydrate_app(app, lazy_routes=True) inlines
+        """
+        if self._fragments is None:
+            element = document.getElementById("zenaura-routes")
+            manifest = json.loads(element.textContent) if element else {}
+            self._fragments = {entry["page"]: entry["file"] for entry in manifest.values()}
+        return self._fragments
+
+    async def load_fragment(self, page: Page) -> bool:
+        """
+        Fetches and injects the pre-compiled page of a lazy route the first time it is visited,
+        the hidden page is inserted after the current page.
+
+        Parameters
+        ----------
+        page : Page
+            The page about to be shown.
+
+        Returns
+        -------
+        bool or None
+            Whether a fragment was injected, None when the fragment could not be fetched,
+            e.g. a 404 or a server error page, nothing is injected and the next visit fetches it again.
+        """
+        file = self.fragments.get(page.id)
+        if not file or document.querySelector(f'[data-zenaura="{page.id}"]'):
+            return False
+        response = await pyfetch(file)
+        if not response.ok:
+            return None
+        html = await response.string()
+        current = self.history.current.page
+        anchor = document.querySelector(f'[data-zenaura="{current.id}"]') if current else None
+        if anchor:
+            anchor.insertAdjacentHTML("afterend", html)
+        else:
+            document.getElementById("root").insertAdjacentHTML("beforeend", html)
+        return True
+
     async def not_found(self):
         document.title = "Page Not Found"
         page = Page([notFound])
@@ -180,6 +225,10 @@ class App:
             document.title = title
             return
 
+        if await self.load_fragment(page) is None:
+            await self.not_found()
+            return
+
         if not self.history.current.page:  # self.history.current is initially None
             pass
         else:
@@ -249,6 +298,9 @@ class App:
             self.history.visit(page)
             document.title = title
             return
+        if await self.load_fragment(page) is None:
+            await self.not_found()
+            return
         if not self.history.current.page:  # self.history.current is initially None
            pass
         else:
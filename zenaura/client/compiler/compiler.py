@@ -2,6 +2,7 @@ from zenaura.client.tags import Node
 from .attribute import AttributeProccessor
 from .sanitize import CompilerSanitizer
 import io
+from collections import OrderedDict
 from zenaura.client.config import (
     ZENAURA_DOM_ATTRIBUTE,
     self_closing_tags
@@ -24,17 +25,48 @@ class Compiler(
 
     Attributes:
         attrKeyWords (dict): A dictionary mapping attribute keywords to their corresponding HTML attribute names.
+        fragment_cache_size (int): Maximum number of compiled fragments kept in the LRU cache, 0 disables it.
+        fragment_cache_hits (int): Number of compile calls served from the fragment cache.
+        fragment_cache_misses (int): Number of compile calls that serialized the node.
     """
 
-    def __init__(self):
+    def __init__(self, fragment_cache_size=256):
         """
         Initializes the Compiler instance with sanitizer and attribute processor
 
+        Args:
+            fragment_cache_size (int, optional): Maximum number of compiled fragments to keep. Defaults to 256.
         """
         AttributeProccessor.__init__(self)
         self.special_tags = {
             "input_": "input"
         }
+        self.fragment_cache_size = fragment_cache_size
+        self.fragment_cache = OrderedDict()
+        self.fragment_cache_hits = 0
+        self.fragment_cache_misses = 0
+
+    def fragment_cache_info(self) -> dict:
+        """
+        Returns the fragment cache counters.
+
+        Returns:
+            dict: hits, misses, current size and maximum size of the fragment cache.
+        """
+        return {
+            "hits": self.fragment_cache_hits,
+            "misses": self.fragment_cache_misses,
+            "size": len(self.fragment_cache),
+            "maxsize": self.fragment_cache_size,
+        }
+
+    def clear_fragment_cache(self) -> None:
+        """
+        Drops every cached fragment and resets the counters.
+        """
+        self.fragment_cache.clear()
+        self.fragment_cache_hits = 0
+        self.fragment_cache_misses = 0
 
     def getKeyedUID(self, id, withAttribut=False, key=None):
         """
@@ -70,6 +102,11 @@ class Compiler(
         """
         Compiles a Zenui Node into its corresponding HTML representation.
 
+        Fragments are cached in an LRU keyed by the node subtree hash, the component id and
+        zenaura_dom_mode, plus the node path and level since keyed UUIDs depend on them, so
+        static chunks such as navbars and footers are serialized once. The subtree hash is a
+        128 bit digest dropped on every change below the node, an edited tree is compiled again.
+
         Args:
             elm (Node): The Zenui Node object to compile.
             id (str, optional): The unique ID of the parent component. Used to generate keyed UUIDs.
@@ -88,35 +125,116 @@ class Compiler(
             '<div class="my-class" ZENAURA_DOM_ATTRIBUTE="div0"> <p ZENAURA_DOM_ATTRIBUTE="div00">Hello, world!</p></div>'
             ```
         """
-        if elm.is_text_node or isinstance(elm, str):
-            return self.sanitize(elm.text)
+        if self.fragment_cache_size <= 0 or not isinstance(elm, Node) or elm.is_text_node:
+            return self.compile_node(elm, id, zenaura_dom_mode)
+
+        key = (elm.subtree_hash, id, zenaura_dom_mode, elm.path, elm.level)
+        html = self.fragment_cache.get(key)
+        if html is not None:
+            self.fragment_cache.move_to_end(key)
+            self.fragment_cache_hits += 1
+            return html
+
+        self.fragment_cache_misses += 1
+        html = self.compile_node(elm, id, zenaura_dom_mode)
+        self.fragment_cache[key] = html
+        if len(self.fragment_cache) > self.fragment_cache_size:
+            self.fragment_cache.popitem(last=False)
+        return html
+
+    def compile_node(self, elm: Node, id=None, zenaura_dom_mode=False):
+        """
+        Serializes a Zenui Node into its corresponding HTML representation, bypassing the fragment cache.
 
-        tag = elm.name
+        Args:
+            elm (Node): The Zenui Node object to compile.
+            id (str, optional): The unique ID of the parent component. Used to generate keyed UUIDs.
+            zenaura_dom_mode (bool, optional): Whether to add the `ZENAURA_DOM_ATTRIBUTE` attribute to the compiled HTML. Defaults to False.
 
-        zenui_id = ""
+        Returns:
+            str: The compiled HTML string.
+        """
+        html = io.StringIO()
+        self.compile_into(elm, html, id, zenaura_dom_mode)
+        return html.getvalue()
 
-        # Assign unique ID for Zenui DOM
-        if isinstance(elm, Node) and zenaura_dom_mode:
-            zenui_id = self.getKeyedUID(id, withAttribut=True, key=elm.path)
+    def compile_into(self, elm: Node, writer, id=None, zenaura_dom_mode=False) -> None:
+        """
+        Serializes a Zenui Node into a single shared writer, without building intermediate strings.
 
-        # Get node attributes
-        attributes = self.process_attributes(elm.attributes)
+        Args:
+            elm (Node): The Zenui Node object to compile.
+            writer: Any object with a `write(str)` method, e.g. `io.StringIO` or an open file.
+            id (str, optional): The unique ID of the parent component. Used to generate keyed UUIDs.
+            zenaura_dom_mode (bool, optional): Whether to add the `ZENAURA_DOM_ATTRIBUTE` attribute to the compiled HTML. Defaults to False.
 
-        if tag in self.special_tags.keys():
-            tag = self.special_tags[tag]
-            
-        if tag in self_closing_tags:
-            return f"<{tag}{zenui_id}{attributes} />"
+        Examples:
+            ```python
+            >>> with open("./public/page.html", "w") as file:
+            ...     compiler.compile_into(node, file, id="my-component", zenaura_dom_mode=True)
+            ```
+        """
+        write = writer.write
+        for chunk in self.iter_compile(elm, id, zenaura_dom_mode):
+            write(chunk)
 
-        # Start tag
-        html = io.StringIO()
-        html.write(f"<{tag}{zenui_id}{attributes}>")
+    def iter_compile(self, elm: Node, id=None, zenaura_dom_mode=False):
+        """
+        Compiles a Zenui Node into HTML chunks, yielded in document order.
+
+        The tree is walked with an explicit stack, so every chunk is produced once and
+        nothing is copied into parent buffers, this lets callers stream large pages to a
+        file or a streaming HTTP response.
+
+        Args:
+            elm (Node): The Zenui Node object to compile.
+            id (str, optional): The unique ID of the parent component. Used to generate keyed UUIDs.
+            zenaura_dom_mode (bool, optional): Whether to add the `ZENAURA_DOM_ATTRIBUTE` attribute to the compiled HTML. Defaults to False.
+
+        Yields:
+            str: Consecutive pieces of the compiled HTML string.
+
+        Examples:
+            ```python
+            >>> "".join(compiler.iter_compile(node)) == compiler.compile(node)
+            True
+            ```
+        """
+        stack = [(elm, None)] # (node, closing tag)
+
+        while stack:
+            elm, closing_tag = stack.pop()
+
+            if closing_tag:
+                yield closing_tag
+                continue
+
+            if elm.is_text_node or isinstance(elm, str):
+                yield self.sanitize(elm.text)
+                continue
+
+            tag = elm.name
+
+            zenui_id = ""
+
+            # Assign unique ID for Zenui DOM
+            if isinstance(elm, Node) and zenaura_dom_mode:
+                zenui_id = self.getKeyedUID(id, withAttribut=True, key=elm.path)
+
+            # Get node attributes
+            attributes = self.process_attributes(elm.attributes)
+
+            if tag in self.special_tags.keys():
+                tag = self.special_tags[tag]
 
-        # Get children
-        for child in elm.children:
-            html.write(self.compile(child, id, zenaura_dom_mode))
+            if tag in self_closing_tags:
+                yield f"<{tag}{zenui_id}{attributes} />"
+                continue
 
-        # Finish tag
-        html.write(f"</{tag}>")
+            # Start tag, finish tag is emitted after every child
+            yield f"<{tag}{zenui_id}{attributes}>"
+            stack.append((None, f"</{tag}>"))
 
-        return html.getvalue()
\ No newline at end of file
+            # Get children
+            for child in reversed(elm.children):
+                stack.append((child, None))
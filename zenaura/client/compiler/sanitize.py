@@ -1,11 +1,41 @@
 import html
+import re
 import bleach
+from functools import lru_cache
 
 from zenaura.client.config import (
     allowed_tags,
     allowed_attributes,
 )
 
+# markup, entities, quotes and the control characters bleach rewrites
+_needs_full_sanitize = re.compile('[<&"\'\x00-\x08\x0b-\x1f\ud800-\udfff]')
+
+
+@lru_cache(maxsize=4096)
+def sanitize_text(user_input: str) -> str:
+    """
+    Tiered, memoized sanitizer for a string.
+
+    Plain text (class names, labels, numbers) is returned unchanged, a lone `>` is
+    escaped with `html.escape`, anything else goes through the full `bleach` pipeline.
+    Both tiers produce the same output as `bleach.clean` for the same input.
+
+    Args:
+        user_input (str): The raw user input to sanitize.
+
+    Returns:
+        str: The sanitized input.
+    """
+    if not _needs_full_sanitize.search(user_input):
+        return html.escape(user_input, quote=False) if ">" in user_input else user_input
+
+    # Use bleach to remove potentially harmful HTML tags and attributes
+    return bleach.clean(
+        user_input, tags=allowed_tags, attributes=allowed_attributes
+    )
+
+
 class CompilerSanitizer:
     """
     This class provides methods for sanitizing user input to prevent various injection attacks.
@@ -37,10 +67,4 @@ class CompilerSanitizer:
         Returns:
             str: The sanitized input.
         """
-        user_input = str(user_input)
-        # Use bleach to remove potentially harmful HTML tags and attributes
-        safe_html = bleach.clean(
-            user_input, tags=allowed_tags, attributes=allowed_attributes
-        )
-
-        return safe_html
\ No newline at end of file
+        return sanitize_text(str(user_input))
\ No newline at end of file
@@ -2,6 +2,7 @@
 #!/usr/bin/env python3
 import itertools
 import hashlib
+import dataclasses
 from abc import abstractmethod
 from collections import defaultdict
 
@@ -50,8 +51,8 @@ class Component:
     Attributes:
         id (str): A unique identifier for the component.
         state (dict): The state of the component.
-        _state (dict): The internal state of the component.
-        _track_instances (dict): A dictionary tracking the number of instances created for each component class.
+        _state (dict): The internal state of the component, owned by the instance and replaced on every update (copy-on-write).
+        _track_instances (dict): A dictionary tracking the number of instances created for each non reusable component class.
         _component_count (itertools.count): An iterator that generates unique counts for each component instance.
 
     Methods:
@@ -63,11 +64,12 @@ class Component:
             Returns the state of the component.
         set_state(self, state):
             Sets the state of the component.
+        update_state(self, **changes):
+            Replaces the state with an updated copy, the state object is kept when nothing changes.
         render(self):
             Abstract method that must be implemented by subclasses to define the behavior of the component.
     """
 
-    _state = defaultdict(str)
     _track_instances = defaultdict(int)
     _component_count = itertools.count(0)
 
@@ -84,8 +86,11 @@ class Component:
         Initializes the component instance and sets the unique identifier.
         """
         cls = self.__class__
+        self._state = defaultdict(str)
+        if _is_reuseable[cls.__name__]:
+            return
         Component._track_instances[cls.__name__] += 1
-        if Component._track_instances[cls.__name__] > 1 and not _is_reuseable[cls.__name__]:
+        if Component._track_instances[cls.__name__] > 1:
             raise TypeError(
 """
     Zenaura class component are limted by design. \n
@@ -140,7 +145,12 @@ class Component:
         dict: The state of the component.
         """
 
-        return self._state
+        try:
+            return self._state
+        except AttributeError:
+            # subclasses that skip Component.__init__ still get their own state
+            self._state = defaultdict(str)
+            return self._state
 
     def set_state(self, state):
         """
@@ -155,6 +165,41 @@ class Component:
 
         self._state = state  # Update the internal state
 
+    def update_state(self, **changes):
+        """
+        Replace the state with an updated copy instead of mutating it in place.
+
+        The previous state object is never modified, so the virtual dom can compare
+        `prev_state is next_state` to know nothing changed. When every value is
+        already equal the current state object is kept.
+
+        Args:
+        **changes: The state keys (dict state) or fields (dataclass, namedtuple state) to change.
+
+        Returns:
+        The new state of the component.
+        """
+
+        state = self.get_state()
+        if isinstance(state, dict):
+            get = state.get
+        else:
+            get = lambda key: getattr(state, key)
+        if all(get(key) == value for key, value in changes.items()):
+            return state
+
+        if isinstance(state, dict):
+            new_state = state.copy()
+            new_state.update(changes)
+        elif dataclasses.is_dataclass(state):
+            new_state = dataclasses.replace(state, **changes)
+        elif hasattr(state, "_replace"):
+            new_state = state._replace(**changes)
+        else:
+            raise TypeError(f"cannot copy state of type {type(state).__name__}, use set_state instead")
+        self.set_state(new_state)
+        return new_state
+
     @abstractmethod
     def render():
         """
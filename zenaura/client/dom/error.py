@@ -54,29 +54,36 @@ class GracefulDegenerationLifeCycleWrapper(
 
         # Cleanup the Zen DOM table.
         self.zen_dom_table.clear()
+        self.zen_rendered_state.clear()
 
         if hasattr(comp, "on_error"):
             # Call the component's `on_error` method.
             error_comp = comp.on_error(str(error))
 
+            # Render once, the same tree is compiled and stored in the virtual DOM.
+            error_tree = self.hyd_vdom_render(error_comp)
+
             # Compile and render the error component.
-            compiled_comp = self.hyd_comp_compile_render(error_comp)
+            compiled_comp = self.hyd_comp_compile_render(error_comp, error_tree)
 
             # Attach the compiled component to the real DOM.
             self.hyd_rdom_attach_to_root(compiled_comp)
 
             # Update the virtual DOM with the new render.
-            self.hyd_vdom_update_with_new_render(comp, error_comp.render())
+            self.hyd_vdom_update_with_new_render(comp, error_tree)
 
         else:
             # Create a default error message component.
             error_comp = DefaultDomErrorComponent(error_message=str(error))
 
+            # Render once, the same tree is compiled and stored in the virtual DOM.
+            error_tree = self.hyd_vdom_render(error_comp)
+
             # Compile and render the default error component.
-            compiled_comp = self.hyd_comp_compile_render(error_comp)
+            compiled_comp = self.hyd_comp_compile_render(error_comp, error_tree)
 
             # Attach the compiled component to the real DOM.
             self.hyd_rdom_attach_to_root(compiled_comp)
 
             # Update the virtual DOM with the new render.
-            self.hyd_vdom_update_with_new_render(comp, error_comp.render())
+            self.hyd_vdom_update_with_new_render(comp, error_tree)
@@ -60,6 +60,9 @@ class Mount(
         """
 
         try:
+            # handles of the previous page are dropped, the server rendered elements of this one are cached in one scan
+            self.hyd_rdom_invalidate()
+            self.hyd_rdom_index_elements(page.id)
             for comp in page.children:
                 # Update state in vdom
                 self.hyd_vdom_update(comp)
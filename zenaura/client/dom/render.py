@@ -33,7 +33,8 @@ class Render(
     - `on_mutation(comp)`: Calls the `on_mutation` lifecycle method for the component.
     - `on_settled(comp)`: Calls the `on_settled` lifecycle method for the component.
     - `search(prev_tree, new_tree, comp_id)`: Calculates the differences between the previous and new component trees.
-    - `update(patches, comp_id)`: Applies the calculated differences to the DOM.
+    - `apply(patches, comp_id)`: Applies the calculated differences to the DOM directly.
+    - `update(patches, comp_id, comp)`: Applies the calculated differences through the task queue, for components with an `on_patch` hook.
     - `hyd_vdom_update(comp)`: Updates the virtual DOM with the new component tree.
     - `on_error(comp, error)`: Handles errors gracefully and displays an error message component.
     """
@@ -41,12 +42,13 @@ class Render(
         """
         Renders the component by updating the DOM based on the differences between the previous and new component trees.
 
-        This method performs the following steps:
+        This method performs the following steps, unless the component `should_update(prev_state, next_state)`
+        hook returns False, in which case the component is left untouched:
 
         1. **Lifecycle:** Calls the `on_mutation` lifecycle method for the component.
         2. **Diffing:** Calculates the differences between the previous and new component trees using the `search` method.
-        3. **Update:** Applies the calculated differences to the DOM using the `update` method.
-        4. **Scheduling:** Schedules the updates with the browser using the `hyd_rdom_is_complete` and `hyd_tsk_dequeue_task` methods.
+        3. **Update:** Applies the calculated differences to the DOM directly using the `apply` method.
+        4. **Scheduling:** Components defining an async `on_patch(patch)` hook get their patches through the `update` task queue instead, drained with `hyd_tsk_dequeue_task` and awaiting the hook after each patch.
         5. **Virtual DOM Update:** Updates the virtual DOM with the new component tree using the `hyd_vdom_update` method.
         6. **Lifecycle:** Calls the `on_settled` lifecycle method for the component.
 
@@ -66,27 +68,36 @@ class Render(
         """
         try:
 
+            # component output did not change, skip render, diff and patch
+            if not self.hyd_vdom_should_update(comp):
+                return
+
             # update steps 1-3: on_mutation -> update -> on_settled
             # update 1: lifecycle method to be called before updating
             await self.on_mutation(comp)
             comp_id = comp.id            
             prev_tree = self.zen_dom_table[comp_id]
-            new_tree = comp.render()
-
-            # create task queue for component
-            task_que = self.hyd_tsk_get_or_create_task_queue(comp_id)
+            new_tree = self.hyd_vdom_render(comp)
 
             # run diffing algorithm
             patches = self.search(prev_tree, new_tree, comp_id)
-            await self.update(patches, comp_id)
-            
-            # schedule update with the browser
-            while not task_que.empty():
-                task = self.hyd_tsk_dequeue_task(comp_id)
-                await task()
+
+            if hasattr(comp, 'on_patch'):
+                # async patch hooks: one task per patch, awaited in order
+                task_que = self.hyd_tsk_get_or_create_task_queue(comp_id)
+                await self.update(patches, comp_id, comp)
+
+                # schedule update with the browser
+                while not task_que.empty():
+                    task = self.hyd_tsk_dequeue_task(comp_id)
+                    await task()
+            else:
+                # synchronous DOM writes, applied directly
+                self.apply(patches, comp_id)
 
                 
-            self.hyd_vdom_update(comp)
+            # store the tree that was diffed, no second render
+            self.hyd_vdom_update(comp, new_tree)
 
             # update 3  : on_settled method to be called after updating
             await self.on_settled(comp)
@@ -28,13 +28,15 @@ class HydratorCompilerAdapter:
     def hyd_comp_compile_render(
         self,
         comp: Component,
+        tree: Node = None,
     ):
         """
             compiler operation : wraps compiler compile, returns str "HTMLElement"
-            compile node
+            compile node, tree is the already rendered tree of the component,
+            rendered here when None
         """
         return compiler.compile(
-                comp.render(), 
+                tree if tree is not None else comp.render(), 
                 id=comp.id,
                 zenaura_dom_mode=True
             )
@@ -56,19 +58,31 @@ class HydratorCompilerAdapter:
             zenaura_dom_mode=True,
         )
     
-    def hyd_comp_compile_page(self, page: Page) -> str:
+    def hyd_comp_compile_page(self, page: Page, trees: List[Node] = None) -> str:
         """
             compiler operation : wraps compiler compile, returns str "HTMLElement"
-            compiles page children
+            compiles page children, trees are the already rendered trees of
+            the page children, rendered here when None
         """
         html = io.StringIO()
-        for comp in page.children:
+        for idx, comp in enumerate(page.children):
             html.write(
                 compiler.compile(
-                    comp.render(), 
+                    trees[idx] if trees is not None else comp.render(), 
                     comp.id,
                     zenaura_dom_mode=True,
                 )
             )
         return html.getvalue()
-    
+
+    def hyd_comp_iter_page(self, page: Page):
+        """
+            compiler operation : wraps compiler iter_compile, yields str chunks
+            of the compiled page children in document order
+        """
+        for comp in page.children:
+            yield from compiler.iter_compile(
+                comp.render(),
+                comp.id,
+                zenaura_dom_mode=True,
+            )
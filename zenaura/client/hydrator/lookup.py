@@ -26,7 +26,17 @@ class VDomLookupTable:
                 - Retrieves the previous page instance.
                 - Iterates over its components and deletes them from `zen_dom_table`.
 
+        3. **render_counts**:
+            - Counts the `render()` calls made by the virtual dom per component ID.
+            - Instrumentation hook for tests and profiling, one update should cost one render.
+
+        4. **zen_rendered_state**:
+            - Stores the component state each component's virtual DOM was rendered from.
+            - Passed as `prev_state` to the component `should_update(prev_state, next_state)` hook.
+
     """
     zen_dom_table = defaultdict(str)
     prev_page_instance = None
     zen_pre_compiled = defaultdict(str)
+    render_counts = defaultdict(int)
+    zen_rendered_state = {}
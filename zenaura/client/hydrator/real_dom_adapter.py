@@ -1,7 +1,7 @@
 from zenaura.client.tags import Node, HTMLElement, Attribute
 from zenaura.client.page import Page 
 from zenaura.client.config import ZENAURA_DOM_ATTRIBUTE
-from zenaura.web.utils import document, in_browser
+from zenaura.web.utils import document, window, in_browser, to_js
 
 
 class HydratorRealDomAdapter:
@@ -12,6 +12,79 @@ class HydratorRealDomAdapter:
         hyd_romp_
     """
 
+    @property
+    def element_cache(self) -> dict:
+        """
+        keyed uid -> element handle, one cache per adapter instance, created on first use
+        """
+        cache = self.__dict__.get("_element_cache")
+        if cache is None:
+            cache = self.__dict__["_element_cache"] = {}
+        return cache
+
+    def hyd_rdom_query(self, node_id: str) -> HTMLElement:
+        """
+        DOM operation: finds the element with the given keyed uid
+
+        Handles are cached, a cached handle is reused while it is still attached
+        to the document, otherwise the document is queried again.
+
+        Args:
+            node_id: str - the keyed uid of the element
+
+        Returns:
+            HTMLElement - the element, or None if it is not in the document
+        """
+        element = self.element_cache.get(node_id)
+        if element is not None and getattr(element, "isConnected", True):
+            return element
+        element = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{node_id}"]')
+        if element:
+            self.element_cache[node_id] = element
+        else:
+            self.element_cache.pop(node_id, None)
+        return element
+
+    def hyd_rdom_index_elements(self, container_id: str = None) -> int:
+        """
+        DOM operation: caches the handles of every keyed element in one scan, used at mount
+        so later operations on server rendered elements are dictionary hits
+
+        Args:
+            container_id: str - keyed uid of the element to scan, the whole document when None
+
+        Returns:
+            int - the number of indexed elements
+        """
+        container = self.hyd_rdom_query(container_id) if container_id else document
+        if not container:
+            return 0
+        count = 0
+        for element in container.querySelectorAll(f"[{ZENAURA_DOM_ATTRIBUTE}]"):
+            self.element_cache[element.getAttribute(ZENAURA_DOM_ATTRIBUTE)] = element
+            count += 1
+        return count
+
+    def hyd_rdom_invalidate(self, node_id=None, keep_root=False) -> None:
+        """
+        DOM operation: drops the cached handles of an element and of its descendants, or every
+        handle when node_id is None. Descendant uids extend the uid of their ancestor, so every
+        uid starting with node_id is dropped in one pass, a sibling sharing the prefix is only
+        looked up again.
+
+        Args:
+            node_id: str | tuple - the keyed uid of the element, or of several elements
+            keep_root: bool - keep the handle of the element itself, e.g. when only its children were replaced
+        """
+        cache = self.element_cache
+        if node_id is None:
+            cache.clear()
+            return
+        roots = (node_id,) if isinstance(node_id, str) else tuple(node_id)
+        for uid in [uid for uid in cache if uid.startswith(roots)]:
+            if not (keep_root and uid in roots):
+                del cache[uid]
+
 
     def hyd_rdom_create_element(self, virtual_node: Node) -> HTMLElement:
         """
@@ -35,6 +108,8 @@ class HydratorRealDomAdapter:
             html: str - the HTML string to be attached to the root element
         """
         document.getElementById("root").innerHTML = html
+        # every element below root was replaced
+        self.hyd_rdom_invalidate()
 
     def hyd_rdom_attach_to_mounted_comp(
             self,
@@ -48,9 +123,10 @@ class HydratorRealDomAdapter:
             mounted_comp_id: str - the ID of the previously mounted component
             html: str - the HTML string to be attached to the mounted component
         """
-        foundNode = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{mounted_comp_id}"]')
+        foundNode = self.hyd_rdom_query(mounted_comp_id)
         if foundNode:
             foundNode.outerHTML = html
+            self.hyd_rdom_invalidate(mounted_comp_id)
 
     def hyd_rdom_set_attribute(self, mounted_comp_id: str, attribute: Attribute) -> None:
         """
@@ -60,7 +136,7 @@ class HydratorRealDomAdapter:
             mounted_comp_id: The ID of the element to modify.
             attributes: A dictionary of attribute names and their values.
         """
-        element = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{mounted_comp_id}"]')
+        element = self.hyd_rdom_query(mounted_comp_id)
         if element:
             element.setAttribute(attribute.key, attribute.value)
 
@@ -73,7 +149,7 @@ class HydratorRealDomAdapter:
             mounted_comp_id: The ID of the element.
             attribute_name: The name of the attribute to remove.
         """
-        element = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{mounted_comp_id}"]')
+        element = self.hyd_rdom_query(mounted_comp_id)
         if element:
             element.removeAttribute(attribute_name)
 
@@ -84,9 +160,10 @@ class HydratorRealDomAdapter:
         Args:
             mounted_comp_id: str - the ID of the element to be removed
         """
-        element = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{mounted_comp_id}"]')
+        element = self.hyd_rdom_query(mounted_comp_id)
         if element:
             element.parentNode.removeChild(element)
+            self.hyd_rdom_invalidate(mounted_comp_id)
    
     
     def hyd_rdom_append_child(self, mounted_comp_id:str, child_html:str) -> None:
@@ -97,7 +174,7 @@ class HydratorRealDomAdapter:
             mounted_comp_id: str - the ID of the parent element
             child_html: str - the HTML string of the child element to be appended
         """
-        element = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{mounted_comp_id}"]')
+        element = self.hyd_rdom_query(mounted_comp_id)
         if element:
             child_node = document.createElement("template")
             child_node.innerHTML = child_html
@@ -112,20 +189,73 @@ class HydratorRealDomAdapter:
             child_node_id: str - the ID of the child element to insert after
             child_html: str - the HTML string of the child element to be appended
         """
-        element = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{parent_node_id}"]')
+        element = self.hyd_rdom_query(parent_node_id)
         if element : # if parent exists
             child_node = document.createElement("template")
             child_node.innerHTML = child_html
             curr_node = child_node.content.firstChild
-            child_index = int( child_node_id[-1])
-            prev_child = child_index - 1 # child on the dom to insert the new child after it
-            prev_child_id = child_node_id[:-1] + str(prev_child) # parent-childIndex
-            prev_child = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{prev_child_id}"]')
-            if prev_child: # insert after the current child:
+            prev_child = self.hyd_rdom_query(child_node_id) if child_node_id else None
+            if prev_child: # insert after the given child:
                 element.insertBefore(curr_node, prev_child.nextSibling)
             else: # parent is a leaf no children
                 element.append(curr_node)
-            pass
+
+    def hyd_rdom_insert_child_before(self, parent_node_id, before_node_id, child_html) -> None:
+        """
+        DOM operation: inserts a child into an element before a specific child
+
+        Args:
+            parent_node_id: str - the ID of the parent element, None inserts into the parent of the before child
+            before_node_id: str - the ID of the child to insert before, None appends
+            child_html: str - the HTML string of the child element to be inserted
+        """
+        before = self.hyd_rdom_query(before_node_id) if before_node_id else None
+        element = self.hyd_rdom_query(parent_node_id) if parent_node_id else None
+        if element is None and before is not None:
+            element = before.parentNode
+        if element:
+            child_node = document.createElement("template")
+            child_node.innerHTML = child_html
+            if before:
+                element.insertBefore(child_node.content.firstChild, before)
+            else:
+                element.append(child_node.content.firstChild)
+
+    def hyd_rdom_move_child_before(self, parent_node_id, child_node_id, before_node_id) -> None:
+        """
+        DOM operation: moves an existing child of an element before a specific child
+
+        Args:
+            parent_node_id: str - the ID of the parent element
+            child_node_id: str - the ID of the child element to be moved
+            before_node_id: str - the ID of the child to move before, None moves to the end
+        """
+        element = self.hyd_rdom_query(parent_node_id)
+        child = self.hyd_rdom_query(child_node_id)
+        if element and child:
+            before = self.hyd_rdom_query(before_node_id) if before_node_id else None
+            if before:
+                element.insertBefore(child, before)
+            else:
+                element.append(child)
+
+    def hyd_rdom_can_apply_batch(self) -> bool:
+        """
+        DOM operation: checks if the batched patch helper from the server template is loaded
+
+        Returns:
+            bool - True if window.zenauraApplyPatches is available, False otherwise
+        """
+        return in_browser and getattr(window, "zenauraApplyPatches", None) is not None
+
+    def hyd_rdom_apply_patches(self, batch: list) -> None:
+        """
+        DOM operation: applies a serialized patch batch with a single call into the browser
+
+        Args:
+            batch: list - compact patch arrays, see zenaura.client.algorithm.batch
+        """
+        window.zenauraApplyPatches(to_js(batch))
 
     def hyd_rdom_remove_child(self, child_id:str) -> None:
         """
@@ -134,9 +264,10 @@ class HydratorRealDomAdapter:
         Args:
             child_id: str - the ID of the child element to be removed
         """
-        child_node = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{child_id}"]')
+        child_node = self.hyd_rdom_query(child_id)
         if child_node:
             child_node.outerHTML = ""
+            self.hyd_rdom_invalidate(child_id)
 
 
     def hyd_rdom_add_text_render(self, mounted_comp_id: str, text_content: str) -> None:
@@ -147,7 +278,7 @@ class HydratorRealDomAdapter:
             mounted_comp_id: str - the ID of the element to add the text node to
             text_content: str - the text content of the text node
         """
-        element = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{mounted_comp_id}"]')
+        element = self.hyd_rdom_query(mounted_comp_id)
         if element:
             text_node = document.createTextNode(text_content)
             element.appendChild(text_node)
@@ -161,9 +292,11 @@ class HydratorRealDomAdapter:
             mounted_comp_id: str - the ID of the element to replace the text content of
             new_text: str - the new text content
         """
-        element = document.querySelector(f'[{ZENAURA_DOM_ATTRIBUTE}="{mounted_comp_id}"]')
+        element = self.hyd_rdom_query(mounted_comp_id)
         if element:
             element.textContent = new_text
+            # the children of the element were replaced by the text
+            self.hyd_rdom_invalidate(mounted_comp_id, keep_root=True)
 
     def hyd_rdom_is_interactive(self) -> bool:
         """
@@ -210,9 +343,9 @@ class HydratorRealDomAdapter:
             previous_page: Page - the previously mounted page
             current_page: Page - the currently mounted page
         """
-        p_page = document.querySelector(f'[data-zenaura="{previous_page.id}"]')
+        p_page = self.hyd_rdom_query(previous_page.id)
         if p_page:
             p_page.hidden = True
-        curr_page = document.querySelector(f'[data-zenaura="{current_page.id}"]')
+        curr_page = self.hyd_rdom_query(current_page.id)
         if curr_page:
             curr_page.hidden = False # Update the title
\ No newline at end of file
@@ -1,4 +1,6 @@
 from zenaura.client.component import Component
+from zenaura.client.tags import Node
+from zenaura.client.observer.store import track, untrack
 from .lookup import VDomLookupTable
 
 class HydratorVirtualDomAdapter(
@@ -10,13 +12,44 @@ class HydratorVirtualDomAdapter(
         hyd_vdom_
     """
 
-    def hyd_vdom_update(self, comp: Component) -> None:
+    def hyd_vdom_render(self, comp: Component) -> Node:
+        """
+            virtual dom operation : renders the component tree, counted in render_counts,
+            reactive store keys read by render() are tracked as its dependencies
+            args:
+                comp: Component
+        """
+        self.render_counts[comp.id] += 1
+        # store reads made by render() become the component dependencies
+        with track(comp):
+            return comp.render()
+
+    def hyd_vdom_update(self, comp: Component, tree: Node = None) -> None:
         """
             virtual dom operation : updates virtual dom of component
+            args:
+                comp: Component
+                tree: Node, the already rendered tree of the component,
+                    rendered here when None
+        """
+        self.zen_dom_table[comp.id] = tree if tree is not None else self.hyd_vdom_render(comp)
+        self.zen_rendered_state[comp.id] = comp.get_state()
+
+    def hyd_vdom_should_update(self, comp: Component) -> bool:
+        """
+            virtual dom operation : asks the component should_update hook if its
+            state changed since the last render, components without the hook
+            or without a previous render always update, state is copy-on-write
+            so an unchanged state object skips the hook
             args:
                 comp: Component
         """
-        self.zen_dom_table[comp.id] = comp.render()
+        if not hasattr(comp, "should_update") or comp.id not in self.zen_rendered_state:
+            return True
+        prev_state, next_state = self.zen_rendered_state[comp.id], comp.get_state()
+        if prev_state is next_state:
+            return False
+        return bool(comp.should_update(prev_state, next_state))
 
     def hyd_vdom_delete(self, comp: Component) -> None:
         """
@@ -25,6 +58,8 @@ class HydratorVirtualDomAdapter(
                 comp: Component
         """
         del self.zen_dom_table[comp.id]
+        self.zen_rendered_state.pop(comp.id, None)
+        untrack(comp)
 
     def hyd_vdom_update_with_new_render(self, comp: Component, new_node):
         """
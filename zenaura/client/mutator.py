@@ -1,7 +1,7 @@
 import functools
 import asyncio 
 from zenaura.client.dispatcher import dispatcher
-from zenaura.client.dom import zenaura_dom
+from zenaura.client.scheduler import render_scheduler
 
 
 
@@ -10,7 +10,8 @@ def mutator(coroutine):
     Decorator to automatically render the DOM after the decorated coroutine executes.
 
     This decorator is useful for functions that modify the state of the application,
-    triggering a re-rendering of the DOM to reflect the changes.
+    triggering a re-rendering of the DOM to reflect the changes. Renders are coalesced
+    by the render scheduler, so every mutation in the same tick renders the component once.
 
     Args:
         coroutine: The function to be decorated.
@@ -43,7 +44,7 @@ def mutator(coroutine):
             None
         """
         dispatcher.dispatch(coroutine, component, *args, **kwargs)
-        dispatcher.dispatch(zenaura_dom.render, component)
+        render_scheduler.schedule(component)
 
     return wrapper_func
 
@@ -53,7 +54,8 @@ def mutates(func):
     Decorator to automatically render the DOM after the decorated function executes.
 
     This decorator is useful for functions that modify the state of the application,
-    triggering a re-rendering of the DOM to reflect the changes.
+    triggering a re-rendering of the DOM to reflect the changes. Renders are coalesced
+    by the render scheduler, so every mutation in the same tick renders the component once.
 
     Args:
         coroutine: The function to be decorated.
@@ -86,5 +88,5 @@ def mutates(func):
             None
         """
         func(component, *args, **kwargs)
-        dispatcher.dispatch(zenaura_dom.render, component)
+        render_scheduler.schedule(component)
     return wrapper_func
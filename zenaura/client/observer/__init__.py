@@ -1,2 +1,3 @@
 from .observer import Observer
-from .subject import Subject
\ No newline at end of file
+from .subject import Subject
+from .store import Store, track, untrack
@@ -71,4 +71,17 @@ class Observer(ABC):
         Returns:
         None
         """
-        pass
\ No newline at end of file
+        pass
+
+    def update_batch(self, value, changes):
+        """
+        Called instead of update when the subject delivers a batch or transaction.
+
+        Parameters:
+        value (dict): The updated value from the subject.
+        changes (dict): The changed keys, {key: (old value, new value)}.
+
+        Returns:
+        None
+        """
+        return self.update(value)
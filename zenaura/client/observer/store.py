@@ -0,0 +1,163 @@
+from collections import defaultdict
+from contextlib import contextmanager
+
+# components whose render() is running, innermost last
+_rendering = []
+
+# component id -> {(store, key)} read during its last render
+_dependencies = defaultdict(set)
+
+# values compared by equality on write, a mutable value written back may have been edited in place
+_IMMUTABLE = (str, bytes, int, float, complex, bool, type(None), tuple, frozenset, range)
+
+
+def untrack(component) -> None:
+    """
+    Drops every store dependency recorded for the component.
+
+    Args:
+        component (Component): The component to forget.
+    """
+    for store, key in _dependencies.pop(component.id, ()):
+        store._dependents[key].pop(component.id, None)
+
+
+@contextmanager
+def track(component):
+    """
+    Records the store keys read while the component renders, the dependencies
+    of its previous render are dropped first so conditional reads stay accurate.
+
+    Args:
+        component (Component): The component about to render.
+    """
+    untrack(component)
+    _rendering.append(component)
+    try:
+        yield
+    finally:
+        _rendering.pop()
+
+
+class Store:
+    """
+    Reactive key-value store with per-component dependency tracking.
+
+    Reads made inside a component's `render()` are recorded, writing a key only
+    schedules renders for the components that read that key in their last render,
+    instead of notifying every observer of the whole state.
+
+    **Example:**
+
+    ```python
+    store = Store({"user": None, "cart": []})
+
+    class Cart(Component):
+        def render(self):
+            return div(f"{len(store['cart'])} items")
+
+    store["cart"] = ["book"]  # renders Cart only
+    store["user"] = "ada"  # Cart did not read user, nothing renders
+    ```
+
+    Attributes:
+        scheduler (RenderScheduler): Coalesces the renders of dependent components.
+    """
+
+    def __init__(self, initial=None, scheduler=None):
+        """
+        Initializes the store.
+
+        Args:
+            initial (dict, optional): The initial key-values. Defaults to None.
+            scheduler (RenderScheduler, optional): Schedules dependent renders. Defaults to the global render scheduler.
+        """
+        self._data = dict(initial) if initial else {}
+        self._dependents = defaultdict(dict)  # key -> {component id: component}
+        self._scheduler = scheduler
+
+    @property
+    def scheduler(self):
+        if self._scheduler is None:
+            from zenaura.client.scheduler import render_scheduler
+            self._scheduler = render_scheduler
+        return self._scheduler
+
+    def _track(self, key) -> None:
+        if _rendering:
+            component = _rendering[-1]
+            self._dependents[key][component.id] = component
+            _dependencies[component.id].add((self, key))
+
+    def __getitem__(self, key):
+        self._track(key)
+        return self._data[key]
+
+    def get(self, key, default=None):
+        """
+        Returns the value of key or default, the read is tracked.
+        """
+        self._track(key)
+        return self._data.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        self._track(key)
+        return key in self._data
+
+    def __setitem__(self, key, value) -> None:
+        self.update({key: value})
+
+    def __delitem__(self, key) -> None:
+        del self._data[key]
+        self.changed({key})
+
+    def update(self, values: dict) -> set:
+        """
+        Writes several keys at once, dependent components are scheduled once.
+
+        Writing a value equal to the stored one is ignored, except when the stored
+        list, dict or other mutable object is written back, it may have been edited
+        in place, e.g. `items.append(x); store.update({"items": items})`.
+
+        Args:
+            values (dict): The key-values to write.
+
+        Returns:
+            set: The keys whose value changed.
+        """
+        changed = set()
+        for key, value in values.items():
+            if key in self._data:
+                old = self._data[key]
+                if old == value and (old is not value or isinstance(value, _IMMUTABLE)):
+                    continue
+            self._data[key] = value
+            changed.add(key)
+        if changed:
+            self.changed(changed)
+        return changed
+
+    def changed(self, keys) -> None:
+        """
+        Schedules a render for every component that read one of the keys.
+
+        Args:
+            keys (iterable): The changed keys.
+        """
+        components = {}
+        for key in keys:
+            components.update(self._dependents.get(key, {}))
+        for component in components.values():
+            self.scheduler.schedule(component)
+
+    def dependents(self, key) -> set:
+        """
+        Returns the ids of the components that read key in their last render.
+        """
+        return set(self._dependents.get(key, {}))
+
+    def snapshot(self) -> dict:
+        """
+        Returns a shallow copy of the store data, the read is not tracked.
+        """
+        return dict(self._data)
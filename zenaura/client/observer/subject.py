@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import contextmanager
+
 class Subject:
     """
     Create subjects for components to communicate on.
@@ -49,18 +52,23 @@ class Subject:
     - The subject can manage multiple observers and notify them individually or in groups.
     """
 
-    def __init__(self):
+    def __init__(self, async_notify=False):
         """
         Initialize a new Subject.
 
         Parameters:
-        None
+        async_notify (bool, optional): Deliver notifications on the running event loop instead of
+            blocking the writer, observers are called synchronously when no loop is running. Defaults to False.
 
         Returns:
         None
         """
         self._observers = set()
         self._state = {}
+        self.async_notify = async_notify
+        self._batch_depth = 0
+        self._batch_start = None
+        self._batch_dirty = False
 
     def attach(self, observer):
         """
@@ -86,18 +94,129 @@ class Subject:
         """
         self._observers.discard(observer)
 
-    def notify(self):
+    def notify(self, changes=None):
         """
         Notify all attached observers.
 
         Parameters:
+        changes (dict, optional): The changed keys of a batch, {key: (old, new)}, observers
+            defining update_batch(value, changes) receive them. Defaults to None.
+
+        Returns:
         None
+        """
+        loop = None
+        if self.async_notify:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+
+        for observer in list(self._observers):
+            if loop is not None:
+                loop.call_soon(self._deliver, observer, self._state, changes)
+            else:
+                self._deliver(observer, self._state, changes)
+
+    def _deliver(self, observer, state, changes):
+        """
+        Delivers a notification to one observer, coroutine observers are scheduled as tasks.
+        """
+        if changes is not None and hasattr(observer, "update_batch"):
+            result = observer.update_batch(state, changes)
+        else:
+            result = observer.update(state)
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+    @contextmanager
+    def batch(self):
+        """
+        Collects every state write made inside the block and notifies observers once
+        when the outermost batch exits, with the diff of the changed keys.
+
+        Example:
+        ```python
+        with subject.batch():
+            subject.update({"name": user["name"]})
+            subject.update({"email": user["email"]})
+        # observers notified once
+        ```
+        """
+        self._begin()
+        try:
+            yield self
+        finally:
+            self._end(commit=True)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Same as batch, but if the block raises the state is rolled back to its value
+        before the transaction and observers are not notified.
+        """
+        self._begin()
+        try:
+            yield self
+        except BaseException:
+            self._end(commit=False)
+            raise
+        self._end(commit=True)
+
+    def _begin(self):
+        if self._batch_depth == 0:
+            self._batch_start = dict(self._state) if isinstance(self._state, dict) else self._state
+            self._batch_dirty = False
+        self._batch_depth += 1
+
+    def _end(self, commit):
+        self._batch_depth -= 1
+        if not commit:
+            # a failed nested transaction rolls back the whole batch
+            self._state = self._batch_start
+            self._batch_dirty = False
+        if self._batch_depth or not self._batch_dirty:
+            return
+        self._batch_dirty = False
+        changes = self.diff(self._batch_start, self._state)
+        self._batch_start = None
+        if changes:
+            self.notify(changes)
+
+    @staticmethod
+    def diff(old, new) -> dict:
+        """
+        Returns the changed keys between two states as {key: (old value, new value)},
+        a missing key is reported as None, non dict states are reported under the None key.
+        """
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            return {} if old is new or old == new else {None: (old, new)}
+        changes = {}
+        for key in old.keys() | new.keys():
+            prev, curr = old.get(key), new.get(key)
+            if key not in old or key not in new or prev != curr:
+                changes[key] = (prev, curr)
+        return changes
+
+    def update(self, values: dict):
+        """
+        Merges values into a dict state and notifies observers, inside a batch the
+        notification is deferred to the end of the batch.
+
+        Parameters:
+        values (dict): The keys to write.
 
         Returns:
         None
+
+        Raises:
+        TypeError: If the state of the subject is not a dict.
         """
-        for observer in self._observers:
-            observer.update(self._state)
+        if not isinstance(self._state, dict):
+            raise TypeError(f"update merges into a dict state, the state is a {type(self._state).__name__}, assign state instead")
+        state = dict(self._state)
+        state.update(values)
+        self.state = state
 
     @property
     def state(self):
@@ -115,7 +234,8 @@ class Subject:
     @state.setter
     def state(self, new_value):
         """
-        Set the state of the subject and notify observers.
+        Set the state of the subject and notify observers, inside a batch
+        observers are notified once when the batch ends.
 
         Parameters:
         new_value (dict): The new state of the subject.
@@ -124,4 +244,7 @@ class Subject:
         None
         """
         self._state = new_value
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
         self.notify()
@@ -0,0 +1,89 @@
+import asyncio
+from zenaura.client.dom import zenaura_dom
+
+
+class RenderScheduler:
+    """
+    Coalesces component renders requested by mutators.
+
+    Instead of rendering after every state change, mutators mark their component dirty,
+    the first mark in a tick schedules a single flush on the running event loop, and the
+    flush renders every dirty component once, so a handler that mutates state three
+    times renders once.
+
+    **Usage:**
+
+    ```python
+    render_scheduler.schedule(counter)
+    render_scheduler.schedule(counter)
+    await render_scheduler.flush()  # counter rendered once
+    ```
+
+    Attributes:
+        dirty (dict): Components waiting to be rendered, keyed by component id in mark order.
+        scheduled (bool): Whether a flush is already scheduled on the event loop.
+        loop (AbstractEventLoop): The event loop the last flush was scheduled on.
+        renders (int): Number of renders performed by this scheduler.
+    """
+
+    def __init__(self, render=None):
+        """
+        Initializes the scheduler.
+
+        Args:
+            render (coroutine function, optional): Renders a component. Defaults to zenaura_dom.render.
+        """
+        self.render = render if render else zenaura_dom.render
+        self.dirty = {}
+        self.scheduled = False
+        self.loop = None
+        self.renders = 0
+
+    def schedule(self, component) -> None:
+        """
+        Marks the component dirty and schedules a flush for the current tick.
+
+        Without a running event loop nothing is scheduled, the component stays dirty
+        until `flush` is awaited. A flush scheduled on a loop that stopped before running
+        it, or that could not be registered, does not hold back later schedules.
+
+        Args:
+            component (Component): The component whose state changed.
+        """
+        self.dirty[component.id] = component
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self.scheduled and self.loop is loop:
+            return
+        self.scheduled = True
+        self.loop = loop
+        try:
+            loop.call_soon(lambda: asyncio.ensure_future(self.flush()))
+        except RuntimeError:
+            self.scheduled = False
+
+    async def flush(self) -> int:
+        """
+        Renders every dirty component once, components marked dirty while
+        flushing are rendered in the same flush. When a render raises, the
+        components left dirty are rendered by the next flush.
+
+        Returns:
+            int: The number of renders performed.
+        """
+        count = 0
+        try:
+            while self.dirty:
+                component_id = next(iter(self.dirty))
+                component = self.dirty.pop(component_id)
+                await self.render(component)
+                count += 1
+        finally:
+            self.scheduled = False
+            self.renders += count
+        return count
+
+
+render_scheduler = RenderScheduler()
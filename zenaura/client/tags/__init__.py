@@ -1,4 +1,4 @@
-from .node import Node, update_root_properties
+from .node import Node, update_root_properties, has_keyed_children
 from .attribute import Attribute
 from .builder import Builder
 from .html import HTMLElement
\ No newline at end of file
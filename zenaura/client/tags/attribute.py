@@ -10,6 +10,8 @@ class Attribute:
         to_dict(): Converts the attribute to a dictionary representation.
     """
 
+    __slots__ = ("key", "value")
+
     def __init__(self, key, value):
         """
         Initializes an Attribute object with the given key and value.
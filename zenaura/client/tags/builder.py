@@ -60,9 +60,25 @@ class Builder:
         Returns:
             Builder: The Builder object.
         """
+        if key == "key_":
+            return self.with_key(value)
         self.node.attributes.append(Attribute(key, value))
         return self
 
+    def with_key(self, key: any) -> "Builder":
+        """
+        Sets the reconciliation key of the tag, siblings that all carry
+        unique keys are diffed by key instead of by position.
+
+        Args:
+            key: The key of the node, e.g. the id of the rendered row.
+
+        Returns:
+            Builder: The Builder object.
+        """
+        self.node.key_ = key
+        return self
+
     def with_child(self, child: Node) -> "Builder":
         """
         Adds a child node to the tag.
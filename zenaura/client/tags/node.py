@@ -1,9 +1,71 @@
-import uuid
+import itertools
+import weakref
+from hashlib import blake2b
 from typing import List, Optional
 from zenaura.client.config import self_closing_tags
 from .attribute import Attribute
 
-def update_root_properties(root):
+def has_keyed_children(children) -> bool:
+    """
+        keyed reconciliation is opt-in: a list of siblings is keyed
+        only when every sibling is a Node carrying a unique key_
+    """
+    keys = set()
+    for child in children:
+        if not isinstance(child, Node) or child.key_ is None or child.key_ in keys:
+            return False
+        keys.add(child.key_)
+    return len(keys) > 0
+
+def child_path(path, level, child, idx, keyed) -> str:
+    """
+        path of a child within its parent, keyed children are addressed
+        by their key so their real dom id survives reorders
+    """
+    if keyed:
+        return f"{path}{level}k{child.key_}:"
+    return path + str(level) + str(idx)
+
+# nodes whose subtree paths and levels are not assigned yet, in mutation order,
+# held weakly so trees built and discarded before any read are freed
+_pending_roots = weakref.WeakKeyDictionary()
+
+def attach_children(node, children, start=0):
+    """
+        Upon intialization of a node or setting/appending children
+        links only the newly attached children in O(len(children)):
+        1. convert str children into text nodes
+        2. assign key and is_leaf information
+        level, path and parent of the whole subtree are deferred
+        to the first read, see flush_root_properties
+    """
+    for idx in range(start, len(children)):
+        child = children[idx]
+        if isinstance(child, str):
+            child = Node(text=child)
+            list.__setitem__(children, idx, child)
+        child._owner = node
+        child._key = idx
+        child._is_leaf = len(child._children) == 0
+        # the walk from node covers the child subtree
+        _pending_roots.pop(child, None)
+    node._is_leaf = len(children) == 0
+    _pending_roots.pop(node, None)
+    if children:
+        _pending_roots[node] = None
+
+def flush_root_properties():
+    """
+        assigns level, path and parent for every pending root in mutation order,
+        roots attached to a later pending root were dropped on attach, so a tree
+        built bottom-up is walked once from its top node
+    """
+    roots = list(_pending_roots)
+    _pending_roots.clear()
+    for root in roots:
+        update_root_properties(root, with_keys=False)
+
+def update_root_properties(root, with_keys=True):
     """
         Upon intialization of a node or setting children
         This method create infromation rich tree nodes:
@@ -12,18 +74,23 @@ def update_root_properties(root):
         3. is_leaf_node, is_text node
         and so on
     """
-    stack = [(root, None, 0, 0, root.path)] # (node, level_parent, level, index, path)
+    stack = [(root, None, 0, 0, root._path)] # (node, level_parent, level, index, path)
 
     while stack :
-        curr, curr.parent, curr.level, curr.key, curr.path   = stack.pop()
-        curr.is_leaf = len(curr.children) == 0
-        for idx, child in enumerate(curr.children):
+        curr, parent, level, key, path = stack.pop()
+        curr._parent, curr._level, curr._path = parent, level, path
+        if with_keys:
+            curr._key = key
+        children = curr._children
+        curr._is_leaf = len(children) == 0
+        for idx, child in enumerate(children):
             if isinstance(child, str):
                 child = Node(text=child)
-                child.is_text_node = True
-            child.is_leaf = len(child.children) == 0
-            curr.children[idx] = child
-            stack.append((child, child, curr.level + 1, idx, curr.path + str(curr.level) + str(idx)))
+                list.__setitem__(children, idx, child)
+            child._is_leaf = len(child._children) == 0
+        keyed = has_keyed_children(children)
+        for idx, child in enumerate(children):
+            stack.append((child, child, level + 1, idx, child_path(path, level, child, idx, keyed)))
     return root
 
 class NodeList(list):
@@ -37,12 +104,58 @@ class NodeList(list):
         super().append(child)
         self.node.children = self  # Trigger the setter
     
+class TrackedList(list):
+    """
+        children or attributes of a node, every in place mutation
+        is reported to the owner node so its structural hash and
+        the hashes of its ancestors are dropped
+    """
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner, items=()):
+        super().__init__(items)
+        self.owner = owner
+
+    def __reduce_ex__(self, protocol):
+        # rebuilt without an owner, Node.__setstate__ links it back
+        return TrackedList, (None, list(self))
+
+def _tracked(name):
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self.owner is not None:
+            self.owner._mutated(self)
+        return result
+
+    mutate.__name__ = name
+    return mutate
+
+for _name in (
+    "append", "extend", "insert", "remove", "pop", "clear", "sort",
+    "reverse", "__setitem__", "__delitem__", "__iadd__", "__imul__",
+):
+    setattr(TrackedList, _name, _tracked(_name))
+
+# cheap monotonic node ids, starts at 1 so every id is truthy
+_node_ids = itertools.count(1)
+
 class Node:
+    __slots__ = (
+        "_parent", "_level", "_key", "_is_leaf", "_path",
+        "name", "_children", "_attributes", "nodeId", "_text",
+        "_key_", "_subtree_hash", "_is_text_node", "_owner",
+        "__weakref__",
+    )
+
     def __init__(
             self,name : str = None, 
             children: Optional[List["Node"]]=None, 
             attributes : Optional[List[Attribute]]=None,
             text: str = None,
+            key_ = None,
             ):
         """
         Represents an HTML element with attributes, children, and text content.
@@ -52,14 +165,18 @@ class Node:
             children (list of Node): The child elements of this node.
             attributes (list of Attribute): The attributes of this node.
             text (str, optional): The text content of this node.
-            nodeId (str): A unique identifier for this node.
+            nodeId (int): A unique, monotonically increasing identifier for this node.
             is_leaf (bool): Whether this node has no children.
             is_text_node (bool): Whether this node represents text content.
             level (int): The depth of this node in the tree.
             key (int): A unique identifier for this node within its level.
             path (str): The path from the root to this node.
+            key_ (str, optional): Opt-in reconciliation key, when every sibling
+                carries a unique key_ children are diffed by key instead of position.
         """
         self._parent = None
+        # node holding this one in its children, hash invalidation walks up through it
+        self._owner = None
 
         # calculated properties
         self._level = 0
@@ -68,16 +185,32 @@ class Node:
         self._path = ""
 
         self.name = name
-        self._children = children if children else []
-        self.attributes = [] if attributes is None else attributes
-        self.nodeId = uuid.uuid4().hex
-        self.text = text        
+        self._children = TrackedList(self, children) if children else TrackedList(self)
+        self._attributes = TrackedList(self, attributes) if attributes else TrackedList(self)
+        self.nodeId = next(_node_ids)
+        self._text = text
+        self._key_ = key_
+        self._subtree_hash = None
         # calculated proerty depends on children, text
-        self._is_text_node = isinstance(self.text, str)
-        update_root_properties(self)
+        self._is_text_node = isinstance(text, str)
+        attach_children(self, self._children)
+
+    def __getstate__(self):
+        # pickled and copied trees carry their assigned paths and levels
+        if _pending_roots:
+            flush_root_properties()
+        return {name: getattr(self, name) for name in Node.__slots__ if name != "__weakref__"}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._children.owner = self
+        self._attributes.owner = self
 
     @property
     def level(self):
+        if _pending_roots:
+            flush_root_properties()
         return self._level
 
     @level.setter
@@ -86,6 +219,8 @@ class Node:
 
     @property
     def is_leaf(self):
+        if _pending_roots:
+            flush_root_properties()
         return self._is_leaf
 
     @is_leaf.setter
@@ -100,8 +235,37 @@ class Node:
     def key(self, new_key):
         self._key = new_key
 
+    @property
+    def key_(self):
+        return self._key_
+
+    @key_.setter
+    def key_(self, new_key_):
+        self._key_ = new_key_
+        self.invalidate()
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, new_text):
+        self._text = new_text
+        self.invalidate()
+
+    @property
+    def attributes(self):
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, new_attributes):
+        self._attributes = TrackedList(self, new_attributes or ())
+        self.invalidate()
+
     @property
     def path(self):
+        if _pending_roots:
+            flush_root_properties()
         return self._path
 
     @path.setter
@@ -119,6 +283,8 @@ class Node:
     @property
     def parent(self):
         """Read-only property referencing the node's parent."""
+        if _pending_roots:
+            flush_root_properties()
         return self._parent
 
     @parent.setter
@@ -132,8 +298,55 @@ class Node:
     @children.setter
     def children(self, new_children):
         """Intercept assignment to update child relationships"""
+        if not (isinstance(new_children, TrackedList) and new_children.owner is self):
+            new_children = TrackedList(self, new_children or ())
         self._children = new_children
-        update_root_properties(self)
+        attach_children(self, new_children)
+        self.invalidate()
+
+    def _mutated(self, tracked) -> None:
+        """
+        Called by TrackedList after an in place mutation of the children or attributes.
+        """
+        if tracked is self._children:
+            for idx, child in enumerate(tracked):
+                if isinstance(child, str):
+                    child = Node(text=child)
+                    list.__setitem__(tracked, idx, child)
+                child._owner = self
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached structural hash of this node and of its ancestors, an ancestor
+        hash is only ever computed over cached descendant hashes, so the walk stops at
+        the first node without one.
+        """
+        node = self
+        while node is not None and node._subtree_hash is not None:
+            node._subtree_hash = None
+            node = node._owner
+
+    @property
+    def subtree_hash(self) -> int:
+        """
+        Structural hash of this node and its subtree: name, key_, attributes, text
+        and children hashes, a 128 bit digest of their repr so distinct subtrees never
+        share a hash in practice. Computed lazily once and cached, the cache of the node
+        and of its ancestors is dropped whenever children, attributes, text or key_
+        change, so diffing can skip any subtree whose hash did not change. Attribute
+        objects are compared by value, replace an attribute instead of editing it.
+        """
+        if self._subtree_hash is None:
+            fields = repr((
+                self.name,
+                self._key_,
+                self._text,
+                tuple((attr.key, str(attr.value)) for attr in self._attributes),
+                tuple(child.subtree_hash for child in self._children),
+            ))
+            self._subtree_hash = int.from_bytes(blake2b(fields.encode("utf-8", "surrogatepass"), digest_size=16).digest(), "big")
+        return self._subtree_hash
 
     def append_child(self, child):
         """
@@ -146,8 +359,9 @@ class Node:
         if isinstance(child, str):
             child = Node(text=child)
             child.is_text_node = True
-        self.children.append(child)
-        update_root_properties(self)
+        list.append(self._children, child)
+        attach_children(self, self._children, len(self._children) - 1)
+        self.invalidate()
     
     def to_dict(self) -> dict:
         """
@@ -39,6 +39,20 @@ class MockElement:
             if isinstance(child, MockElement):
                 child.parentNode = self
 
+    def insertBefore(self, child, before):
+        if child in self.childNodes:
+            self.childNodes.remove(child)
+        self.childNodes.insert(self.childNodes.index(before), child)
+        if isinstance(child, MockElement):
+            child.parentNode = self
+
+    def append(self, child):
+        if child in self.childNodes:
+            self.childNodes.remove(child)
+        self.childNodes.append(child)
+        if isinstance(child, MockElement):
+            child.parentNode = self
+
     def removeChild(self, child):
         if child in self.childNodes:
             self.childNodes.remove(child)
@@ -85,6 +99,10 @@ class MockDocument:
         id = query[-1]
         return self.elementsById.get(id)
 
+    def querySelectorAll(self, query: str):
+        attribute = query.replace("[", "").replace("]", "")
+        return [element for element in self.elementsById.values() if isinstance(element, MockElement) and element.getAttribute(attribute) is not None]
+
     def dispatchEvent(self, event):
         for callback in self.eventListeners.get(event, []):
             callback(event)
@@ -0,0 +1,200 @@
+import json
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+
+# dev client: reloads on "refresh", swaps the page content on fragment updates,
+# connects back to the host and port the page was served from
+DEV_CLIENT_SCRIPT = """
+<script>
+    const ws = new WebSocket(`${location.protocol === "https:" ? "wss" : "ws"}://${location.host}/refresh`);
+    ws.onmessage = (event) => {
+        if (event.data.startsWith("{")) {
+            const message = JSON.parse(event.data);
+            const pages = message.type === "fragment" ? Object.entries(message.pages) : [];
+            const targets = pages.map(([id]) => document.querySelector(`[data-zenaura="${id}"]`));
+            if (pages.length && targets.every(Boolean)) {
+                pages.forEach(([, html], idx) => { targets[idx].innerHTML = html; });
+                return;
+            }
+        }
+        console.log("Reloading...");
+        location.reload();
+    };
+</script>
+"""
+
+
+REFRESH = "refresh"
+
+
+def coalesce(pending, message):
+    """
+    Folds a message into the one waiting to be sent: a refresh supersedes everything,
+    page updates are merged, the latest page wins, any other message replaces the waiting one.
+    """
+    if pending == REFRESH or message == REFRESH:
+        return REFRESH
+    if isinstance(pending, dict) and isinstance(message, dict):
+        return {**pending, **message}
+    return message
+
+
+def encode(message) -> str:
+    if isinstance(message, dict):
+        return json.dumps({"type": "fragment", "pages": message})
+    return message
+
+
+class _Client:
+    """
+    A connected websocket and its send slot, at most one message waits behind the one being sent.
+    """
+    __slots__ = ("ws", "pending", "sending", "lock")
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.pending = None
+        self.sending = False
+        self.lock = Lock()
+
+
+class RefreshBroadcaster:
+    """
+    Fans out dev server messages to every connected browser concurrently.
+
+    Clients live in a registry guarded by a lock, so websocket handler threads can register and
+    unregister while a broadcast runs. Every client is sent to from a thread pool, a slow client
+    never delays the others. Backpressure is per client: while a message is being sent, newer
+    messages are folded into the one waiting instead of queueing, so a reload storm costs a slow
+    tab one extra message. Clients whose send fails, or that are no longer connected, are dropped.
+
+    **Usage:**
+
+    ```python
+    broadcaster = RefreshBroadcaster()
+    broadcaster.register(ws)
+    broadcaster.refresh()
+    broadcaster.fragment({page.id: html})  # swaps the page content without reloading
+    ```
+
+    Attributes:
+        sent (int): Messages sent.
+        coalesced (int): Messages folded into a newer one before being sent.
+        dropped (int): Clients dropped after a failed send or a lost connection.
+    """
+
+    def __init__(self, max_workers=8):
+        """
+        Initializes the broadcaster.
+
+        Args:
+            max_workers (int, optional): Number of concurrent sends. Defaults to 8.
+        """
+        self._clients = {}
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="zenaura-refresh")
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def register(self, ws) -> None:
+        with self._lock:
+            self._clients[id(ws)] = _Client(ws)
+
+    def unregister(self, ws) -> bool:
+        """
+        Removes a client, returns False when it was not registered.
+        """
+        with self._lock:
+            return self._clients.pop(id(ws), None) is not None
+
+    def clients(self) -> list:
+        """
+        Returns a snapshot of the connected websockets.
+        """
+        with self._lock:
+            return [client.ws for client in self._clients.values()]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def prune(self) -> int:
+        """
+        Drops the clients whose connection is closed, e.g. after missed heartbeats.
+
+        Returns:
+            int: The number of dropped clients.
+        """
+        with self._lock:
+            stale = [key for key, client in self._clients.items() if not getattr(client.ws, "connected", True)]
+            for key in stale:
+                del self._clients[key]
+            self.dropped += len(stale)
+        return len(stale)
+
+    def broadcast(self, message) -> list:
+        """
+        Sends message to every client without waiting for the sends.
+
+        Args:
+            message (str | dict): The message, a dict of page id to html is sent as a fragment message.
+
+        Returns:
+            list: The futures of the started sends, clients already sending get the message after their current send.
+        """
+        self.prune()
+        with self._lock:
+            clients = list(self._clients.values())
+        futures = []
+        for client in clients:
+            with client.lock:
+                if client.sending:
+                    if client.pending is not None:
+                        with self._lock:
+                            self.coalesced += 1
+                    client.pending = coalesce(client.pending, message)
+                    continue
+                client.sending = True
+                client.pending = message
+            futures.append(self._executor.submit(self._drain, client))
+        return futures
+
+    def _drain(self, client: _Client) -> None:
+        while True:
+            with client.lock:
+                message, client.pending = client.pending, None
+                if message is None:
+                    client.sending = False
+                    return
+            try:
+                client.ws.send(encode(message))
+            except Exception:
+                with client.lock:
+                    client.sending = False
+                    client.pending = None
+                if self.unregister(client.ws):
+                    with self._lock:
+                        self.dropped += 1
+                return
+            with self._lock:
+                self.sent += 1
+
+    def refresh(self) -> list:
+        """
+        Asks every browser to reload.
+        """
+        return self.broadcast(REFRESH)
+
+    def fragment(self, pages: dict) -> list:
+        """
+        Asks every browser to replace the content of pages, without reloading. Browsers
+        missing one of the pages, e.g. a lazy route not visited yet, reload instead.
+
+        Args:
+            pages (dict): Page id to the compiled content of the page.
+        """
+        return self.broadcast(dict(pages))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,121 @@
+import os
+import hashlib
+import inspect
+from zenaura import version
+from zenaura.client.page import Page
+from zenaura.client.tags import Node
+
+
+def component_source(cls) -> str:
+    """
+    Returns the source of a component class, the qualified name when the source
+    is not available (e.g. classes defined in an interactive session).
+    """
+    try:
+        return inspect.getsource(cls)
+    except (OSError, TypeError):
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def write_tree(node, digest) -> None:
+    """
+    Feeds a stable serialization of the rendered tree to digest, independent
+    of node ids and of the python hash seed so digests are valid across builds.
+    Every record is the repr of a tuple of strings, quoted and escaped, so no
+    two different trees serialize alike whatever their text or attributes hold.
+    """
+    stack = [node]
+    while stack:
+        curr = stack.pop()
+        if not isinstance(curr, Node):
+            record = ("s", str(curr))
+        else:
+            record = ("n", str(curr.name), str(curr.key_), str(curr.text), len(curr.attributes), len(curr.children))
+        digest.update(repr(record).encode("utf-8", "surrogatepass"))
+        if isinstance(curr, Node):
+            for attr in curr.attributes:
+                digest.update(repr(("a", str(attr.key), str(attr.value))).encode("utf-8", "surrogatepass"))
+            stack.extend(reversed(curr.children))
+
+
+class PageCache:
+    """
+    On-disk content-addressed cache of compiled pages.
+
+    A page is addressed by the digest of its compile inputs: the zenaura version, the source of
+    every component class, the component ids, the page attributes and the rendered tree of every
+    component. Rendering is cheap next to compiling and sanitizing the html, so pages are still
+    rendered on every build but only pages whose digest changed are compiled, unchanged pages are
+    read back from the cache. Entries are never invalidated, a changed page gets a new digest.
+
+    **Usage:**
+
+    ```python
+    cache = PageCache("./.zenaura_cache")
+    ZenauraServer.hydrate_app(app, cache=cache)
+    print(cache.hits, cache.misses)
+    ```
+
+    Attributes:
+        directory (str): Where compiled pages are stored, one file per digest.
+        hits (int): Pages read back from the cache.
+        misses (int): Pages compiled because their digest changed.
+    """
+
+    def __init__(self, directory="./.zenaura_cache"):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str, optional): Where compiled pages are stored. Defaults to "./.zenaura_cache".
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def digest(self, page: Page) -> tuple:
+        """
+        Renders the page components and hashes the compile inputs.
+
+        Args:
+            page (Page): The page to address.
+
+        Returns:
+            tuple: The hex digest and the rendered trees, so a miss compiles without rendering again.
+        """
+        digest = hashlib.sha256(f"{version}\0{sorted(page.attributes.items()) if page.attributes else ''}\0".encode())
+        trees = []
+        for comp in page.children:
+            tree = comp.render()
+            trees.append(tree)
+            digest.update(f"{comp.id}\0{component_source(type(comp))}\0".encode())
+            write_tree(tree, digest)
+        return digest.hexdigest(), trees
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.html")
+
+    def get(self, digest: str):
+        """
+        Returns the compiled page stored under digest, None on a miss.
+        """
+        try:
+            with open(self.path(digest)) as file:
+                html = file.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return html
+
+    def put(self, digest: str, html: str) -> None:
+        """
+        Stores a compiled page under its digest, written to a temporary file first
+        so an interrupted build never leaves a truncated entry.
+        """
+        path = self.path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            file.write(html)
+        os.replace(tmp_path, path)
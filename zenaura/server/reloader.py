@@ -0,0 +1,283 @@
+import os
+import sys
+import runpy
+import importlib
+import inspect
+import itertools
+from zenaura.client.component import Component
+from zenaura.client.page import Page
+
+# run name of the build script, its top level code draws ids like a project module
+BUILD_MODULE = "__zenaura_build__"
+
+
+class ModuleReloader:
+    """
+    Re-runs a build script in the current process, reloading only the changed project modules.
+
+    Project modules are the imported modules whose file lives under the project root. On every run the
+    modules whose file changed since the previous run, and every project module depending on them, are
+    dropped from sys.modules so the build script imports them again in dependency order, while zenaura,
+    flask and every other library stay imported.
+
+    Component and page ids are numbered in creation order. While the build runs every id drawn is recorded
+    under the module whose top level code is executing, a reloaded module draws the ids it drew before and
+    unchanged modules keep theirs, so the rebuilt ids are the ids of a clean build. When a reloaded module
+    draws a different number of ids, e.g. it defines a new component, the ids of every later module shift
+    in a clean build, the run then reloads every project module and numbers them again.
+
+    **Usage:**
+
+    ```python
+    reloader = ModuleReloader()
+    reloader.run("build.py")  # imports public.main and builds
+    # edit public/main.py
+    reloader.run("build.py")  # reloads public.main and its dependents only
+    ```
+
+    Attributes:
+        root (str): The project root, modules outside of it are never reloaded.
+        mtimes (dict): Module name to the modification time of its file at the last run.
+        reloaded (set): Names of the modules reloaded by the last run.
+    """
+
+    def __init__(self, root=None):
+        """
+        Initializes the reloader.
+
+        Args:
+            root (str, optional): The project root. Defaults to the current working directory.
+        """
+        self.root = os.path.abspath(root if root else os.getcwd())
+        self.mtimes = {}
+        self.reloaded = set()
+        self._counts = None
+        self._draws = {"component": {}, "page": {}}
+        self._library = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def project_modules(self) -> dict:
+        """
+        Returns the imported project modules by name.
+        """
+        modules = {}
+        for name, module in list(sys.modules.items()):
+            file = getattr(module, "__file__", None)
+            if not file or name in ("__main__", "__mp_main__"):  # the running script, aliased by multiprocessing
+                continue
+            file = os.path.abspath(file)
+            if not file.startswith(self.root + os.sep) or file.startswith(self._library + os.sep):
+                continue
+            if "site-packages" not in file and "dist-packages" not in file:  # a virtualenv in the project
+                modules[name] = module
+        return modules
+
+    def changed(self, modules: dict) -> set:
+        """
+        Returns the names of the modules whose file changed since the last run.
+        """
+        changed = set()
+        for name, module in modules.items():
+            try:
+                mtime = os.stat(module.__file__).st_mtime_ns
+            except OSError:
+                changed.add(name)
+                continue
+            if self.mtimes.get(name, mtime) != mtime:
+                changed.add(name)
+        return changed
+
+    @staticmethod
+    def dependencies(module) -> set:
+        """
+        Returns the names of the modules a module uses: imported modules, and the
+        modules defining the classes, functions and instances it imported.
+        """
+        names = set()
+        for value in vars(module).values():
+            if inspect.ismodule(value):
+                names.add(value.__name__)
+                continue
+            names.add(getattr(value, "__module__", None))
+            names.add(type(value).__module__)
+        names.discard(module.__name__)
+        return names
+
+    def dependents(self, modules: dict, names: set) -> set:
+        """
+        Returns names and the project modules depending on them, transitively.
+        """
+        graph = {name: self.dependencies(module) for name, module in modules.items()}
+        stale = set(names)
+        grew = True
+        while grew:
+            grew = False
+            for name, deps in graph.items():
+                if name not in stale and deps & stale:
+                    stale.add(name)
+                    grew = True
+        return stale
+
+    @staticmethod
+    def evict(modules: dict, names: set) -> None:
+        """
+        Drops the modules from sys.modules and resets the instance count of every project component,
+        reloaded modules instantiate components again, two instances within one build still raise.
+        """
+        for name, module in modules.items():
+            for value in vars(module).values():
+                if inspect.isclass(value) and issubclass(value, Component) and value.__module__ == name:
+                    Component._track_instances.pop(value.__name__, None)
+        for name in names:
+            sys.modules.pop(name, None)
+
+    def run(self, script="build.py") -> dict:
+        """
+        Reloads the changed project modules and runs the build script in this process.
+
+        Args:
+            script (str, optional): Path of the build script, relative to the project root. Defaults to "build.py".
+
+        Returns:
+            dict: The globals of the executed script.
+        """
+        modules = self.project_modules()
+        first = self._counts is None
+        if first:
+            self._counts = (next(Component._component_count), next(Page._page_count), dict(Component._track_instances))
+        stale = self.dependents(modules, self.changed(modules)) & set(modules)
+        result, counters = self.execute(script, modules, stale, replay=not first)
+        if not first and not all(counter.matches(self.reloaded | {BUILD_MODULE}) for counter in counters):
+            # a clean build numbers every later module differently, number the whole project again
+            modules = self.project_modules()
+            result, counters = self.execute(script, modules, set(modules), replay=False)
+        self.finish(counters)
+
+        self.mtimes = {}
+        for name, module in self.project_modules().items():
+            try:
+                self.mtimes[name] = os.stat(module.__file__).st_mtime_ns
+            except OSError:
+                pass
+        return result
+
+    def execute(self, script: str, modules: dict, stale: set, replay: bool) -> tuple:
+        """
+        Evicts the stale modules and runs the build script with recording id counters.
+
+        Args:
+            script (str): Path of the build script, relative to the project root.
+            modules (dict): The imported project modules.
+            stale (set): Names of the modules to reload.
+            replay (bool): Whether reloaded modules draw the ids they drew before, a recording run numbers them again.
+
+        Returns:
+            tuple: The globals of the executed script, and the component and page counters of the run.
+        """
+        self.reloaded = stale
+        components, pages, instances = self._counts
+        Component._track_instances.clear()
+        Component._track_instances.update(instances)
+        self.evict(modules, stale)
+        project = set(modules) | {BUILD_MODULE}
+        counters = (
+            RecordingCount(components, self._draws["component"], project, replay),
+            RecordingCount(pages, self._draws["page"], project, replay),
+        )
+        Component._component_count, Page._page_count = counters
+
+        importlib.invalidate_caches()
+        # like `python build.py`, the project root is importable
+        added = self.root not in sys.path
+        if added:
+            sys.path.insert(0, self.root)
+        try:
+            result = runpy.run_path(os.path.join(self.root, script), run_name=BUILD_MODULE)
+        except BaseException:
+            self.finish(counters)
+            raise
+        finally:
+            if added:
+                sys.path.remove(self.root)
+        return result, counters
+
+    def finish(self, counters: tuple) -> None:
+        """
+        Puts plain counters back, continuing after every id drawn so far.
+        """
+        component, page = counters
+        Component._component_count = itertools.count(component.end())
+        Page._page_count = itertools.count(page.end())
+
+
+def executing_module() -> str:
+    """
+    Returns the name of the module whose top level code is executing, the innermost one on the stack.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == "<module>":
+            return frame.f_globals.get("__name__")
+        frame = frame.f_back
+    return None
+
+
+class RecordingCount:
+    """
+    Stands in for itertools.count while the build runs, every value drawn is recorded under
+    the executing module and the number of values that module drew before it in the run.
+
+    A recording run draws fresh values, skipping the values held by the modules it does not
+    execute again, e.g. library modules first imported by the project. A replay run gives a
+    module the values it drew in the previous runs, in the same order.
+    """
+
+    def __init__(self, start: int, draws: dict, project: set, replay: bool):
+        """
+        Args:
+            start (int): The first value of a clean build.
+            draws (dict): (module, ordinal) to value, updated in place.
+            project (set): Names of the project modules, recording runs number them again.
+            replay (bool): Whether to replay the recorded values.
+        """
+        self.draws = draws
+        self.replay = replay
+        self.drawn = {}
+        self.missed = False
+        if not replay:
+            for key in [key for key in draws if key[0] in project]:
+                del draws[key]
+        self.recorded = {}
+        for module, _ in draws:
+            self.recorded[module] = self.recorded.get(module, 0) + 1
+        held = set(draws.values())
+        self.fresh = (value for value in itertools.count(max(held, default=start - 1) + 1 if replay else start) if value not in held)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        module = executing_module()
+        ordinal = self.drawn.get(module, 0)
+        self.drawn[module] = ordinal + 1
+        if self.replay:
+            value = self.draws.get((module, ordinal))
+            if value is not None:
+                return value
+            self.missed = True
+        value = next(self.fresh)
+        self.draws.setdefault((module, ordinal), value)
+        return value
+
+    def matches(self, executed: set) -> bool:
+        """
+        Whether every executed module drew as many values as recorded, so the numbering is the one of a clean build.
+        """
+        if self.missed:
+            return False
+        return all(self.drawn.get(module, 0) == self.recorded.get(module, 0) for module in executed)
+
+    def end(self) -> int:
+        """
+        Returns the value after every value drawn so far.
+        """
+        return max(self.draws.values(), default=next(self.fresh) - 1) + 1
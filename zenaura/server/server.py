@@ -1,7 +1,13 @@
 import io
+import os
+import json
+import multiprocessing
 import subprocess
 import time
 from threading import Thread, Event
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
 import contextlib
 from zenaura.client.page import Page 
 from zenaura.client.hydrator import HydratorCompilerAdapter
@@ -13,6 +19,10 @@ from watchdog.events import FileSystemEventHandler
 from zenaura.client.compiler.attribute import AttributeProccessor
 from zenaura.client.tags.attribute import Attribute
 from zenaura.client.layout import Layout
+from zenaura.client.algorithm.batch import PATCH_SCRIPT
+from .reloader import ModuleReloader
+from .watcher import ChangeCoalescer, DEFAULT_IGNORE
+from .broadcaster import RefreshBroadcaster
 from zenaura import zenaura_logger
 
 compiler_adapter = HydratorCompilerAdapter()
@@ -35,6 +45,24 @@ def template(content, meta_description=None, title=None, icon=None, pydide="http
     Returns:
         str: The complete HTML code as a string.
   """
+  head, tail = template_parts(meta_description, title, icon, pydide, scripts)
+  return f"{head}{content}{tail}"
+
+def template_parts(meta_description=None, title=None, icon=None, pydide="https://pyscript.net/releases/2024.1.1/core.js", scripts=None):
+  """
+    This function generates the HTML structure of a Zenaura page around its content,
+    so the content can be streamed between the two parts.
+
+    Args:
+        meta_description (str, optional): A brief description of the page, used by search engines. Defaults to None.
+        title (str, optional): The title of the page, displayed in the browser tab. Defaults to None.
+        icon (str, optional): The URL of the favicon, a small icon associated with the page. Defaults to None.
+        pydide (str, optional): The URL of the PyScript library, used for running Python code in the browser. Defaults to "https://pyscript.net/releases/2024.1.1/core.js".
+        scripts (list, optional): An optional list of additional JavaScript scripts, CSS links to include in the page. Defaults to None.
+
+    Returns:
+        tuple: The HTML code before and after the page content.
+  """
   if scripts:
     s = io.StringIO()
     for script in scripts:
@@ -42,7 +70,7 @@ def template(content, meta_description=None, title=None, icon=None, pydide="http
         s.write("\n")
     scripts = s.getvalue()
       
-  return f"""
+  head = f"""
 
 <html lang="en">
   <head>
@@ -57,6 +85,7 @@ def template(content, meta_description=None, title=None, icon=None, pydide="http
       content="{meta_description}"
     />
     <script type="module" src="{pydide}"></script>
+    <script>{PATCH_SCRIPT}</script>
     {scripts if scripts else ""}
  
 	<script type="py" src="./public/main.py" config="./public/config.json"></script>
@@ -68,13 +97,31 @@ def template(content, meta_description=None, title=None, icon=None, pydide="http
   </head>
   <body>
     <div id="root">
-        {content}
+        """
+  tail = """
     </div>
   
   </body>
 
 </html>
 """
+  return head, tail
+
+def compile_timed(page: Page, trees=None) -> tuple:
+    """
+    Compiles a page and measures it, module level so process pool workers can run it.
+
+    Args:
+        page (Page): The page to compile.
+        trees (list, optional): The already rendered trees of the page components. Defaults to None.
+
+    Returns:
+        tuple: The compiled html and the compile time in seconds.
+    """
+    start = time.perf_counter()
+    html = compiler_adapter.hyd_comp_compile_page(page, trees)
+    return html, time.perf_counter() - start
+
 class ZenauraServer:
     """
     A class for server-side rendering of Zenaura applications.
@@ -84,8 +131,16 @@ class ZenauraServer:
     * Hydrating Zenaura pages for server-side rendering.
     * Hydrating Zenaura apps for server-side rendering.
     * Generating the HTML structure of a Zenaura page.
+
+    Attributes:
+        build_timings (dict): Route path to compile time in seconds of every page of the last build.
+        build_updates (dict): Page id to compiled html of the pages the last cached hydrate_app compiled,
+            None when the last build can't tell which pages changed.
     """
 
+    build_timings = {}
+    build_updates = None
+
     @staticmethod
     def hydrate_page(page: Page, title="zenaura", meta_description="this app created with zenaura", icon="./public/favicon.ico", pydide="https://pyscript.net/releases/2024.1.1/core.js") -> str:
         """
@@ -107,12 +162,50 @@ class ZenauraServer:
         return template(compiler_adapter.hyd_comp_compile_page(page), meta_description, title, icon, pydide)
 
     @staticmethod
-    def hydrate_app(app: App, title="zenaura", meta_description="this app created with zenaura", icon="./public/favicon.ico", pydide="https://pyscript.net/releases/2024.1.1/core.js", scripts=None) -> None:
+    def stream_page(page: Page, title="zenaura", meta_description="this app created with zenaura", icon="./public/favicon.ico", pydide="https://pyscript.net/releases/2024.1.1/core.js", scripts=None):
+        """
+        Streams a Zenaura page for server-side rendering.
+
+        Same output as hydrate_page, but the HTML is yielded in chunks as the components
+        are compiled, so large pages never live in memory as a single string.
+
+        Args:
+            page (Page): The Zenaura page to be streamed.
+            title (str, optional): The title of the page. Defaults to "zenaura".
+            meta_description (str, optional): The meta description of the page. Defaults to "this app created with zenaura".
+            icon (str, optional): The URL of the favicon. Defaults to "./public/favicon.ico".
+            pydide (str, optional): The URL of the PyScript library. Defaults to "https://pyscript.net/releases/2024.1.1/core.js".
+            scripts (list, optional): An optional list of additional JavaScript scripts and CSS links to include in the page. Defaults to None.
+
+        Yields:
+            str: Consecutive pieces of the page HTML.
+
+        Examples:
+            ```python
+            >>> from flask import Response, stream_with_context
+            >>> @app.route("/")
+            ... def index():
+            ...     return Response(stream_with_context(ZenauraServer.stream_page(page)), mimetype="text/html")
+            >>> with open("./public/index.html", "w") as file:
+            ...     file.writelines(ZenauraServer.stream_page(page))
+            ```
+        """
+        head, tail = template_parts(meta_description, title, icon, pydide, scripts)
+        yield head
+        yield from compiler_adapter.hyd_comp_iter_page(page)
+        yield tail
+
+    @staticmethod
+    def hydrate_app(app: App, title="zenaura", meta_description="this app created with zenaura", icon="./public/favicon.ico", pydide="https://pyscript.net/releases/2024.1.1/core.js", scripts=None, lazy_routes=False, fragments_dir="./public/fragments", parallel=False, workers=None, cache=None) -> None:
         """
         Hydrates a Zenaura app for server-side rendering.
 
         This method renders all pages in the app, sets the page with path "/" to visible, and the rest to hidden. It then compiles the index.html file for server-side rendering.
 
+        With lazy_routes only the initial page is inlined in index.html, every other page is written pre-compiled
+        to its own fragment file in fragments_dir, and a manifest mapping route paths to fragment files is written
+        next to them and inlined in the page head. App.navigate fetches and injects a fragment the first time its route is visited.
+
         Args:
             app (App): The Zenaura app to be hydrated.
             title (str, optional): The title of the page. Defaults to "zenaura".
@@ -120,12 +213,18 @@ class ZenauraServer:
             icon (str, optional): The URL of the favicon. Defaults to "./public/favicon.ico".
             pydide (str, optional): The URL of the PyScript library. Defaults to "https://pyscript.net/releases/2024.1.1/core.js".
             scripts (list, optional): An optional list of additional JavaScript scripts and CSS links to include in the page. Defaults to None.
+            lazy_routes (bool, optional): Emit pages other than the initial route as fragment files fetched on navigation. Defaults to False.
+            fragments_dir (str, optional): Directory, and relative url, of the fragment files and manifest.json. Defaults to "./public/fragments".
+            parallel (bool, optional): Compile pages across a process pool, see compile_pages. Defaults to False.
+            workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            cache (PageCache, optional): Only compile pages whose compile inputs changed since a previous build. Defaults to None.
         """
 
         pages = io.StringIO()
         
         # First page in the stack is shown
         routes = app.routes.copy()
+        manifest = {}
 
         def page_div(comps, page_id, hidden, attributes=None):
             """
@@ -142,58 +241,160 @@ class ZenauraServer:
                 return f'<div hidden{attrs if attributes else ""} data-zenaura="{page_id}">{comps}</div>'
             return f'<div{attrs if attributes else ""} data-zenaura="{page_id}">{comps}</div>'
         
-        # if / path in routes it's set to shown
-        if "/" in routes:
-            page, _, _, ssr = routes.pop("/")
-            pages.write(
-                page_div(
-                    compiler_adapter.hyd_comp_compile_page(page),
-                    page.id,
-                    False,
-                    page.attributes
-                )
-            )
-        else: # first route , in keys stack will be shown, rest hidden
-            keys = list(routes.keys())
-            page, _, _, ssr = routes.pop(keys[0])
-            pages.write(
-                page_div(
-                    compiler_adapter.hyd_comp_compile_page(page),
-                    page.id,
-                    False,
-                    page.attributes
-
-                )
-            )
-
-
-        # Render rest of the pages hidden
-        while routes:
-            _ , (page, _, _, ssr) = routes.popitem()
-            if ssr:  # Ignore server side rendered routes and thier pages.
+        # / path, or the first route in stack, is shown, the rest hidden
+        ordered = ZenauraServer.route_order(routes)
+        compiled = ZenauraServer.compile_pages({path: page for path, page in ordered}, parallel, workers, cache)
+        # without a cache every page is compiled, changed or not
+        ZenauraServer.build_updates = None
+        if cache is not None:
+            ZenauraServer.build_updates = {page.id: compiled[path] for path, page in ordered if path in ZenauraServer.build_timings}
+
+        for idx, (path, page) in enumerate(ordered):
+            html = page_div(compiled[path], page.id, idx > 0, page.attributes)
+            if idx and lazy_routes:
+                manifest[path] = ZenauraServer.write_fragment(html, page.id, fragments_dir)
                 continue
-            # Pages other than / or first route in stack are set to hidden
-            pages.write(
-                page_div(
-                    compiler_adapter.hyd_comp_compile_page(page),
-                    page.id,
-                    True,
-                    page.attributes
-
-                )
-            )
+            pages.write(html)
 
         pages = pages.getvalue()
 
+        if lazy_routes:
+            scripts = list(scripts or []) + [ZenauraServer.write_manifest(app, manifest, fragments_dir)]
+
         # Overwrite in public dir
         with open("./public/index.html", "w") as file:
             file.write(template(pages, meta_description, title, icon, pydide, scripts))
 
         return template(pages, meta_description, title, icon, pydide, scripts)
 
+    @staticmethod
+    def route_order(routes) -> list:
+        """
+        Orders the routes as they are written to index.html: the / path, or the first route
+        in stack when there is none, then the rest from the last added, server side rendered
+        routes other than the first are skipped.
+
+        Args:
+            routes (dict): Route path to [page, title, middleware, ssr].
+
+        Returns:
+            list: (path, page) pairs, the first one is shown.
+        """
+        routes = routes.copy()
+        first = "/" if "/" in routes else next(iter(routes))
+        ordered = [(first, routes.pop(first)[0])]
+        while routes:
+            path, (page, _, _, ssr) = routes.popitem()
+            if ssr:  # Ignore server side rendered routes and thier pages.
+                continue
+            ordered.append((path, page))
+        return ordered
+
+    @staticmethod
+    def compile_pages(pages: dict, parallel=False, workers=None, cache=None) -> dict:
+        """
+        Compiles pages, serially or across a process pool.
+
+        In parallel mode pages are pickled to the worker processes, compiled independently and
+        assembled back in the order of pages, so the output is the same as a serial build and the
+        build takes about as long as its slowest page. When a page can't be sent to a worker
+        (e.g. a component class defined in a function) the build falls back to compiling serially.
+
+        Workers are always forked: component ids are derived from the order component classes
+        were defined in the building process, a spawned worker re-imports the app and can number
+        them differently. Where fork is unavailable, e.g. on Windows,
+        pages are compiled serially.
+
+        With a PageCache only pages whose compile inputs changed are compiled, the others are
+        read back from the cache.
+
+        The compile time of every compiled page is logged and kept in ZenauraServer.build_timings.
+
+        Args:
+            pages (dict): Route path to page.
+            parallel (bool, optional): Compile across a ProcessPoolExecutor. Defaults to False.
+            workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            cache (PageCache, optional): On-disk cache of compiled pages. Defaults to None.
+
+        Returns:
+            dict: Route path to compiled page html, in the order of pages.
+        """
+        cached, digests, trees = {}, {}, {}
+        if cache is not None:
+            for path, page in pages.items():
+                digests[path], trees[path] = cache.digest(page)
+                html = cache.get(digests[path])
+                if html is not None:
+                    cached[path] = html
+        pending = {path: page for path, page in pages.items() if path not in cached}
+
+        results = None
+        if parallel and len(pending) > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            zenaura_logger.info("fork is unavailable, compiling serially")
+        elif parallel and len(pending) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as executor:
+                    results = dict(zip(pending, executor.map(compile_timed, pending.values(), [trees.get(path) for path in pending])))
+            # pages that can't be sent to a worker, pickle raises AttributeError for local objects
+            # and TypeError for e.g. locks, other errors are raised by the serial compile as well
+            except (BrokenProcessPool, PicklingError, AttributeError, TypeError) as e:
+                zenaura_logger.warning(f"Parallel build failed, compiling serially: {e}")
+        if results is None:
+            results = {path: compile_timed(page, trees.get(path)) for path, page in pending.items()}
+
+        ZenauraServer.build_timings = {}
+        for path, (html, seconds) in results.items():
+            if cache is not None:
+                cache.put(digests[path], html)
+            ZenauraServer.build_timings[path] = seconds
+            zenaura_logger.info(f"Compiled {path} in {seconds * 1000:.1f}ms")
+        if cached:
+            zenaura_logger.info(f"{len(cached)} unchanged pages read from cache")
+        return {path: cached[path] if path in cached else results[path][0] for path in pages}
 
     @staticmethod
-    def hydrate_app_layout(layout: Layout, title="zenaura", meta_description="this app created with zenaura", icon="./public/favicon.ico", pydide="https://pyscript.net/releases/2024.1.1/core.js", scripts=None) -> None:
+    def write_fragment(html: str, page_id: str, fragments_dir="./public/fragments") -> dict:
+        """
+        Writes a pre-compiled hidden page to its fragment file.
+
+        Args:
+            html (str): The compiled page div.
+            page_id (str): The id of the page, names the fragment file.
+            fragments_dir (str, optional): Directory, and relative url, of the fragment files. Defaults to "./public/fragments".
+
+        Returns:
+            dict: The manifest entry of the page, {"page": page id, "file": fragment url}.
+        """
+        os.makedirs(fragments_dir, exist_ok=True)
+        file_path = f"{fragments_dir}/{page_id}.html"
+        with open(file_path, "w") as file:
+            file.write(html)
+        return {"page": page_id, "file": file_path}
+
+    @staticmethod
+    def write_manifest(app: App, manifest: dict, fragments_dir="./public/fragments") -> str:
+        """
+        Writes manifest.json of the lazy routes in route order.
+
+        Args:
+            app (App): The hydrated app.
+            manifest (dict): Route path to manifest entry of every lazy route.
+            fragments_dir (str, optional): Directory of the fragment files. Defaults to "./public/fragments".
+
+        Returns:
+            str: The manifest script tag App reads on navigation.
+        """
+        manifest = {path: manifest[path] for path in app.routes if path in manifest}
+        os.makedirs(fragments_dir, exist_ok=True)
+        with open(f"{fragments_dir}/manifest.json", "w") as file:
+            json.dump(manifest, file, indent=2)
+        # "</" would close the script tag early
+        inline = json.dumps(manifest).replace("</", "<\\/")
+        return f'<script type="application/json" id="zenaura-routes">{inline}</script>'
+
+
+    @staticmethod
+    def hydrate_app_layout(layout: Layout, title="zenaura", meta_description="this app created with zenaura", icon="./public/favicon.ico", pydide="https://pyscript.net/releases/2024.1.1/core.js", scripts=None, parallel=False, workers=None, cache=None) -> None:
         """
         Hydrates a Zenaura layout for server-side rendering.
 
@@ -206,6 +407,9 @@ class ZenauraServer:
             icon (str, optional): The URL of the favicon. Defaults to "./public/favicon.ico".
             pydide (str, optional): The URL of the PyScript library. Defaults to "https://pyscript.net/releases/2024.1.1/core.js".
             scripts (list, optional): An optional list of additional JavaScript scripts and CSS links to include in the page. Defaults to None.
+            parallel (bool, optional): Compile pages across a process pool, see compile_pages. Defaults to False.
+            workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            cache (PageCache, optional): Only compile pages whose compile inputs changed since a previous build. Defaults to None.
         """
 
         pages = io.StringIO()
@@ -232,46 +436,14 @@ class ZenauraServer:
                 return f'<div hidden{attrs if attributes else ""} data-zenaura="{page_id}">{comps}</div>'
             return f'<div{attrs if attributes else ""} data-zenaura="{page_id}">{comps}</div>'
         
-        # if / path in routes it's set to shown
-        if "/" in routes:
-            page, _, _, ssr = routes.pop("/")
-            pages.write(
-                page_div(
-                    compiler_adapter.hyd_comp_compile_page(page),
-                    page.id,
-                    False,
-                    page.attributes
-                )
-            )
-        else: # first route , in keys stack will be shown, rest hidden
-            keys = list(routes.keys())
-            page, _, _, ssr = routes.pop(keys[0])
-            pages.write(
-                page_div(
-                    compiler_adapter.hyd_comp_compile_page(page),
-                    page.id,
-                    False,
-                    page.attributes
-
-                )
-            )
-
-
-        # Render rest of the pages hidden
-        while routes:
-            _ , (page, _, _, ssr) = routes.popitem()
-            if ssr:  # Ignore server side rendered routes and thier pages.
-                continue
-            # Pages other than / or first route in stack are set to hidden
-            pages.write(
-                page_div(
-                    compiler_adapter.hyd_comp_compile_page(page),
-                    page.id,
-                    True,
-                    page.attributes
+        # / path, or the first route in stack, is shown, the rest hidden
+        ordered = ZenauraServer.route_order(routes)
+        compiled = ZenauraServer.compile_pages({path: page for path, page in ordered}, parallel, workers, cache)
+        # top and bottom components are not cached, a change to them is not tracked
+        ZenauraServer.build_updates = None
 
-                )
-            )
+        for idx, (path, page) in enumerate(ordered):
+            pages.write(page_div(compiled[path], page.id, idx > 0, page.attributes))
 
         # add bottom level components
         for comp in layout.bottom:
@@ -317,22 +489,40 @@ class DevServer:
     * Running a file system observer to detect changes in the application files.
     """
 
-    def __init__(self, app, debug=True, port=5000):
+    def __init__(self, app, debug=True, port=5000, in_process=True, build_script="build.py", quiet_window=0.2, ignore=DEFAULT_IGNORE, heartbeat=25, fragment_updates=False):
         """
         Initializes the DevServer class.
 
         Args:
             debug (bool, optional): Whether to run the server in debug mode. Defaults to True.
             port (int, optional): The port on which to run the server. Defaults to 5000.
+            in_process (bool, optional): Rebuild in the server process, reloading only the changed modules,
+                instead of spawning `python build.py`. Defaults to True.
+            build_script (str, optional): The build script. Defaults to "build.py".
+            quiet_window (float, optional): Seconds without file events before a burst of changes triggers
+                a single rebuild. Defaults to 0.2.
+            ignore (tuple, optional): Glob patterns of the paths that never trigger a rebuild, e.g. build outputs.
+                Defaults to DEFAULT_IGNORE.
+            heartbeat (float, optional): Seconds between websocket pings, browsers missing a pong are disconnected.
+                Defaults to 25.
+            fragment_updates (bool, optional): When a python file changes and the build used a PageCache, send the
+                changed pages to the browsers instead of reloading them. Defaults to False.
         """
 
         self.debug = debug
         self.port = port
         self.app = app
+        self.in_process = in_process
+        self.build_script = build_script
+        self.reloader = ModuleReloader()
+        self.changes = ChangeCoalescer(self.on_changes, quiet_window, ignore)
+        self.fragment_updates = fragment_updates
         self.sock = Sock()
-        self.ws_client_list = []
+        self.broadcaster = RefreshBroadcaster()
         self.shutdown_event = Event()
         self.observer = PausingObserver()
+        # ping frames are answered by the browser itself, they never reach ws.onmessage
+        self.app.config.setdefault("SOCK_SERVER_OPTIONS", {"ping_interval": heartbeat})
         self.sock.init_app(self.app)
 
         self.setup_websocket()
@@ -345,35 +535,57 @@ class DevServer:
         @self.sock.route("/refresh")
         def refresh(ws):
             """
-            WebSocket handler for sending refresh signals to clients.
+            WebSocket handler for sending refresh signals to clients, the client is registered
+            until it disconnects or misses a heartbeat.
 
             Args:
                 ws (WebSocket): The WebSocket connection.
             """
 
-            self.ws_client_list.append(ws)
-            while not self.shutdown_event.is_set():
-                try:
-                    ws.receive()
-                    ws.sleep(1)
-                    ws.send("refresh")
-                except Exception as e:
-                    print(f"Error in WebSocket connection: {e}")
-                    break
+            self.broadcaster.register(ws)
+            try:
+                while not self.shutdown_event.is_set():
+                    ws.receive(timeout=1)
+            except Exception as e:
+                zenaura_logger.info(f"WebSocket connection closed: {e}")
+            finally:
+                self.broadcaster.unregister(ws)
+
+    @property
+    def ws_client_list(self) -> list:
+        """
+        The connected websockets.
+        """
+        return self.broadcaster.clients()
 
     def send_refresh_signal(self):
         """
-        Sends a refresh signal to all connected clients.
+        Sends a refresh signal to all connected clients, concurrently and without waiting for slow clients.
+
+        Returns:
+            list: The futures of the sends.
         """
 
-        zenaura_logger.info("Sending refresh signal...")
-        clients = self.ws_client_list.copy()
-        for client in clients:
-            try:
-                client.send("refresh")
-            except Exception as e:
-                print(f"Error sending refresh: {e}")
-                self.ws_client_list.remove(client)
+        zenaura_logger.info(f"Sending refresh signal to {len(self.broadcaster)} clients...")
+        return self.broadcaster.refresh()
+
+    def notify(self, paths) -> list:
+        """
+        Sends the pages changed by the last build when fragment updates are enabled and only
+        python files changed, a refresh signal otherwise (e.g. css, config or a layout build).
+
+        Args:
+            paths (set): The paths changed since the previous build.
+
+        Returns:
+            list: The futures of the sends.
+        """
+
+        updates = ZenauraServer.build_updates if self.fragment_updates else None
+        if not updates or not all(path.endswith(".py") for path in paths):
+            return self.send_refresh_signal()
+        zenaura_logger.info(f"Sending {len(updates)} updated pages...")
+        return self.broadcaster.fragment(updates)
 
     def get_change_handler(self):
         """
@@ -405,24 +617,37 @@ class DevServer:
 
             def on_any_event(self, event):
                 """
-                Handles file system events.
+                Handles file system events, events are coalesced so a burst of
+                changes rebuilds once.
 
                 Args:
                     event (FileSystemEvent): The file system event.
                 """
 
-                try:
-                    zenaura_logger.info(f"File {event.src_path} has changed.")
-                    zenaura_logger.info("Changes are live...")
-                    DEVSERVER.hydrate_and_notify()
-                    zenaura_logger.info("Reloading browser...")
-                    DEVSERVER.send_refresh_signal()
-                    zenaura_logger.info("Browser reloaded.")
-                except Exception as e:
-                    zenaura_logger.info(f"Error in ChangeHandler: {e}")
+                if event.is_directory:
+                    return
+                DEVSERVER.changes.add(event.src_path)
 
         return ChangeHandler
 
+    def on_changes(self, paths) -> None:
+        """
+        Rebuilds and refreshes the browsers once for a burst of file changes.
+
+        Args:
+            paths (set): The paths changed during the burst.
+        """
+
+        try:
+            zenaura_logger.info(f"Files {sorted(paths)} have changed.")
+            zenaura_logger.info("Changes are live...")
+            self.hydrate_and_notify()
+            zenaura_logger.info("Reloading browser...")
+            self.notify(paths)
+            zenaura_logger.info(f"Browser reloaded. {self.changes.stats()}")
+        except Exception as e:
+            zenaura_logger.info(f"Error in ChangeHandler: {e}")
+
     def start_server(self):
         """
         Starts the Flask server.
@@ -442,14 +667,31 @@ class DevServer:
             self.observer.pause()
             zenaura_logger.info("Hydrating...")
             zenaura_logger.info("Pausing the observer...")
-            process = subprocess.Popen("python build.py", shell=True)
-            process.communicate()
+            self.rebuild()
             zenaura_logger.info("Hydrated done...")
 
         finally:
             zenaura_logger.info("Running the observer...")
             self.observer.resume()
 
+    def rebuild(self) -> None:
+        """
+        Runs the build script, in process when enabled, falling back to a new
+        python process when the in process build fails.
+        """
+
+        ZenauraServer.build_updates = None
+        if self.in_process:
+            try:
+                start = time.perf_counter()
+                self.reloader.run(self.build_script)
+                zenaura_logger.info(f"Rebuilt in process in {(time.perf_counter() - start) * 1000:.0f}ms, reloaded {sorted(self.reloader.reloaded)}")
+                return
+            except Exception as e:
+                zenaura_logger.info(f"In process rebuild failed, running {self.build_script}: {e}")
+        process = subprocess.Popen(f"python {self.build_script}", shell=True)
+        process.communicate()
+
     def run(self):
         """
         Runs the development server.
@@ -472,6 +714,8 @@ class DevServer:
         except KeyboardInterrupt:
             zenaura_logger.info("KeyboardInterrupt received, stopping...")
         finally:
+            self.changes.cancel()
+            self.broadcaster.shutdown()
             # Faster Shutdown of Observer
             self.observer.event_queue.queue.clear()
             self.observer.stop()  
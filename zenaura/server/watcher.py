@@ -0,0 +1,129 @@
+import os
+from fnmatch import fnmatch
+from threading import Lock, Timer
+
+# files written by the build itself, or by python and editors, never trigger a rebuild
+DEFAULT_IGNORE = (
+    "*/index.html",
+    "*/fragments/*",
+    "*/__pycache__/*",
+    "*.pyc",
+    "*.tmp",
+    "*.swp",
+    "*~",
+    "*/.zenaura_cache/*",
+    "*.db",
+    "*.db-journal",
+)
+
+
+class ChangeCoalescer:
+    """
+    Debounces file system events into one callback per burst.
+
+    An editor save fires several events (truncate, write, rename, chmod...), each event restarts
+    a quiet window and the callback runs once the window passes without events, with every path
+    changed during the burst. Paths matching an ignore glob, such as the build outputs, are dropped.
+
+    **Usage:**
+
+    ```python
+    coalescer = ChangeCoalescer(lambda paths: rebuild(), quiet_window=0.2)
+    coalescer.add("public/main.py")
+    coalescer.add("public/main.py")  # one rebuild, 0.2s after the last event
+    ```
+
+    Attributes:
+        quiet_window (float): Seconds without events before the callback runs.
+        ignore (tuple): Glob patterns of the ignored paths.
+        events (int): Events received, ignored ones excluded.
+        ignored (int): Events dropped by the ignore globs.
+        coalesced (int): Events folded into a callback already pending.
+        flushes (int): Callbacks run, one per burst.
+    """
+
+    def __init__(self, callback, quiet_window=0.2, ignore=DEFAULT_IGNORE):
+        """
+        Initializes the coalescer.
+
+        Args:
+            callback (callable): Called with the set of changed paths once per burst.
+            quiet_window (float, optional): Seconds without events before the callback runs. Defaults to 0.2.
+            ignore (tuple, optional): Glob patterns of the paths to ignore. Defaults to DEFAULT_IGNORE.
+        """
+        self.callback = callback
+        self.quiet_window = quiet_window
+        self.ignore = tuple(ignore)
+        self.events = 0
+        self.ignored = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self._pending = set()
+        self._timer = None
+        self._lock = Lock()
+
+    def is_ignored(self, path: str) -> bool:
+        """
+        Whether the path, or its file name, matches one of the ignore globs.
+        """
+        path = path.replace(os.sep, "/")
+        name = path.rsplit("/", 1)[-1]
+        return any(fnmatch(path, pattern) or fnmatch(name, pattern) for pattern in self.ignore)
+
+    def add(self, path: str) -> bool:
+        """
+        Records a changed path and restarts the quiet window.
+
+        Args:
+            path (str): The changed path.
+
+        Returns:
+            bool: False when the path is ignored.
+        """
+        with self._lock:
+            if self.is_ignored(path):
+                self.ignored += 1
+                return False
+            self.events += 1
+            self._pending.add(path)
+            if self._timer is not None:
+                self._timer.cancel()
+                self.coalesced += 1
+            self._timer = Timer(self.quiet_window, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+            return True
+
+    def flush(self) -> set:
+        """
+        Runs the callback with the pending paths now, nothing runs when no path is pending.
+
+        Returns:
+            set: The paths passed to the callback.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            paths, self._pending = self._pending, set()
+            if not paths:
+                return paths
+            self.flushes += 1
+        self.callback(paths)
+        return paths
+
+    def cancel(self) -> None:
+        """
+        Drops the pending paths without running the callback.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = set()
+
+    def stats(self) -> dict:
+        """
+        Returns the counters.
+        """
+        return {"events": self.events, "ignored": self.ignored, "coalesced": self.coalesced, "flushes": self.flushes}
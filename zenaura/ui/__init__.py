@@ -35,3 +35,4 @@ from .tags import (
     # Miscellaneous content 
     noscript, del_, ins 
 ) 
+from .memo import memo
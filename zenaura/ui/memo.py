@@ -0,0 +1,57 @@
+from functools import lru_cache, wraps
+from zenaura.client.tags import Node
+
+
+def clone(node):
+    """
+    Copies a Node subtree, the copy carries the cached structural hashes so it is
+    not hashed again, and gets its own path, level and parent when placed in a tree.
+    """
+    if not isinstance(node, Node):
+        return node
+    copy = Node(node.name, [clone(child) for child in node.children], list(node.attributes), node.text, node.key_)
+    copy.is_text_node = node.is_text_node
+    copy._subtree_hash = node.subtree_hash
+    return copy
+
+
+def memo(func=None, *, maxsize=128):
+    """
+    Caches the Node subtree returned by a stateless ui helper by its arguments.
+
+    Calling the helper again with the same arguments returns a copy of the cached Node,
+    built without calling the helper nor hashing it again, the diff skips it by subtree
+    hash and the compiler serves it from the fragment cache. Every call gets its own copy,
+    so the same subtree can be placed under several parents and its paths stay correct.
+    Calls with unhashable arguments are not cached.
+
+    Args:
+        func (callable): The helper to memoize.
+        maxsize (int, optional): Maximum number of cached subtrees. Defaults to 128.
+
+    Returns:
+        callable: The memoized helper, with cache_info() and cache_clear().
+
+    Usage:
+        @memo
+        def Sidebar(links):
+            return nav(*[a(label, href=href) for label, href in links])
+
+        Sidebar((("Home", "/"), ("Docs", "/docs")))
+    """
+    if func is None:
+        return lambda f: memo(f, maxsize=maxsize)
+
+    cached = lru_cache(maxsize=maxsize)(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            hash((args, tuple(kwargs.items())))
+        except TypeError:
+            return func(*args, **kwargs)
+        return clone(cached(*args, **kwargs))
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
@@ -30,7 +30,7 @@ p-6 mx-auto flex flex-col gap-4
 py-10 md:py-14 lg:py-20 max-w-screen-lg
 """
 
-def with_theme_colors_text_no_hover(class_name):
+def with_theme_colors(class_name):
     return f"""
     {class_name} 
     text-primary 
@@ -1,4 +1,5 @@
 from .common import *
+from zenaura.client.tags import Node
 
 
 def Table(data, columns, attrs={}, class_names="min-w-full bg-white shadow-md rounded-xl", td_class_names="py-3 px-4 text-left", th_class_names="py-3 px-4", tr_class_names="border-b border-light-gray dark:border-dark-page1"):
@@ -30,4 +31,48 @@ def Table(data, columns, attrs={}, class_names="min-w-full bg-white shadow-md ro
 			Builder("tbody").with_children(
 					*rows
 			).build()
-	).build()
\ No newline at end of file
+	).build()
+
+def _column_text(values):
+	"""
+	Formats a whole column to cell text, array.array and NumPy arrays are
+	converted to python scalars in bulk so cells read the same as Table.
+	"""
+	if hasattr(values, "tolist"):
+		values = values.tolist()
+	return list(map(str, values))
+
+
+def from_columns(columns, attrs={}, class_names="min-w-full bg-white shadow-md rounded-xl", td_class_names="py-3 px-4 text-left", th_class_names="py-3 px-4", tr_class_names="border-b border-light-gray dark:border-dark-page1"):
+	"""
+	Creates the same table as Table from columnar data, without the per cell Builder calls.
+	args:
+			columns - dictionary of column title to the column values, a list, array.array or NumPy array
+					e.g. {"Name": ["Mike", "Jane"], "Age": array("i", [31, 28])}, all columns have the same length
+			class_names - default class name
+			attrs table tag attributes dictionary
+	usage:
+			Table.from_columns({"Name": names, "Age": ages})
+	"""
+	cells = [_column_text(values) for values in columns.values()]
+	lengths = {len(column) for column in cells}
+	if len(lengths) > 1:
+		raise ValueError(f"columns have different lengths: {sorted(lengths)}")
+
+	names = [Node("th", children=[Node(text=str(title))], attributes=[Attribute("class", th_class_names)]) for title in columns]
+	rows = [
+		Node("tr", children=[
+			Node("td", children=[Node(text=text)], attributes=[Attribute("class", td_class_names)]) for text in row
+		], attributes=[Attribute("class", tr_class_names)])
+		for row in zip(*cells)
+	]
+
+	table_attrs = [Attribute(key, value) for key, value in attrs.items()]
+	table_attrs.append(Attribute("class", class_names))
+	return Node("table", children=[
+		Node("thead", children=[Node("tr", children=names, attributes=[Attribute("class", tr_class_names)])]),
+		Node("tbody", children=rows),
+	], attributes=table_attrs)
+
+
+Table.from_columns = from_columns
@@ -0,0 +1,219 @@
+from zenaura.client.component import Component, Reuseable
+from zenaura.client.mutator import mutates
+from zenaura.client.tags import Node
+from .tags import div, table, thead, tbody, tr, th, td
+
+
+def visible_range(count: int, row_height: int, height: int, scroll_top: float = 0, overscan: int = 5) -> tuple:
+    """
+    Computes the rows of a virtualized list that intersect the viewport.
+
+    Args:
+        count (int): Total number of rows.
+        row_height (int): Fixed height of a row in pixels.
+        height (int): Height of the scrolling viewport in pixels.
+        scroll_top (float): Current scroll offset of the viewport in pixels.
+        overscan (int): Extra rows rendered above and below the viewport.
+
+    Returns:
+        tuple: (start, stop) indices of the rows to materialize, stop is exclusive.
+
+    Usage:
+        visible_range(20000, 32, 480, scroll_top=3200)  # (95, 121)
+    """
+    # the browser clamps the offset when rows are removed, do the same
+    scroll_top = min(scroll_top, max(0, count * row_height - height))
+    first = max(0, int(scroll_top // row_height) - overscan)
+    last = min(count, int((scroll_top + height) // row_height) + 1 + overscan)
+    return first, max(first, last)
+
+
+class VirtualizedMixin:
+    """
+    Windowing shared by VirtualList and VirtualTable.
+
+    Only the rows in the viewport plus overscan are rendered, every row is keyed
+    so scrolling by a few rows produces a few add/remove patches and a single
+    attribute patch for the window offset instead of re-rendering every row.
+
+    The state holds the items and the window {"items", "start", "stop"}, it is
+    replaced copy-on-write, so scroll events that stay in the same window leave
+    the state object untouched and the update is skipped.
+    """
+
+    def init_window(self, items, row_height, height, overscan, key, id, class_):
+        self.row_height = row_height
+        self.height = height
+        self.overscan = overscan
+        self.key = key if key else (lambda item, index: index)
+        self.container_id = id
+        self.class_ = class_
+        self.scroll_top = 0
+        start, stop = visible_range(len(items), row_height, height, 0, overscan)
+        self.set_state({"items": items, "start": start, "stop": stop})
+
+    def scroll_to(self, scroll_top: float) -> dict:
+        """
+        Moves the window to the scroll offset, the state is kept when the window did not change.
+
+        Args:
+            scroll_top (float): Scroll offset of the viewport in pixels.
+
+        Returns:
+            dict: The state of the component.
+        """
+        self.scroll_top = scroll_top
+        items = self.get_state()["items"]
+        start, stop = visible_range(len(items), self.row_height, self.height, scroll_top, self.overscan)
+        return self.update_state(start=start, stop=stop)
+
+    @mutates
+    def on_scroll(self, event) -> None:
+        """
+        Scroll handler, bind it to the container id:
+            dispatcher.bind(log_viewer.container_id, "scroll", log_viewer.on_scroll)
+        """
+        self.scroll_to(event.target.scrollTop)
+
+    @mutates
+    def set_items(self, items) -> None:
+        """
+        Replaces the rows, the window is recomputed for the current scroll offset.
+        """
+        self.update_state(items=items)
+        self.scroll_to(self.scroll_top)
+
+    def should_update(self, prev_state, next_state) -> bool:
+        # unchanged state objects are skipped by the virtual dom before reaching here
+        return True
+
+    def visible_rows(self) -> list:
+        """
+        Returns the keyed row nodes of the current window.
+        """
+        state = self.get_state()
+        items = state["items"]
+        rows = []
+        for index in range(state["start"], state["stop"]):
+            row = self.render_row(items[index], index)
+            row.key_ = self.key(items[index], index)
+            rows.append(row)
+        return rows
+
+    def window_style(self) -> str:
+        """
+        Returns the style translating the window to the offset of its first row.
+        """
+        return f"transform:translateY({self.get_state()['start'] * self.row_height}px)"
+
+    def viewport(self, content: Node, header_height: int = 0) -> Node:
+        """
+        Wraps the window in a fixed height scroll container whose inner spacer
+        has the height of every row plus the header above them.
+        """
+        state = self.get_state()
+        return div(
+            div(
+                content,
+                style=f"height:{header_height + len(state['items']) * self.row_height}px;position:relative",
+            ),
+            id=self.container_id,
+            class_=self.class_,
+            style=f"height:{self.height}px;overflow-y:auto",
+        )
+
+
+@Reuseable
+class VirtualList(VirtualizedMixin, Component):
+    """
+    A virtualized list, only the rows visible in the viewport plus overscan are materialized.
+
+    Args:
+        items (list): The rows of the list.
+        render_item (callable): render_item(item, index) returns the row content, a Node or text.
+        row_height (int): Fixed height of a row in pixels.
+        height (int): Height of the viewport in pixels.
+        overscan (int): Extra rows rendered above and below the viewport.
+        key (callable, optional): key(item, index) returns the unique row key, defaults to the index.
+        id (str): id of the scroll container, bind on_scroll to it.
+        class_ (str): Tailwind classes for styling.
+        row_class (str): Tailwind classes of every row.
+
+    Usage:
+        logs = VirtualList(lines, lambda line, i: line, key=lambda line, i: i, id="logs")
+        dispatcher.bind("logs", "scroll", logs.on_scroll)
+    """
+
+    def __init__(self, items, render_item, row_height=32, height=480, overscan=5, key=None, id="virtual-list", class_="", row_class=""):
+        super().__init__()
+        self.render_item = render_item
+        self.row_class = row_class
+        self.init_window(items, row_height, height, overscan, key, id, class_)
+
+    def render_row(self, item, index) -> Node:
+        return div(
+            self.render_item(item, index),
+            class_=self.row_class,
+            style=f"height:{self.row_height}px",
+        )
+
+    def render(self) -> Node:
+        return self.viewport(div(*self.visible_rows(), style=self.window_style()))
+
+
+@Reuseable
+class VirtualTable(VirtualizedMixin, Component):
+    """
+    A virtualized table, same columns as ui.Table, only the visible rows plus overscan are materialized.
+
+    Args:
+        data (list): list of dictionaries of data e.g. [{"key" : 1, "name": "Mike"}]
+        columns (list): list of dictionaries of column names [{"title": "Name", "index": "name"}]
+        row_height (int): Fixed height of a row in pixels.
+        height (int): Height of the viewport in pixels.
+        overscan (int): Extra rows rendered above and below the viewport.
+        key (callable, optional): key(row, index) returns the unique row key, defaults to the index.
+        id (str): id of the scroll container, bind on_scroll to it.
+        class_names, td_class_names, th_class_names, tr_class_names (str): same as ui.Table.
+
+    Usage:
+        viewer = VirtualTable(logs, [{"title": "Level", "index": "level"}], key=lambda row, i: row["id"], id="viewer")
+        dispatcher.bind("viewer", "scroll", viewer.on_scroll)
+    """
+
+    def __init__(
+        self, data, columns, row_height=48, height=480, overscan=5, key=None, id="virtual-table",
+        class_names="min-w-full bg-white shadow-md rounded-xl", td_class_names="py-3 px-4 text-left",
+        th_class_names="py-3 px-4", tr_class_names="border-b border-light-gray dark:border-dark-page1",
+    ):
+        super().__init__()
+        self.columns = columns
+        self.indexes = [col["index"] for col in columns]
+        self.class_names = class_names
+        self.td_class_names = td_class_names
+        self.th_class_names = th_class_names
+        self.tr_class_names = tr_class_names
+        self.init_window(data, row_height, height, overscan, key, id, "")
+
+    def render_row(self, item, index) -> Node:
+        return tr(
+            *[td(str(item[column]), class_=self.td_class_names) for column in self.indexes],
+            class_=self.tr_class_names,
+            style=f"height:{self.row_height}px",
+        )
+
+    def render(self) -> Node:
+        # the header has the height of a row and sticks to the top of the viewport,
+        # only the body is translated to the window offset
+        return self.viewport(table(
+            thead(
+                tr(
+                    *[th(col["title"], class_=self.th_class_names) for col in self.columns],
+                    class_=self.tr_class_names,
+                    style=f"height:{self.row_height}px",
+                ),
+                style="position:sticky;top:0;z-index:1",
+            ),
+            tbody(*self.visible_rows(), style=self.window_style()),
+            class_=self.class_names,
+        ), header_height=self.row_height)
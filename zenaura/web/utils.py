@@ -36,3 +36,9 @@ except:
     to_js = lambda x: x 
     in_browser = False
 
+
+try:
+    from pyodide.http import pyfetch
+except:
+    # fragments of lazy routes are only fetched in the browser
+    pyfetch = None